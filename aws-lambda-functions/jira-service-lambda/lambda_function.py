@@ -1,9 +1,12 @@
 import json
 import os
-import boto3
+import time
 import requests
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any, Optional, List
 from datetime import datetime
+from urllib3.util.retry import Retry
 import logging
 
 logger = logging.getLogger()
@@ -11,8 +14,51 @@ logger.setLevel(logging.INFO)
 
 JIRA_SERVICE_URL = os.environ.get('JIRA_SERVICE_URL', 'http://localhost:8000')
 JIRA_SERVICE_API_KEY = os.environ.get('JIRA_SERVICE_API_KEY')
-
-s3_client = boto3.client('s3')
+JIRA_SERVICE_TIMEOUT_SECONDS = float(os.environ.get('JIRA_SERVICE_TIMEOUT_SECONDS', '25'))
+DEFER_S3_WRITES = os.environ.get('DEFER_S3_WRITES', 'false').lower() == 'true'
+API_GATEWAY_TIMEOUT_SECONDS = 29.0
+RESPONSE_MARGIN_SECONDS = 1.0
+HTTP_POOL_SIZE = 10
+HTTP_CONNECT_TIMEOUT_SECONDS = 2.0
+HTTP_RETRY_ATTEMPTS = 2
+HTTP_RETRY_BACKOFF_SECONDS = 0.3
+PENDING_WRITE_TIMEOUT_SECONDS = 5.0
+
+_s3_client = None
+_s3_writer = ThreadPoolExecutor(max_workers=1)
+_pending_writes: List[Future] = []
+
+
+def create_http_session() -> requests.Session:
+    # Only connection failures are retried: the request never reached the service,
+    # so retrying cannot generate a second ticket.
+    retry = Retry(
+        total=HTTP_RETRY_ATTEMPTS,
+        connect=HTTP_RETRY_ATTEMPTS,
+        read=0,
+        status=0,
+        other=0,
+        backoff_factor=HTTP_RETRY_BACKOFF_SECONDS,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+http_session = create_http_session()
+
+
+def get_s3_client():
+    global _s3_client
+    if _s3_client is None:
+        import boto3
+
+        _s3_client = boto3.client('s3')
+    return _s3_client
 
 
 class JiraServiceError(Exception):
@@ -36,7 +82,23 @@ def validate_request(event: Dict[str, Any]) -> Dict[str, Any]:
         raise JiraServiceError("Invalid JSON in request body", 400)
 
 
-def call_jira_service(request_data: Dict[str, Any]) -> Dict[str, Any]:
+def upstream_timeout(started: float, context: Any = None) -> float:
+    deadline = API_GATEWAY_TIMEOUT_SECONDS
+    if hasattr(context, 'get_remaining_time_in_millis'):
+        deadline = min(
+            deadline,
+            time.perf_counter() - started + context.get_remaining_time_in_millis() / 1000)
+    connect_seconds = (HTTP_RETRY_ATTEMPTS + 1) * HTTP_CONNECT_TIMEOUT_SECONDS + sum(
+        HTTP_RETRY_BACKOFF_SECONDS * 2 ** attempt for attempt in range(HTTP_RETRY_ATTEMPTS))
+    remaining = deadline - RESPONSE_MARGIN_SECONDS - (time.perf_counter() - started) - connect_seconds
+    if remaining <= 0:
+        raise JiraServiceError("Not enough time left to call the RAG service", 504)
+    return min(JIRA_SERVICE_TIMEOUT_SECONDS, remaining)
+
+
+def call_jira_service(
+    request_data: Dict[str, Any], trace_id: Optional[str] = None, read_timeout: Optional[float] = None
+) -> Dict[str, Any]:
     if not JIRA_SERVICE_API_KEY:
         raise JiraServiceError("RAG service API key not configured", 500)
 
@@ -45,15 +107,17 @@ def call_jira_service(request_data: Dict[str, Any]) -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'X-API-Key': JIRA_SERVICE_API_KEY
         }
+        if trace_id:
+            headers['X-Request-ID'] = trace_id
 
         logger.info(
             f"Calling RAG service at: {JIRA_SERVICE_URL}/generate-ticket")
 
-        response = requests.post(
+        response = http_session.post(
             f"{JIRA_SERVICE_URL}/generate-ticket",
             headers=headers,
             json=request_data,
-            timeout=30
+            timeout=(HTTP_CONNECT_TIMEOUT_SECONDS, read_timeout or JIRA_SERVICE_TIMEOUT_SECONDS)
         )
 
         if not response.ok:
@@ -66,6 +130,10 @@ def call_jira_service(request_data: Dict[str, Any]) -> Dict[str, Any]:
 
         return response.json()
 
+    except requests.exceptions.Timeout as e:
+        logger.error(f"Request to RAG service timed out: {str(e)}")
+        raise JiraServiceError("RAG service did not respond in time", 504)
+
     except requests.exceptions.RequestException as e:
         logger.error(f"Request to RAG service failed: {str(e)}")
         raise JiraServiceError(
@@ -85,10 +153,10 @@ def store_ticket_in_s3(ticket_data: Dict[str, Any], ticket_id: str) -> None:
         ticket_data['created_at'] = datetime.utcnow().isoformat()
         ticket_data['service_type'] = 'jira'
 
-        s3_client.put_object(
+        get_s3_client().put_object(
             Bucket=bucket_name,
             Key=s3_key,
-            Body=json.dumps(ticket_data, indent=2),
+            Body=json.dumps(ticket_data),
             ContentType='application/json'
         )
 
@@ -98,6 +166,17 @@ def store_ticket_in_s3(ticket_data: Dict[str, Any], ticket_id: str) -> None:
         logger.error(f"Failed to store ticket in S3: {str(e)}")
 
 
+def drain_pending_writes() -> None:
+    # A frozen execution environment pauses the writer thread, so finish writes
+    # deferred by the previous invocation before doing anything else.
+    if not _pending_writes:
+        return
+    done, not_done = wait(list(_pending_writes), timeout=PENDING_WRITE_TIMEOUT_SECONDS)
+    _pending_writes[:] = list(not_done)
+    if not_done:
+        logger.warning(f"{len(not_done)} deferred S3 writes are still running")
+
+
 def create_response(status_code: int, body: Dict[str, Any]) -> Dict[str, Any]:
     return {
         'statusCode': status_code,
@@ -111,29 +190,67 @@ def create_response(status_code: int, body: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def log_timing(context: Any, status_code: int, timings: Dict[str, float]) -> None:
+    logger.info(json.dumps({
+        'event': 'invocation',
+        'request_id': getattr(context, 'aws_request_id', None),
+        'status_code': status_code,
+        'timings_ms': {phase: round(ms, 2) for phase, ms in timings.items()},
+    }))
+
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+    status_code = 500
+
+    def phase_done(phase: str) -> None:
+        timings[phase] = (time.perf_counter() - started) * 1000 - sum(timings.values())
+
     try:
-        logger.info(f"Received event: {json.dumps(event)}")
+        logger.info(
+            f"Received {event.get('httpMethod')} {event.get('path')} request")
 
         if event.get('httpMethod') == 'OPTIONS':
+            status_code = 200
             return create_response(200, {'message': 'OK'})
 
+        drain_pending_writes()
+        phase_done('drain')
+
         request_data = validate_request(event)
+        phase_done('validate')
 
-        ticket_data = call_jira_service(request_data)
+        ticket_data = call_jira_service(
+            request_data,
+            getattr(context, 'aws_request_id', None),
+            upstream_timeout(started, context),
+        )
+        phase_done('upstream')
 
         if 'ticket_id' in ticket_data:
-            store_ticket_in_s3(ticket_data, ticket_data['ticket_id'])
+            if DEFER_S3_WRITES:
+                _pending_writes.append(_s3_writer.submit(
+                    store_ticket_in_s3, dict(ticket_data), ticket_data['ticket_id']))
+            else:
+                store_ticket_in_s3(ticket_data, ticket_data['ticket_id'])
+        phase_done('store')
 
         logger.info(
             f"Successfully generated ticket: {ticket_data.get('ticket_id', 'unknown')}")
 
+        status_code = 200
         return create_response(200, ticket_data)
 
     except JiraServiceError as e:
         logger.error(f"Jira service error: {e.message}")
+        status_code = e.status_code
         return create_response(e.status_code, {'error': e.message})
 
     except Exception as e:
         logger.error(f"Unexpected error: {str(e)}")
         return create_response(500, {'error': 'Internal server error'})
+
+    finally:
+        timings['total'] = (time.perf_counter() - started) * 1000
+        log_timing(context, status_code, timings)
@@ -0,0 +1,119 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+STUB_TICKET = {
+    "ticket_id": "harness00001",
+    "title": "Stub ticket",
+    "description": "Generated by the local harness",
+    "priority": "Medium",
+    "labels": ["harness"],
+}
+
+
+class StubRagHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    delay_seconds = 0.0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.delay_seconds)
+        body = json.dumps(STUB_TICKET).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubS3Client:
+    def __init__(self):
+        self.puts = 0
+
+    def put_object(self, **kwargs: Any) -> Dict[str, Any]:
+        self.puts += 1
+        return {}
+
+
+class StubContext:
+    def __init__(self, request_id: str):
+        self.aws_request_id = request_id
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark lambda_handler against a stubbed RAG service")
+    parser.add_argument("--invocations", type=int, default=200)
+    parser.add_argument("--upstream-delay-ms", type=float, default=0.0)
+    parser.add_argument("--defer-writes", action="store_true")
+    parser.add_argument(
+        "--fresh-connections", action="store_true",
+        help="Open a new connection per invocation instead of reusing the pooled session")
+    args = parser.parse_args()
+
+    StubRagHandler.delay_seconds = args.upstream_delay_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubRagHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    os.environ["JIRA_SERVICE_URL"] = f"http://127.0.0.1:{server.server_address[1]}"
+    os.environ["JIRA_SERVICE_API_KEY"] = "harness"
+    os.environ["S3_BUCKET_NAME"] = "harness-bucket"
+    os.environ["DEFER_S3_WRITES"] = "true" if args.defer_writes else "false"
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    import lambda_function
+
+    lambda_function.logger.setLevel("WARNING")
+    s3_client = StubS3Client()
+    lambda_function._s3_client = s3_client
+    if args.fresh_connections:
+        import requests
+
+        lambda_function.http_session = requests
+
+    event = {
+        "httpMethod": "POST",
+        "path": "/generate-ticket",
+        "body": json.dumps({"prompt": "Add a login page"}),
+    }
+    latencies = []
+    for index in range(args.invocations):
+        started = time.perf_counter()
+        response = lambda_function.lambda_handler(event, StubContext(f"harness-{index}"))
+        latencies.append((time.perf_counter() - started) * 1000)
+        if response["statusCode"] != 200:
+            raise SystemExit(f"Invocation {index} failed: {response['body']}")
+
+    lambda_function._s3_writer.shutdown(wait=True)
+    server.shutdown()
+
+    print(json.dumps({
+        "invocations": args.invocations,
+        "upstream_delay_ms": args.upstream_delay_ms,
+        "deferred_writes": args.defer_writes,
+        "pooled_session": not args.fresh_connections,
+        "s3_puts": s3_client.puts,
+        "first_ms": round(latencies[0], 2),
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+        "mean_ms": round(statistics.mean(latencies), 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
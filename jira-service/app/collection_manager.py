@@ -0,0 +1,235 @@
+import asyncio
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.hybrid_retrieval import compact_keyword_index, drop_keyword_index, keyword_index_bytes
+from app.ingestion import drop_collection_state, read_json_file, write_json_file
+from app.jira_sync import delete_sync_state
+
+COLLECTION_ACCESS_PATH = "./chroma_db/collections.json"
+COLLECTION_NAME_PREFIX = "project_"
+DEFAULT_COLLECTION_DISK_BUDGET_MB = 2048
+DEFAULT_COLLECTION_IDLE_TTL_SECONDS = 14 * 24 * 3600
+DEFAULT_COLLECTION_MIN_IDLE_SECONDS = 3600
+DEFAULT_COLLECTION_SWEEP_INTERVAL_SECONDS = 3600
+
+
+def directory_bytes(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except FileNotFoundError:
+                pass
+    return total
+
+
+class CollectionManager:
+    def __init__(
+        self,
+        client_factory: Callable[[], Any],
+        persist_directory: str,
+        disk_budget_bytes: int,
+        idle_ttl_seconds: float,
+        min_idle_seconds: float,
+        access_path: str = COLLECTION_ACCESS_PATH,
+    ):
+        self.client_factory = client_factory
+        self.persist_directory = persist_directory
+        self.disk_budget_bytes = disk_budget_bytes
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.min_idle_seconds = min_idle_seconds
+        self.access_path = access_path
+        self._lock = threading.Lock()
+        self._handles: Dict[str, Tuple[Any, Any]] = {}
+        self._creating: Dict[str, threading.Lock] = {}
+        self._sweeper: Optional[asyncio.Task] = None
+        self._last_accessed: Dict[str, float] = {
+            name: float(timestamp) for name, timestamp in read_json_file(access_path).items()
+        }
+
+    def get(self, name: str, embedding_function_factory: Callable[[], Any]):
+        with self._lock:
+            self._last_accessed[name] = time.time()
+            handle = self._handles.get(name)
+            if handle is not None:
+                return handle[0]
+            creating = self._creating.setdefault(name, threading.Lock())
+
+        with creating:
+            with self._lock:
+                handle = self._handles.get(name)
+            if handle is None:
+                embedding_function = embedding_function_factory()
+                collection = self.client_factory().get_or_create_collection(
+                    name=name, embedding_function=embedding_function
+                )
+                handle = (collection, embedding_function)
+                with self._lock:
+                    self._handles[name] = handle
+        return handle[0]
+
+    def embedding_function(self, name: str):
+        with self._lock:
+            handle = self._handles.get(name)
+        return handle[1] if handle else None
+
+    def _collections(self) -> List[Any]:
+        client = self.client_factory()
+        collections = []
+        for collection in client.list_collections():
+            name = getattr(collection, "name", collection)
+            if not name.startswith(COLLECTION_NAME_PREFIX):
+                continue
+            if isinstance(collection, str):
+                collection = client.get_collection(name, embedding_function=None)
+            collections.append(collection)
+        return collections
+
+    def _vector_segment_directories(self) -> Dict[str, List[str]]:
+        database_path = os.path.join(self.persist_directory, "chroma.sqlite3")
+        if not os.path.exists(database_path):
+            return {}
+        # chromadb has no public API for a collection's files, so this reads its
+        # segments table. requirements.txt pins the version this layout matches.
+        try:
+            connection = sqlite3.connect(f"file:{database_path}?mode=ro", uri=True)
+            try:
+                rows = connection.execute(
+                    "SELECT collection, id FROM segments WHERE scope = 'VECTOR'").fetchall()
+            finally:
+                connection.close()
+        except sqlite3.Error as e:
+            print(f"Error reading Chroma segments, vector index sizes are unavailable: {e}")
+            return {}
+        directories: Dict[str, List[str]] = {}
+        for collection_id, segment_id in rows:
+            directories.setdefault(collection_id, []).append(
+                os.path.join(self.persist_directory, segment_id))
+        return directories
+
+    def describe(self) -> List[Dict[str, Any]]:
+        now = time.time()
+        segment_directories = self._vector_segment_directories()
+        collections = []
+        for collection in self._collections():
+            name = collection.name
+            with self._lock:
+                last_accessed = self._last_accessed.setdefault(name, now)
+                cached = name in self._handles
+            disk_bytes = keyword_index_bytes(name) + sum(
+                directory_bytes(directory) for directory in segment_directories.get(str(collection.id), []))
+            collections.append({
+                "name": name,
+                "chunk_count": collection.count(),
+                "disk_bytes": disk_bytes,
+                "last_accessed": last_accessed,
+                "idle_seconds": round(now - last_accessed, 1),
+                "cached": cached,
+            })
+        return sorted(collections, key=lambda collection: collection["disk_bytes"], reverse=True)
+
+    def evict(self, name: str, min_idle_seconds: Optional[float] = None) -> bool:
+        collection_ids = {collection.name: str(collection.id) for collection in self._collections()}
+        segment_directories = self._vector_segment_directories().get(collection_ids.get(name), [])
+        # Holding the lock across the delete makes get() wait for it, and the
+        # idleness re-check skips collections that get() touched since the sweep began.
+        with self._lock:
+            last_accessed = self._last_accessed.get(name)
+            if (
+                min_idle_seconds is not None and last_accessed is not None
+                and time.time() - last_accessed < min_idle_seconds
+            ):
+                return False
+            self._handles.pop(name, None)
+            self._creating.pop(name, None)
+            self._last_accessed.pop(name, None)
+            if name in collection_ids:
+                self.client_factory().delete_collection(name)
+                for directory in segment_directories:
+                    shutil.rmtree(directory, ignore_errors=True)
+            drop_keyword_index(name)
+            drop_collection_state(name)
+            delete_sync_state(name)
+        return True
+
+    def sweep(self) -> Dict[str, Any]:
+        collections = self.describe()
+        disk_bytes = sum(collection["disk_bytes"] for collection in collections)
+        evicted = []
+        for collection in sorted(collections, key=lambda collection: collection["last_accessed"]):
+            with self._lock:
+                idle_seconds = time.time() - self._last_accessed.get(
+                    collection["name"], collection["last_accessed"])
+            over_budget = disk_bytes > self.disk_budget_bytes
+            if idle_seconds >= self.idle_ttl_seconds:
+                min_idle_seconds = self.idle_ttl_seconds
+            elif over_budget and idle_seconds >= self.min_idle_seconds:
+                min_idle_seconds = self.min_idle_seconds
+            else:
+                continue
+            if self.evict(collection["name"], min_idle_seconds):
+                disk_bytes -= collection["disk_bytes"]
+                evicted.append(collection["name"])
+
+        compacted = [
+            collection["name"] for collection in collections
+            if collection["name"] not in evicted and compact_keyword_index(collection["name"])
+        ]
+        self.save()
+        return {"evicted": evicted, "compacted": compacted, "disk_bytes": disk_bytes}
+
+    def save(self) -> None:
+        with self._lock:
+            last_accessed = dict(self._last_accessed)
+        write_json_file(self.access_path, last_accessed)
+
+    async def _sweep_periodically(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                result = await asyncio.to_thread(self.sweep)
+                if result["evicted"] or result["compacted"]:
+                    print(
+                        f"Collection sweep evicted {len(result['evicted'])} and compacted "
+                        f"{len(result['compacted'])} collections, {result['disk_bytes']} bytes in use"
+                    )
+            except Exception as e:
+                print(f"Error sweeping collections: {e}")
+
+    async def start(self, interval_seconds: float) -> None:
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_periodically(interval_seconds))
+
+    async def stop(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+        await asyncio.to_thread(self.save)
+
+
+_collection_manager: Optional[CollectionManager] = None
+_collection_manager_guard = threading.Lock()
+
+
+def get_collection_manager(client_factory: Callable[[], Any], persist_directory: str) -> CollectionManager:
+    global _collection_manager
+    with _collection_manager_guard:
+        if _collection_manager is None:
+            _collection_manager = CollectionManager(
+                client_factory,
+                persist_directory,
+                disk_budget_bytes=int(float(os.getenv(
+                    "COLLECTION_DISK_BUDGET_MB", DEFAULT_COLLECTION_DISK_BUDGET_MB)) * 1024 * 1024),
+                idle_ttl_seconds=float(os.getenv(
+                    "COLLECTION_IDLE_TTL_SECONDS", DEFAULT_COLLECTION_IDLE_TTL_SECONDS)),
+                min_idle_seconds=float(os.getenv(
+                    "COLLECTION_MIN_IDLE_SECONDS", DEFAULT_COLLECTION_MIN_IDLE_SECONDS)),
+            )
+        return _collection_manager
@@ -0,0 +1,134 @@
+import math
+import os
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.hybrid_retrieval import query_terms, text_terms
+from app.metrics import CONTEXT_TOKENS
+
+DEFAULT_CONTEXT_TOKEN_BUDGET = 3000
+DEFAULT_CONTEXT_DUPLICATE_THRESHOLD = 0.8
+DEFAULT_TOKENIZER_ENCODING = "cl100k_base"
+CONTEXT_SEPARATOR = "\n"
+CHARS_PER_TOKEN_ESTIMATE = 4
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_tokenizers: Dict[str, Optional[object]] = {}
+_tokenizers_guard = threading.Lock()
+
+
+def context_token_budget() -> int:
+    return int(os.getenv("CONTEXT_TOKEN_BUDGET", DEFAULT_CONTEXT_TOKEN_BUDGET))
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN_ESTIMATE)
+
+
+def get_tokenizer(model: str):
+    with _tokenizers_guard:
+        if model not in _tokenizers:
+            try:
+                import tiktoken
+
+                try:
+                    _tokenizers[model] = tiktoken.encoding_for_model(model)
+                except KeyError:
+                    _tokenizers[model] = tiktoken.get_encoding(DEFAULT_TOKENIZER_ENCODING)
+            except Exception as e:
+                print(f"Error loading tokenizer for {model}, estimating token counts: {e}")
+                _tokenizers[model] = None
+        return _tokenizers[model]
+
+
+def count_tokens(text: str, model: str) -> int:
+    tokenizer = get_tokenizer(model)
+    if tokenizer is None:
+        return estimate_tokens(text)
+    return len(tokenizer.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str) -> str:
+    tokenizer = get_tokenizer(model)
+    if tokenizer is None:
+        return text[:max_tokens * CHARS_PER_TOKEN_ESTIMATE]
+    return tokenizer.decode(tokenizer.encode(text, disallowed_special=())[:max_tokens])
+
+
+def rank_chunks(prompt: str, chunks: List[str]) -> List[int]:
+    terms = query_terms(prompt)
+    if not terms or not chunks:
+        return list(range(len(chunks)))
+
+    term_counts = [Counter(text_terms(chunk)) for chunk in chunks]
+    average_length = sum(sum(counts.values()) for counts in term_counts) / len(chunks) or 1.0
+    document_frequency = Counter(
+        term for counts in term_counts for term in terms if term in counts)
+
+    scores = []
+    for counts in term_counts:
+        length = sum(counts.values())
+        score = 0.0
+        for term in terms:
+            frequency = counts.get(term, 0)
+            if not frequency:
+                continue
+            idf = math.log(1 + (len(chunks) - document_frequency[term] + 0.5) / (document_frequency[term] + 0.5))
+            score += idf * frequency * (BM25_K1 + 1) / (
+                frequency + BM25_K1 * (1 - BM25_B + BM25_B * length / average_length))
+        scores.append(score)
+    return sorted(range(len(chunks)), key=lambda index: -scores[index])
+
+
+def word_shingles(text: str, size: int = 3) -> Set[Tuple[str, ...]]:
+    words = text_terms(text)
+    return {tuple(words[index:index + size]) for index in range(max(1, len(words) - size + 1))}
+
+
+def is_near_duplicate(shingles: Set[Tuple[str, ...]], selected: List[Set[Tuple[str, ...]]], threshold: float) -> bool:
+    for other in selected:
+        union = len(shingles | other)
+        if union and len(shingles & other) / union >= threshold:
+            return True
+    return False
+
+
+def build_context(
+    prompt: str,
+    chunks: List[str],
+    token_budget: int,
+    model: str,
+    rank: bool = True,
+    duplicate_threshold: float = DEFAULT_CONTEXT_DUPLICATE_THRESHOLD,
+) -> Tuple[str, int]:
+    order = rank_chunks(prompt, chunks) if rank else range(len(chunks))
+    separator_tokens = count_tokens(CONTEXT_SEPARATOR, model)
+    selected: List[str] = []
+    selected_shingles: List[Set[Tuple[str, ...]]] = []
+    tokens_used = 0
+
+    for index in order:
+        text = chunks[index].strip()
+        if not text:
+            continue
+        shingles = word_shingles(text)
+        if is_near_duplicate(shingles, selected_shingles, duplicate_threshold):
+            continue
+
+        cost = count_tokens(text, model) + (separator_tokens if selected else 0)
+        if tokens_used + cost > token_budget:
+            if selected:
+                continue
+            text = truncate_to_tokens(text, token_budget, model)
+            cost = count_tokens(text, model)
+
+        selected.append(text)
+        selected_shingles.append(shingles)
+        tokens_used += cost
+        if tokens_used >= token_budget:
+            break
+
+    CONTEXT_TOKENS.observe(tokens_used)
+    return CONTEXT_SEPARATOR.join(selected), tokens_used
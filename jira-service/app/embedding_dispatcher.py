@@ -0,0 +1,317 @@
+import os
+import queue
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+from app.context_builder import CHARS_PER_TOKEN_ESTIMATE, estimate_tokens, get_tokenizer
+from app.metrics import EMBEDDING_TOKENS, observe_stage
+
+DEFAULT_EMBEDDING_BATCH_SIZE = 256
+DEFAULT_EMBEDDING_BATCH_WAIT_SECONDS = 0.02
+DEFAULT_EMBEDDING_MAX_CONCURRENCY = 4
+DEFAULT_EMBEDDING_MAX_RETRIES = 5
+DEFAULT_EMBEDDING_TOKENS_PER_MINUTE = 1_000_000
+DEFAULT_EMBEDDING_BACKOFF_SECONDS = 1.0
+DEFAULT_EMBEDDING_CONTEXT_TOKENS = 8191
+
+EmbedBatch = Callable[[List[str]], Tuple[List[List[float]], Mapping[str, str]]]
+
+_DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PATTERN.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+class TokenBucket:
+    def __init__(self, tokens_per_minute: int):
+        self.rate = tokens_per_minute / 60.0
+        self.capacity = float(tokens_per_minute)
+        self.tokens = self.capacity
+        self.paused_until = 0.0
+        self._updated_at = time.monotonic()
+        self._condition = threading.Condition()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def acquire(self, tokens: int) -> None:
+        tokens = min(tokens, self.capacity)
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.paused_until and self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = max(self.paused_until - now, (tokens - self.tokens) / self.rate)
+                self._condition.wait(timeout=wait)
+
+    def pause(self, seconds: float) -> None:
+        with self._condition:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self._condition.notify_all()
+
+    def observe(self, headers: Mapping[str, str]) -> None:
+        remaining_tokens = headers.get("x-ratelimit-remaining-tokens")
+        remaining_requests = headers.get("x-ratelimit-remaining-requests")
+
+        with self._condition:
+            self._refill(time.monotonic())
+            if remaining_tokens is not None:
+                self.tokens = min(self.tokens, float(remaining_tokens))
+
+        if remaining_tokens is not None and float(remaining_tokens) <= 0:
+            self.pause(parse_reset_duration(
+                headers.get("x-ratelimit-reset-tokens")) or DEFAULT_EMBEDDING_BACKOFF_SECONDS)
+        if remaining_requests is not None and float(remaining_requests) <= 0:
+            self.pause(parse_reset_duration(
+                headers.get("x-ratelimit-reset-requests")) or DEFAULT_EMBEDDING_BACKOFF_SECONDS)
+
+
+def _rate_limit_delay(error: Exception, attempt: int) -> Optional[float]:
+    if getattr(error, "status_code", None) != 429:
+        return None
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    for header in ("retry-after", "x-ratelimit-reset-tokens", "x-ratelimit-reset-requests"):
+        delay = parse_reset_duration(headers.get(header))
+        if delay is not None:
+            return delay
+    return DEFAULT_EMBEDDING_BACKOFF_SECONDS * (2 ** attempt)
+
+
+class _EmbeddingRequest:
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.vectors: List[Optional[List[float]]] = [None] * len(texts)
+        self.error: Optional[Exception] = None
+        self.done = threading.Event()
+        self._remaining = len(texts)
+        self._lock = threading.Lock()
+        if not texts:
+            self.done.set()
+
+    def resolve(self, index: int, vector: List[float]) -> None:
+        with self._lock:
+            self.vectors[index] = vector
+            self._remaining -= 1
+            if self._remaining == 0:
+                self.done.set()
+
+    def fail(self, error: Exception) -> None:
+        self.error = error
+        self.done.set()
+
+
+class EmbeddingDispatcher:
+    def __init__(
+        self,
+        embed_batch: EmbedBatch,
+        batch_size: int = DEFAULT_EMBEDDING_BATCH_SIZE,
+        batch_wait_seconds: float = DEFAULT_EMBEDDING_BATCH_WAIT_SECONDS,
+        max_concurrency: int = DEFAULT_EMBEDDING_MAX_CONCURRENCY,
+        max_retries: int = DEFAULT_EMBEDDING_MAX_RETRIES,
+        tokens_per_minute: int = DEFAULT_EMBEDDING_TOKENS_PER_MINUTE,
+    ):
+        self.embed_batch = embed_batch
+        self.batch_size = batch_size
+        self.batch_wait_seconds = batch_wait_seconds
+        self.max_retries = max_retries
+        self.bucket = TokenBucket(tokens_per_minute)
+        self.batches_sent = 0
+        self.rate_limited = 0
+        self._queue: "queue.Queue[Tuple[_EmbeddingRequest, int]]" = queue.Queue()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="embedding-batch")
+        self._collector = threading.Thread(
+            target=self._collect, name="embedding-dispatcher", daemon=True)
+        self._collector.start()
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        request = _EmbeddingRequest(texts)
+        for index in range(len(texts)):
+            self._queue.put((request, index))
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.vectors
+
+    def _next_batch(self) -> List[Tuple[_EmbeddingRequest, int]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.batch_wait_seconds
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _collect(self) -> None:
+        while True:
+            batch = self._next_batch()
+            tokens = sum(estimate_tokens(request.texts[index]) for request, index in batch)
+            self._slots.acquire()
+            self.bucket.acquire(tokens)
+            self._executor.submit(self._run_batch, batch, tokens)
+
+    def _run_batch(self, batch: List[Tuple[_EmbeddingRequest, int]], tokens: int) -> None:
+        try:
+            texts = [request.texts[index] for request, index in batch]
+            for attempt in range(self.max_retries + 1):
+                try:
+                    vectors, headers = self.embed_batch(texts)
+                    break
+                except Exception as e:
+                    delay = _rate_limit_delay(e, attempt)
+                    if delay is None or attempt == self.max_retries:
+                        raise
+                    self.rate_limited += 1
+                    self.bucket.pause(delay)
+                    self.bucket.acquire(tokens)
+
+            self.batches_sent += 1
+            self.bucket.observe(headers)
+            for (request, index), vector in zip(batch, vectors):
+                request.resolve(index, vector)
+        except Exception as e:
+            for request, _ in batch:
+                request.fail(e)
+        finally:
+            self._slots.release()
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "queued": self._queue.qsize(),
+            "batches_sent": self.batches_sent,
+            "rate_limited": self.rate_limited,
+            "bucket_tokens": self.bucket.tokens,
+        }
+
+
+def split_to_context_length(
+    texts: List[str], max_tokens: int, model: str
+) -> Tuple[List[str], List[int]]:
+    tokenizer = get_tokenizer(model)
+    max_chars = max_tokens * CHARS_PER_TOKEN_ESTIMATE // 2
+    pieces: List[str] = []
+    owners: List[int] = []
+    for owner, text in enumerate(texts):
+        if tokenizer is None:
+            if len(text) <= max_chars:
+                text_pieces = [text]
+            else:
+                text_pieces = [text[start:start + max_chars] for start in range(0, len(text), max_chars)]
+        else:
+            tokens = tokenizer.encode(text, disallowed_special=())
+            if len(tokens) <= max_tokens:
+                text_pieces = [text]
+            else:
+                text_pieces = [
+                    tokenizer.decode(tokens[start:start + max_tokens])
+                    for start in range(0, len(tokens), max_tokens)
+                ]
+        pieces.extend(text_pieces)
+        owners.extend([owner] * len(text_pieces))
+    return pieces, owners
+
+
+def combine_piece_vectors(
+    pieces: List[str], owners: List[int], piece_vectors: List[List[float]], text_count: int
+) -> List[List[float]]:
+    grouped: List[List[Tuple[List[float], int]]] = [[] for _ in range(text_count)]
+    for piece, owner, vector in zip(pieces, owners, piece_vectors):
+        grouped[owner].append((vector, max(1, len(piece))))
+
+    vectors = []
+    for group in grouped:
+        if len(group) == 1:
+            vectors.append(group[0][0])
+            continue
+        total_weight = sum(weight for _, weight in group)
+        average = [
+            sum(vector[dimension] * weight for vector, weight in group) / total_weight
+            for dimension in range(len(group[0][0]))
+        ]
+        norm = sum(value * value for value in average) ** 0.5 or 1.0
+        vectors.append([value / norm for value in average])
+    return vectors
+
+
+def openai_embed_batch(base_embeddings) -> EmbedBatch:
+    max_tokens = getattr(base_embeddings, "embedding_ctx_length", None) or DEFAULT_EMBEDDING_CONTEXT_TOKENS
+    dimensions = getattr(base_embeddings, "dimensions", None)
+    options = {"dimensions": dimensions} if dimensions else {}
+
+    def embed_batch(texts: List[str]) -> Tuple[List[List[float]], Mapping[str, str]]:
+        pieces, owners = split_to_context_length(texts, max_tokens, base_embeddings.model)
+        with observe_stage("embedding_api"):
+            raw_response = base_embeddings.client.with_raw_response.create(
+                input=pieces, model=base_embeddings.model, **options
+            )
+        response = raw_response.parse()
+        if response.usage:
+            EMBEDDING_TOKENS.inc(response.usage.total_tokens)
+        piece_vectors = [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+        return combine_piece_vectors(pieces, owners, piece_vectors, len(texts)), raw_response.headers
+
+    return embed_batch
+
+
+class DispatchedEmbeddings(Embeddings):
+    def __init__(self, dispatcher: EmbeddingDispatcher, model: str):
+        self.dispatcher = dispatcher
+        self.model = model
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.dispatcher.embed(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.dispatcher.embed([text])[0]
+
+
+_dispatchers: Dict[str, EmbeddingDispatcher] = {}
+_dispatchers_guard = threading.Lock()
+
+
+def get_embedding_dispatcher(model: str, embed_batch: EmbedBatch) -> EmbeddingDispatcher:
+    with _dispatchers_guard:
+        dispatcher = _dispatchers.get(model)
+        if dispatcher is None:
+            dispatcher = EmbeddingDispatcher(
+                embed_batch,
+                batch_size=int(os.getenv(
+                    "EMBEDDING_BATCH_SIZE", DEFAULT_EMBEDDING_BATCH_SIZE)),
+                max_concurrency=int(os.getenv(
+                    "EMBEDDING_MAX_CONCURRENCY", DEFAULT_EMBEDDING_MAX_CONCURRENCY)),
+                tokens_per_minute=int(os.getenv(
+                    "EMBEDDING_TOKENS_PER_MINUTE", DEFAULT_EMBEDDING_TOKENS_PER_MINUTE)),
+            )
+            _dispatchers[model] = dispatcher
+        return dispatcher
+
+
+def dispatched_embeddings(base_embeddings) -> DispatchedEmbeddings:
+    model = base_embeddings.model
+    dimensions = getattr(base_embeddings, "dimensions", None)
+    if dimensions:
+        model = f"{model}@{dimensions}"
+    dispatcher = get_embedding_dispatcher(model, openai_embed_batch(base_embeddings))
+    return DispatchedEmbeddings(dispatcher, model)
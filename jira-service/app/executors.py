@@ -0,0 +1,112 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Awaitable, Dict, List, Optional, TypeVar
+
+from app.metrics import observe_stage
+
+if TYPE_CHECKING:
+    from langchain.schema import Document
+
+DEFAULT_IO_EXECUTOR_THREADS = 32
+DEFAULT_CPU_EXECUTOR_PROCESSES = max(1, min(4, (os.cpu_count() or 1) - 1))
+DEFAULT_CPU_OFFLOAD_MIN_CHARS = 500_000
+DEFAULT_STAGE_TIMEOUTS: Dict[str, float] = {
+    "jira_sync": 300.0,
+    "web_load": 120.0,
+    "ingest": 300.0,
+    "retrieval": 30.0,
+    "semantic_cache": 30.0,
+    "llm": 120.0,
+}
+
+T = TypeVar("T")
+
+
+class StageTimeoutError(Exception):
+    def __init__(self, stage: str, timeout: float):
+        self.stage = stage
+        self.timeout = timeout
+        super().__init__(f"Stage '{stage}' timed out after {timeout:g}s")
+
+
+_io_executor: Optional[ThreadPoolExecutor] = None
+_io_executor_guard = threading.Lock()
+_cpu_executor: Optional[ProcessPoolExecutor] = None
+_cpu_executor_guard = threading.Lock()
+
+
+def get_io_executor() -> ThreadPoolExecutor:
+    global _io_executor
+    with _io_executor_guard:
+        if _io_executor is None:
+            _io_executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv("IO_EXECUTOR_THREADS", DEFAULT_IO_EXECUTOR_THREADS)),
+                thread_name_prefix="rag-io",
+            )
+        return _io_executor
+
+
+def get_cpu_executor() -> ProcessPoolExecutor:
+    global _cpu_executor
+    with _cpu_executor_guard:
+        if _cpu_executor is None:
+            _cpu_executor = ProcessPoolExecutor(
+                max_workers=int(os.getenv(
+                    "CPU_EXECUTOR_PROCESSES", DEFAULT_CPU_EXECUTOR_PROCESSES)),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _cpu_executor
+
+
+def _worker_ready() -> bool:
+    return True
+
+
+def warm_cpu_executor() -> None:
+    get_cpu_executor().submit(_worker_ready).result()
+
+
+def install_io_executor() -> None:
+    asyncio.get_running_loop().set_default_executor(get_io_executor())
+
+
+def shutdown_executors() -> None:
+    global _io_executor, _cpu_executor
+    with _cpu_executor_guard:
+        if _cpu_executor is not None:
+            _cpu_executor.shutdown(wait=True, cancel_futures=True)
+            _cpu_executor = None
+    with _io_executor_guard:
+        if _io_executor is not None:
+            _io_executor.shutdown(wait=False, cancel_futures=True)
+            _io_executor = None
+
+
+def stage_timeout(stage: str) -> float:
+    return float(os.getenv(
+        f"STAGE_TIMEOUT_{stage.upper()}_SECONDS", DEFAULT_STAGE_TIMEOUTS[stage]))
+
+
+async def run_stage(stage: str, awaitable: Awaitable[T]) -> T:
+    timeout = stage_timeout(stage)
+    with observe_stage(stage):
+        try:
+            return await asyncio.wait_for(awaitable, timeout)
+        except asyncio.TimeoutError:
+            raise StageTimeoutError(stage, timeout) from None
+
+
+def _split_documents(text_splitter, documents: List["Document"]) -> List["Document"]:
+    return text_splitter.split_documents(documents)
+
+
+async def split_documents(text_splitter, documents: List["Document"]) -> List["Document"]:
+    size = sum(len(document.page_content) for document in documents)
+    min_chars = int(os.getenv("CPU_OFFLOAD_MIN_CHARS", DEFAULT_CPU_OFFLOAD_MIN_CHARS))
+    if size < min_chars:
+        return await asyncio.to_thread(_split_documents, text_splitter, documents)
+    return await asyncio.get_running_loop().run_in_executor(
+        get_cpu_executor(), _split_documents, text_splitter, documents)
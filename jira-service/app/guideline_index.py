@@ -0,0 +1,186 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+import numpy as np
+
+from app.ingestion import read_json_file, write_json_file
+
+if TYPE_CHECKING:
+    from langchain.schema import Document
+
+DEFAULT_GUIDELINE_INDEX_PATH = "./guideline_index"
+DEFAULT_GUIDELINE_RESULTS = 3
+DEFAULT_GUIDELINE_EMBED_BATCH_SIZE = 256
+DEFAULT_GUIDELINE_RETRY_SECONDS = 10.0
+DEFAULT_GUIDELINE_WEB_URLS = [
+    "https://community.atlassian.com/forums/Jira-articles/How-to-write-a-useful-Jira-ticket/ba-p/2147004",
+]
+DEFAULT_GUIDELINE_YOUTUBE_URLS = [
+    "https://www.youtube.com/watch?v=iryX1Oa1cMQ",
+]
+
+
+def guideline_index_path() -> str:
+    return os.getenv("GUIDELINE_INDEX_PATH", DEFAULT_GUIDELINE_INDEX_PATH)
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def build_guideline_index(
+    document_chunks: List["Document"],
+    embeddings,
+    output_path: str,
+    batch_size: int = DEFAULT_GUIDELINE_EMBED_BATCH_SIZE,
+) -> Dict[str, Any]:
+    chunks = list({
+        document.page_content: {
+            "text": document.page_content,
+            "source": document.metadata.get("source", ""),
+        }
+        for document in document_chunks
+    }.values())
+    if not chunks:
+        raise ValueError("No guideline chunks were loaded")
+
+    texts = [chunk["text"] for chunk in chunks]
+    vectors = []
+    for start in range(0, len(texts), batch_size):
+        vectors.extend(embeddings.embed_documents(texts[start:start + batch_size]))
+    matrix = normalize_rows(np.asarray(vectors, dtype=np.float32))
+
+    version_hash = hashlib.sha256(embeddings.model.encode("utf-8"))
+    for text in texts:
+        version_hash.update(b"\0" + text.encode("utf-8"))
+    version = version_hash.hexdigest()[:12]
+
+    directory = os.path.join(output_path, version)
+    os.makedirs(directory, exist_ok=True)
+    np.save(os.path.join(directory, "vectors.npy"), matrix)
+    with open(os.path.join(directory, "chunks.json"), "w") as chunks_file:
+        json.dump(chunks, chunks_file)
+    manifest = {
+        "version": version,
+        "embedding_model": embeddings.model,
+        "dimensions": int(matrix.shape[1]),
+        "chunk_count": len(chunks),
+        "sources": sorted({chunk["source"] for chunk in chunks}),
+        "built_at": time.time(),
+    }
+    write_json_file(os.path.join(directory, "manifest.json"), manifest)
+    write_json_file(os.path.join(output_path, "current.json"), {"version": version})
+    return manifest
+
+
+class GuidelineIndex:
+    def __init__(self, directory: str):
+        self.manifest = read_json_file(os.path.join(directory, "manifest.json"))
+        self.vectors = np.load(os.path.join(directory, "vectors.npy"), mmap_mode="r")
+        with open(os.path.join(directory, "chunks.json")) as chunks_file:
+            self.texts = [chunk["text"] for chunk in json.load(chunks_file)]
+
+    @property
+    def version(self) -> str:
+        return self.manifest.get("version", "")
+
+    @property
+    def embedding_model(self) -> str:
+        return self.manifest.get("embedding_model", "")
+
+    def query(self, query_embeddings: List[List[float]], n_results: int) -> List[List[str]]:
+        n_results = min(n_results, len(self.texts))
+        if not n_results:
+            return [[] for _ in query_embeddings]
+        scores = normalize_rows(np.asarray(query_embeddings, dtype=np.float32)) @ self.vectors.T
+        results = []
+        for row in scores:
+            top = np.argpartition(-row, n_results - 1)[:n_results]
+            results.append([self.texts[index] for index in top[np.argsort(-row[top])]])
+        return results
+
+
+def load_guideline_index(path: str, embedding_model: str) -> Optional[GuidelineIndex]:
+    version = read_json_file(os.path.join(path, "current.json")).get("version")
+    if not version:
+        print(
+            f"ERROR: No guideline index at {path}. Tickets will have no guideline context "
+            "and /ready reports not ready. Build one with: python -m app.guideline_index"
+        )
+        return None
+    index = GuidelineIndex(os.path.join(path, version))
+    if index.embedding_model != embedding_model:
+        print(
+            f"ERROR: Ignoring guideline index {version}: built with {index.embedding_model}, "
+            f"service embeds with {embedding_model}. Rebuild it with: python -m app.guideline_index"
+        )
+        return None
+    print(f"Loaded guideline index {version} with {len(index.texts)} chunks")
+    return index
+
+
+_guideline_index: Optional[GuidelineIndex] = None
+_guideline_index_checked_at: Optional[float] = None
+_guideline_index_guard = threading.Lock()
+
+
+def get_guideline_index(embedding_model: str) -> Optional[GuidelineIndex]:
+    global _guideline_index, _guideline_index_checked_at
+    with _guideline_index_guard:
+        # A missing or unusable index is looked for again after a short wait, so an
+        # index built after startup is picked up without a restart.
+        if _guideline_index is None and (
+            _guideline_index_checked_at is None
+            or time.monotonic() - _guideline_index_checked_at >= DEFAULT_GUIDELINE_RETRY_SECONDS
+        ):
+            _guideline_index_checked_at = time.monotonic()
+            try:
+                _guideline_index = load_guideline_index(guideline_index_path(), embedding_model)
+            except Exception as e:
+                print(f"ERROR: Could not load guideline index: {e}")
+        return _guideline_index
+
+
+async def load_default_guidelines(text_splitter, chunk_size_seconds: int) -> List["Document"]:
+    from app.web_loader import close_web_loader, load_web_chunks
+    from app.youtube_loader import load_youtube_sources
+
+    try:
+        youtube_chunks, youtube_results = await load_youtube_sources(
+            DEFAULT_GUIDELINE_YOUTUBE_URLS, text_splitter, chunk_size_seconds)
+        for result in youtube_results:
+            if not result["ok"]:
+                raise RuntimeError(f"Could not load {result['source']}: {result['error']}")
+        web_chunks = await load_web_chunks(DEFAULT_GUIDELINE_WEB_URLS, text_splitter)
+        if not web_chunks:
+            raise RuntimeError("Could not load the default guideline web pages")
+    finally:
+        await close_web_loader()
+    return youtube_chunks + web_chunks
+
+
+def main() -> None:
+    from app.main import DEFAULT_YOUTUBE_CHUNK_SECONDS, build_text_splitter, get_embeddings
+
+    parser = argparse.ArgumentParser(
+        description="Embed the default Jira guideline sources into a versioned, read-only index")
+    parser.add_argument("--output", default=guideline_index_path())
+    args = parser.parse_args()
+
+    text_splitter = build_text_splitter()
+    document_chunks = asyncio.run(
+        load_default_guidelines(text_splitter, DEFAULT_YOUTUBE_CHUNK_SECONDS))
+    manifest = build_guideline_index(document_chunks, get_embeddings(), args.output)
+    print(json.dumps(manifest, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+import os
+import re
+import sqlite3
+import threading
+from typing import Dict, List, Sequence, Tuple
+
+KEYWORD_INDEX_DIRECTORY = "./chroma_db/keyword_index"
+DEFAULT_HYBRID_CANDIDATES = 20
+DEFAULT_RRF_K = 60
+DEFAULT_KEYWORD_QUERY_TERMS = 32
+DEFAULT_KEYWORD_MAX_DOCUMENT_FRACTION = 0.1
+DEFAULT_KEYWORD_MIN_DOCUMENT_CUTOFF = 1000
+DEFAULT_KEYWORD_INDEX_BUSY_TIMEOUT_SECONDS = 30.0
+DEFAULT_KEYWORD_INDEX_COMPACT_FREE_FRACTION = 0.2
+KEYWORD_BACKFILL_PAGE_SIZE = 1000
+
+STOP_WORDS = frozenset(
+    "a an and are as at be by can for from has have how i in is it its of on or "
+    "should so that the this to was we were when where which while with would you".split()
+)
+
+_TERM_PATTERN = re.compile(r"[^\W_]+")
+_PHRASE_PATTERN = re.compile(r"[^\W_]+(?:[-_./:][^\W_]+)*")
+
+
+def text_terms(text: str) -> List[str]:
+    return [term.lower() for term in _TERM_PATTERN.findall(text)]
+
+
+def query_phrases(text: str) -> List[Tuple[str, ...]]:
+    phrases = []
+    for token in _PHRASE_PATTERN.findall(text):
+        terms = tuple(text_terms(token))
+        if len(terms) > 1 or terms[0] not in STOP_WORDS:
+            phrases.append(terms)
+    return list(dict.fromkeys(phrases))[:DEFAULT_KEYWORD_QUERY_TERMS]
+
+
+def query_terms(text: str) -> List[str]:
+    return list(dict.fromkeys(term for phrase in query_phrases(text) for term in phrase))
+
+
+class KeywordIndex:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._backfill_lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(
+            path,
+            timeout=DEFAULT_KEYWORD_INDEX_BUSY_TIMEOUT_SECONDS,
+            check_same_thread=False,
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS chunk_ids (rowid INTEGER PRIMARY KEY, id TEXT NOT NULL UNIQUE)"
+        )
+        self._connection.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS chunks USING fts5(content, tokenize='unicode61')"
+        )
+        self._connection.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS chunk_terms USING fts5vocab(chunks, 'row')"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        self._connection.commit()
+        self.backfilled = self._connection.execute(
+            "SELECT 1 FROM meta WHERE key = 'backfilled'").fetchone() is not None
+        self._count = self._connection.execute("SELECT COUNT(*) FROM chunk_ids").fetchone()[0]
+
+    def add(self, ids: List[str], texts: List[str]) -> None:
+        with self._lock:
+            for document_id, text in zip(ids, texts):
+                cursor = self._connection.execute(
+                    "INSERT OR IGNORE INTO chunk_ids (id) VALUES (?)", (document_id,))
+                if cursor.rowcount:
+                    self._connection.execute(
+                        "INSERT INTO chunks (rowid, content) VALUES (?, ?)",
+                        (cursor.lastrowid, text),
+                    )
+                    self._count += 1
+            self._connection.commit()
+
+    def remove(self, ids: List[str]) -> None:
+        with self._lock:
+            for start in range(0, len(ids), 500):
+                batch = ids[start:start + 500]
+                rowids = [row[0] for row in self._connection.execute(
+                    f"SELECT rowid FROM chunk_ids WHERE id IN ({','.join('?' * len(batch))})",
+                    batch,
+                )]
+                self._connection.executemany(
+                    "DELETE FROM chunks WHERE rowid = ?", [(rowid,) for rowid in rowids])
+                self._connection.executemany(
+                    "DELETE FROM chunk_ids WHERE rowid = ?", [(rowid,) for rowid in rowids])
+                self._count -= len(rowids)
+            self._connection.commit()
+
+    def _document_frequency(self, term: str) -> int:
+        row = self._connection.execute(
+            "SELECT doc FROM chunk_terms WHERE term = ?", (term,)).fetchone()
+        return row[0] if row else 0
+
+    def search(self, text: str, limit: int) -> List[Tuple[str, str, float]]:
+        phrases = query_phrases(text)
+        if not phrases:
+            return []
+        with self._lock:
+            # Phrases that match a large share of a big index are skipped because their
+            # posting lists dominate query time. Below the floor BM25's IDF already
+            # down-weights common terms, and the LIMIT bounds the candidates.
+            max_documents = max(
+                DEFAULT_KEYWORD_MIN_DOCUMENT_CUTOFF,
+                int(self._count * DEFAULT_KEYWORD_MAX_DOCUMENT_FRACTION),
+            )
+            frequencies = [
+                (min(self._document_frequency(term) for term in phrase), phrase) for phrase in phrases
+            ]
+            frequencies = [(frequency, phrase) for frequency, phrase in frequencies if frequency]
+            if not frequencies:
+                return []
+            phrases = [phrase for frequency, phrase in frequencies if frequency <= max_documents]
+            if not phrases:
+                phrases = [min(frequencies)[1]]
+            match = " OR ".join(f'"{" ".join(phrase)}"' for phrase in phrases)
+            return self._connection.execute(
+                "SELECT chunk_ids.id, chunks.content, -bm25(chunks) FROM chunks "
+                "JOIN chunk_ids ON chunk_ids.rowid = chunks.rowid "
+                "WHERE chunks MATCH ? ORDER BY rank LIMIT ?",
+                (match, limit),
+            ).fetchall()
+
+    def count(self) -> int:
+        return self._count
+
+    def compact(self, min_free_fraction: float = DEFAULT_KEYWORD_INDEX_COMPACT_FREE_FRACTION) -> bool:
+        with self._lock:
+            page_count = self._connection.execute("PRAGMA page_count").fetchone()[0]
+            free_pages = self._connection.execute("PRAGMA freelist_count").fetchone()[0]
+            if not page_count or free_pages / page_count < min_free_fraction:
+                return False
+            self._connection.execute("INSERT INTO chunks (chunks) VALUES ('optimize')")
+            self._connection.commit()
+            self._connection.execute("VACUUM")
+            return True
+
+    def backfill(self, collection) -> None:
+        with self._backfill_lock:
+            if self.backfilled:
+                return
+            offset = 0
+            while True:
+                page = collection.get(
+                    include=["documents"], limit=KEYWORD_BACKFILL_PAGE_SIZE, offset=offset)
+                if not page["ids"]:
+                    break
+                self.add(page["ids"], page["documents"])
+                offset += len(page["ids"])
+            with self._lock:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('backfilled', '1')")
+                self._connection.commit()
+            self.backfilled = True
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+_keyword_indexes: Dict[str, KeywordIndex] = {}
+_keyword_indexes_guard = threading.Lock()
+
+
+def _keyword_index_path(collection_name: str) -> str:
+    return os.path.join(KEYWORD_INDEX_DIRECTORY, f"{collection_name}.sqlite3")
+
+
+def get_keyword_index(collection) -> KeywordIndex:
+    with _keyword_indexes_guard:
+        index = _keyword_indexes.get(collection.name)
+        if index is None:
+            index = KeywordIndex(_keyword_index_path(collection.name))
+            _keyword_indexes[collection.name] = index
+    if not index.backfilled:
+        index.backfill(collection)
+    return index
+
+
+def drop_keyword_index(collection_name: str) -> None:
+    with _keyword_indexes_guard:
+        index = _keyword_indexes.pop(collection_name, None)
+    if index is not None:
+        index.close()
+    path = _keyword_index_path(collection_name)
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.remove(path + suffix)
+        except FileNotFoundError:
+            pass
+
+
+def keyword_index_bytes(collection_name: str) -> int:
+    path = _keyword_index_path(collection_name)
+    return sum(
+        os.path.getsize(path + suffix)
+        for suffix in ("", "-wal", "-shm")
+        if os.path.exists(path + suffix)
+    )
+
+
+def compact_keyword_index(collection_name: str) -> bool:
+    path = _keyword_index_path(collection_name)
+    if not os.path.exists(path):
+        return False
+    with _keyword_indexes_guard:
+        index = _keyword_indexes.get(collection_name)
+        if index is None:
+            index = KeywordIndex(path)
+            _keyword_indexes[collection_name] = index
+    return index.compact()
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int = DEFAULT_RRF_K) -> Dict[str, float]:
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, document_id in enumerate(ranking):
+            scores[document_id] = scores.get(document_id, 0.0) + 1.0 / (k + rank + 1)
+    return scores
+
+
+def rerank_by_coverage(prompt: str, scores: Dict[str, float], texts: Dict[str, str]) -> Dict[str, float]:
+    terms = set(query_terms(prompt))
+    if not terms or not scores:
+        return scores
+    best = max(scores.values())
+    return {
+        document_id: score / best + len(terms.intersection(text_terms(texts[document_id]))) / len(terms)
+        for document_id, score in scores.items()
+    }
+
+
+def hybrid_query(collection, prompts: List[str], n_results: int) -> List[List[str]]:
+    candidates = max(n_results, int(os.getenv("HYBRID_CANDIDATES", DEFAULT_HYBRID_CANDIDATES)))
+    rerank = os.getenv("HYBRID_RERANK", "false").lower() == "true"
+    index = get_keyword_index(collection)
+    vector_results = collection.query(query_texts=prompts, n_results=candidates)
+
+    contexts = []
+    for prompt, vector_ids, vector_documents in zip(
+        prompts, vector_results["ids"], vector_results["documents"]
+    ):
+        texts = dict(zip(vector_ids, vector_documents))
+        keyword_hits = index.search(prompt, candidates)
+        for document_id, content, _ in keyword_hits:
+            texts.setdefault(document_id, content)
+
+        scores = reciprocal_rank_fusion(
+            [vector_ids, [document_id for document_id, _, _ in keyword_hits]])
+        if rerank:
+            scores = rerank_by_coverage(prompt, scores, texts)
+        ranked = sorted(scores, key=scores.get, reverse=True)[:n_results]
+        contexts.append([texts[document_id] for document_id in ranked])
+    return contexts
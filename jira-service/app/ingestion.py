@@ -0,0 +1,300 @@
+import hashlib
+import json
+import os
+import threading
+import weakref
+from contextlib import ExitStack, contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from app.hybrid_retrieval import get_keyword_index
+
+if TYPE_CHECKING:
+    from langchain.schema import Document
+
+CHROMA_MANIFEST_DIRECTORY = "./chroma_db/manifests"
+DEFAULT_SOURCE_KEY = "default"
+DEFAULT_INGEST_BATCH_SIZE = 256
+
+_manifest_locks: Dict[str, threading.Lock] = {}
+_manifest_locks_guard = threading.Lock()
+_active_ingests: Dict[str, "weakref.WeakSet[StreamingIngest]"] = {}
+_active_ingests_guard = threading.Lock()
+
+
+def chunk_id(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def tag_documents(documents: List["Document"], source_key: str) -> List["Document"]:
+    for document in documents:
+        document.metadata["source_key"] = source_key
+    return documents
+
+
+def tag_web_documents(documents: List["Document"]) -> List["Document"]:
+    for document in documents:
+        document.metadata["source_key"] = f"web:{document.metadata.get('source', '')}"
+    return documents
+
+
+def source_type(document: "Document") -> str:
+    return document.metadata.get("source_key", DEFAULT_SOURCE_KEY).split(":", 1)[0]
+
+
+def _manifest_lock(collection_name: str) -> threading.Lock:
+    with _manifest_locks_guard:
+        return _manifest_locks.setdefault(collection_name, threading.Lock())
+
+
+@contextmanager
+def _claimed_ids(collection_name: str, exclude: Optional["StreamingIngest"] = None) -> Iterator[Set[str]]:
+    # Chunk ids seen by other in-flight ingests into this collection. They may have
+    # skipped a chunk because it already existed, and will reference it once they
+    # finish, so it must not be deleted as stale or orphaned. Callers hold the
+    # manifest lock, so only one caller at a time takes the ingests' locks.
+    with _active_ingests_guard:
+        ingests = [
+            ingest for ingest in _active_ingests.get(collection_name, ()) if ingest is not exclude
+        ]
+    with ExitStack() as stack:
+        claimed: Set[str] = set()
+        for ingest in ingests:
+            stack.enter_context(ingest._lock)
+            claimed.update(ingest._seen_ids)
+        yield claimed
+
+
+def _manifest_path(collection_name: str) -> str:
+    return os.path.join(CHROMA_MANIFEST_DIRECTORY, f"{collection_name}.json")
+
+
+def read_json_file(path: str) -> Dict[str, Any]:
+    try:
+        with open(path) as json_file:
+            return json.load(json_file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def write_json_file(path: str, data: Dict[str, Any]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w") as json_file:
+        json.dump(data, json_file)
+    os.replace(temporary_path, path)
+
+
+def _version_path(collection_name: str) -> str:
+    return os.path.join(CHROMA_MANIFEST_DIRECTORY, f"{collection_name}.version.json")
+
+
+def get_collection_version(collection_name: str) -> int:
+    return read_json_file(_version_path(collection_name)).get("version", 0)
+
+
+def _bump_collection_version(collection_name: str) -> None:
+    write_json_file(
+        _version_path(collection_name),
+        {"version": get_collection_version(collection_name) + 1},
+    )
+
+
+def load_manifest(collection_name: str) -> Dict[str, List[str]]:
+    return read_json_file(_manifest_path(collection_name))
+
+
+def save_manifest(collection_name: str, manifest: Dict[str, List[str]]) -> None:
+    write_json_file(_manifest_path(collection_name), manifest)
+
+
+def drop_collection_state(collection_name: str) -> None:
+    with _manifest_lock(collection_name):
+        try:
+            os.remove(_manifest_path(collection_name))
+        except FileNotFoundError:
+            pass
+        _bump_collection_version(collection_name)
+
+
+class StreamingIngest:
+    def __init__(
+        self,
+        collection,
+        build_metadata: Callable[["Document"], Dict[str, Any]],
+        embedding_function: Optional[Callable[[List[str]], List[List[float]]]] = None,
+        progress: Optional[Callable[[str, int], None]] = None,
+        batch_size: int = DEFAULT_INGEST_BATCH_SIZE,
+        check_cancelled: Optional[Callable[[], None]] = None,
+    ):
+        self.collection = collection
+        self.build_metadata = build_metadata
+        self.embedding_function = embedding_function
+        self.progress = progress
+        self.batch_size = batch_size
+        self.check_cancelled = check_cancelled
+        self.chunk_count = 0
+        self.stats = {"added": 0, "removed": 0, "unchanged": 0}
+        self._ids_by_source: Dict[str, Dict[str, None]] = {}
+        self._seen_ids: Set[str] = set()
+        self._pending: List[Tuple[str, "Document"]] = []
+        self._written_ids: List[str] = []
+        self._aborted = False
+        self._lock = threading.Lock()
+        with _active_ingests_guard:
+            _active_ingests.setdefault(collection.name, weakref.WeakSet()).add(self)
+
+    def _release(self) -> None:
+        with _active_ingests_guard:
+            _active_ingests.get(self.collection.name, weakref.WeakSet()).discard(self)
+
+    def add(self, document_chunks: Iterable["Document"]) -> int:
+        count = 0
+        with self._lock:
+            for document in document_chunks:
+                count += 1
+                document_id = chunk_id(document.page_content)
+                source_key = document.metadata.get("source_key", DEFAULT_SOURCE_KEY)
+                self._ids_by_source.setdefault(source_key, {})[document_id] = None
+                if document_id in self._seen_ids:
+                    continue
+                self._seen_ids.add(document_id)
+                self._pending.append((document_id, document))
+                if len(self._pending) >= self.batch_size:
+                    self._flush_locked()
+        self.chunk_count += count
+        return count
+
+    def _flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        batch, self._pending = self._pending, []
+        if not batch or self._aborted:
+            return
+
+        existing_ids = set(self.collection.get(
+            ids=[document_id for document_id, _ in batch], include=[])["ids"])
+        self.stats["unchanged"] += len(existing_ids)
+        new_chunks = [
+            (document_id, document) for document_id, document in batch
+            if document_id not in existing_ids
+        ]
+        if not new_chunks:
+            return
+
+        batch_ids = [document_id for document_id, _ in new_chunks]
+        batch_documents = [document.page_content for _, document in new_chunks]
+        keyword_index = get_keyword_index(self.collection)
+        batch_embeddings = None
+        if self.embedding_function is not None:
+            batch_embeddings = self.embedding_function(batch_documents)
+            if self.progress:
+                self.progress("embedded", len(new_chunks))
+        if self.check_cancelled:
+            self.check_cancelled()
+        self.collection.add(
+            documents=batch_documents,
+            embeddings=batch_embeddings,
+            metadatas=[self.build_metadata(document) for _, document in new_chunks],
+            ids=batch_ids,
+        )
+        keyword_index.add(batch_ids, batch_documents)
+        self._written_ids.extend(batch_ids)
+        self.stats["added"] += len(new_chunks)
+        if self.progress:
+            if self.embedding_function is None:
+                self.progress("embedded", len(new_chunks))
+            self.progress("written", len(new_chunks))
+
+    def abort(self) -> int:
+        with self._lock:
+            self._aborted = True
+            self._pending = []
+            written_ids, self._written_ids = self._written_ids, []
+        if not written_ids:
+            self._release()
+            return 0
+
+        with _manifest_lock(self.collection.name):
+            self._release()
+            referenced_ids = set()
+            for document_ids in load_manifest(self.collection.name).values():
+                referenced_ids.update(document_ids)
+            with _claimed_ids(self.collection.name) as claimed_ids:
+                orphaned_ids = [
+                    document_id for document_id in written_ids
+                    if document_id not in referenced_ids and document_id not in claimed_ids
+                ]
+                if orphaned_ids:
+                    self.collection.delete(ids=orphaned_ids)
+                    get_keyword_index(self.collection).remove(orphaned_ids)
+        return len(orphaned_ids)
+
+    def finish(self) -> Dict[str, int]:
+        self._flush()
+        if self._aborted:
+            return dict(self.stats)
+
+        with _manifest_lock(self.collection.name):
+            self._release()
+            manifest = load_manifest(self.collection.name)
+
+            previous_ids = set()
+            for source_key, document_ids in self._ids_by_source.items():
+                previous_ids.update(manifest.get(source_key, []))
+                manifest[source_key] = list(document_ids)
+
+            referenced_ids = set()
+            for document_ids in manifest.values():
+                referenced_ids.update(document_ids)
+
+            with _claimed_ids(self.collection.name) as claimed_ids:
+                stale_ids = list(previous_ids - referenced_ids - claimed_ids)
+                if stale_ids:
+                    self.collection.delete(ids=stale_ids)
+                    get_keyword_index(self.collection).remove(stale_ids)
+
+            save_manifest(self.collection.name, manifest)
+            if self.stats["added"] or stale_ids:
+                _bump_collection_version(self.collection.name)
+
+        self.stats["removed"] = len(stale_ids)
+        self._written_ids = []
+        return dict(self.stats)
+
+
+def ingest_documents(
+    collection,
+    document_chunks: Iterable["Document"],
+    build_metadata: Callable[["Document"], Dict[str, Any]],
+    embedding_function: Optional[Callable[[List[str]], List[List[float]]]] = None,
+    progress: Optional[Callable[[str, int], None]] = None,
+) -> Dict[str, int]:
+    ingest = StreamingIngest(collection, build_metadata, embedding_function, progress)
+    ingest.add(document_chunks)
+    return ingest.finish()
+
+
+def remove_sources(collection, source_keys: List[str]) -> int:
+    with _manifest_lock(collection.name):
+        manifest = load_manifest(collection.name)
+
+        removed_ids = set()
+        for source_key in source_keys:
+            removed_ids.update(manifest.pop(source_key, []))
+
+        for document_ids in manifest.values():
+            removed_ids.difference_update(document_ids)
+
+        with _claimed_ids(collection.name) as claimed_ids:
+            removed_ids -= claimed_ids
+            if removed_ids:
+                collection.delete(ids=list(removed_ids))
+                get_keyword_index(collection).remove(list(removed_ids))
+
+        save_manifest(collection.name, manifest)
+        if removed_ids:
+            _bump_collection_version(collection.name)
+
+    return len(removed_ids)
@@ -0,0 +1,129 @@
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+import httpx
+
+DEFAULT_JIRA_PAGE_SIZE = 100
+DEFAULT_JIRA_MAX_CONCURRENT_PAGES = 4
+DEFAULT_JIRA_TIMEOUT_SECONDS = 30.0
+DEFAULT_JIRA_MAX_CONNECTIONS = 20
+DEFAULT_JIRA_MAX_KEEPALIVE_CONNECTIONS = 10
+JIRA_ISSUE_FIELDS = ["summary", "description", "status", "priority", "updated"]
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+def get_jira_client(jira_base_url: str) -> httpx.AsyncClient:
+    base_url = jira_base_url.rstrip("/")
+    client = _clients.get(base_url)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=DEFAULT_JIRA_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=DEFAULT_JIRA_MAX_CONNECTIONS,
+                max_keepalive_connections=DEFAULT_JIRA_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        )
+        _clients[base_url] = client
+    return client
+
+
+async def close_jira_clients() -> None:
+    clients = list(_clients.values())
+    _clients.clear()
+    await asyncio.gather(*(client.aclose() for client in clients))
+
+
+def _auth_headers(access_token: str) -> Dict[str, str]:
+    return {"Accept": "application/json", "Authorization": f"Bearer {access_token}"}
+
+
+async def fetch_project(
+    client: httpx.AsyncClient, project_key: str, access_token: str
+) -> Dict[str, Any]:
+    response = await client.get(
+        f"/rest/api/3/project/{project_key}", headers=_auth_headers(access_token)
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+async def fetch_issue_page(
+    client: httpx.AsyncClient,
+    jql: str,
+    access_token: str,
+    start_at: int,
+    page_size: int = DEFAULT_JIRA_PAGE_SIZE,
+    fields: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    response = await client.get(
+        "/rest/api/3/search",
+        headers=_auth_headers(access_token),
+        params={
+            "jql": jql,
+            "startAt": start_at,
+            "maxResults": page_size,
+            "fields": ",".join(fields or JIRA_ISSUE_FIELDS),
+        },
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+async def iter_issues(
+    client: httpx.AsyncClient,
+    jql: str,
+    access_token: str,
+    first_page: Optional[Dict[str, Any]] = None,
+    page_size: int = DEFAULT_JIRA_PAGE_SIZE,
+    max_concurrent_pages: int = DEFAULT_JIRA_MAX_CONCURRENT_PAGES,
+    max_issues: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    if first_page is None:
+        first_page = await fetch_issue_page(
+            client, jql, access_token, 0, page_size, fields)
+
+    total = first_page.get("total", 0)
+    if max_issues is not None:
+        total = min(total, max_issues)
+
+    yielded = 0
+    for issue in first_page.get("issues", [])[:total]:
+        yield issue
+        yielded += 1
+
+    offsets = deque(range(page_size, total, page_size))
+    in_flight: Deque[asyncio.Future] = deque()
+    try:
+        while offsets or in_flight:
+            while offsets and len(in_flight) < max_concurrent_pages:
+                in_flight.append(asyncio.ensure_future(fetch_issue_page(
+                    client, jql, access_token, offsets.popleft(), page_size, fields
+                )))
+            page = await in_flight.popleft()
+            for issue in page.get("issues", []):
+                if yielded >= total:
+                    return
+                yield issue
+                yielded += 1
+    finally:
+        for task in in_flight:
+            task.cancel()
+
+
+async def fetch_project_and_first_page(
+    client: httpx.AsyncClient,
+    project_key: str,
+    jql: str,
+    access_token: str,
+    page_size: int = DEFAULT_JIRA_PAGE_SIZE,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    project_data, first_page = await asyncio.gather(
+        fetch_project(client, project_key, access_token),
+        fetch_issue_page(client, jql, access_token, 0, page_size),
+    )
+    return project_data, first_page
+
@@ -0,0 +1,195 @@
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Set
+
+from app.executors import split_documents
+from app.ingestion import (
+    ingest_documents,
+    load_manifest,
+    read_json_file,
+    remove_sources,
+    write_json_file,
+)
+from app.jira_client import fetch_project_and_first_page, get_jira_client, iter_issues
+
+if TYPE_CHECKING:
+    from langchain.schema import Document
+
+JIRA_SYNC_STATE_DIRECTORY = "./chroma_db/sync_state"
+JIRA_SYNC_BATCH_SIZE = 200
+JIRA_SYNC_RECONCILE_INTERVAL = timedelta(hours=1)
+# JQL compares dates in the Jira user's timezone, so every delta re-reads a
+# day of overlap. Unchanged issues hash to existing chunks and embed nothing.
+JIRA_SYNC_WATERMARK_OVERLAP = timedelta(days=1)
+JIRA_UPDATED_FORMAT = "%Y-%m-%dT%H:%M:%S.%f%z"
+
+
+def project_to_document(project_key: str, project_data: Dict[str, Any]) -> "Document":
+    from langchain.schema import Document
+
+    project_document = f"""
+    Project: {project_data['name']}
+    Key: {project_data['key']}
+    Description: {project_data.get('description', 'No description')}
+    Project Type: {project_data.get('projectTypeKey', 'Unknown')}
+    """
+    return Document(
+        page_content=project_document,
+        metadata={"source": "jira", "source_key": f"jira:{project_key}"},
+    )
+
+
+def issue_to_document(issue: Dict[str, Any]) -> "Document":
+    from langchain.schema import Document
+
+    issue_document = f"""
+        Issue: {issue['key']}
+        Summary: {issue['fields']['summary']}
+        Description: {issue['fields'].get('description', 'No description')}
+        Status: {issue['fields']['status']['name']}
+        Priority: {issue['fields']['priority']['name']}
+        """
+    return Document(
+        page_content=issue_document,
+        metadata={"source": "jira", "source_key": f"jira:{issue['key']}"},
+    )
+
+
+async def iter_project_documents(
+    project_key: str, access_token: str, jira_base_url: str
+) -> AsyncIterator["Document"]:
+    client = get_jira_client(jira_base_url)
+    jql_query = f"project = {project_key} ORDER BY created DESC"
+
+    project_data, first_page = await fetch_project_and_first_page(
+        client, project_key, jql_query, access_token
+    )
+    yield project_to_document(project_key, project_data)
+
+    async for issue in iter_issues(client, jql_query, access_token, first_page=first_page):
+        yield issue_to_document(issue)
+
+
+def _sync_state_path(collection_name: str) -> str:
+    return os.path.join(JIRA_SYNC_STATE_DIRECTORY, f"{collection_name}.json")
+
+
+def load_sync_state(collection_name: str) -> Dict[str, Any]:
+    return read_json_file(_sync_state_path(collection_name))
+
+
+def save_sync_state(collection_name: str, state: Dict[str, Any]) -> None:
+    write_json_file(_sync_state_path(collection_name), state)
+
+
+def delete_sync_state(collection_name: str) -> None:
+    try:
+        os.remove(_sync_state_path(collection_name))
+    except FileNotFoundError:
+        pass
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _parse_issue_updated(issue: Dict[str, Any]) -> Optional[datetime]:
+    updated = issue.get("fields", {}).get("updated")
+    if not updated:
+        return None
+    try:
+        return datetime.strptime(updated, JIRA_UPDATED_FORMAT).astimezone(timezone.utc)
+    except ValueError:
+        return None
+
+
+def build_delta_jql(project_key: str, watermark: Optional[datetime]) -> str:
+    if watermark is None:
+        return f"project = {project_key} ORDER BY updated ASC"
+    since = (watermark - JIRA_SYNC_WATERMARK_OVERLAP).strftime("%Y/%m/%d %H:%M")
+    return f'project = {project_key} AND updated >= "{since}" ORDER BY updated ASC'
+
+
+async def _ingest_batch(
+    collection, project_key: str, documents: List["Document"], text_splitter, stats: Dict[str, int]
+) -> None:
+    ingestion_stats = await asyncio.to_thread(
+        ingest_documents,
+        collection,
+        await split_documents(text_splitter, documents),
+        lambda document: {"source": "jira", "project": project_key},
+    )
+    for key, value in ingestion_stats.items():
+        stats[key] += value
+
+
+async def _fetch_live_issue_keys(client, project_key: str, access_token: str) -> Set[str]:
+    return {
+        issue["key"] async for issue in iter_issues(
+            client, f"project = {project_key}", access_token, fields=["key"]
+        )
+    }
+
+
+def _remove_deleted_issues(collection, project_key: str, live_issue_keys: Set[str]) -> int:
+    issue_prefix = f"jira:{project_key}-"
+    deleted_sources = [
+        source_key for source_key in load_manifest(collection.name)
+        if source_key.startswith(issue_prefix)
+        and source_key[len("jira:"):] not in live_issue_keys
+    ]
+    return remove_sources(collection, deleted_sources) if deleted_sources else 0
+
+
+async def sync_project(
+    collection, project_key: str, access_token: str, jira_base_url: str, text_splitter
+) -> Dict[str, int]:
+    state = load_sync_state(collection.name)
+    watermark = _parse_timestamp(state.get("watermark"))
+    reconciled_at = _parse_timestamp(state.get("reconciled_at"))
+    sync_started_at = datetime.now(timezone.utc)
+
+    client = get_jira_client(jira_base_url)
+    jql_query = build_delta_jql(project_key, watermark)
+    project_data, first_page = await fetch_project_and_first_page(
+        client, project_key, jql_query, access_token
+    )
+
+    stats = {"issues": 0, "added": 0, "removed": 0, "unchanged": 0}
+    latest_update = watermark
+    seen_issue_keys: Set[str] = set()
+    batch = [project_to_document(project_key, project_data)]
+
+    async for issue in iter_issues(client, jql_query, access_token, first_page=first_page):
+        batch.append(issue_to_document(issue))
+        seen_issue_keys.add(issue["key"])
+        stats["issues"] += 1
+
+        updated = _parse_issue_updated(issue)
+        if updated and (latest_update is None or updated > latest_update):
+            latest_update = updated
+
+        if len(batch) >= JIRA_SYNC_BATCH_SIZE:
+            await _ingest_batch(collection, project_key, batch, text_splitter, stats)
+            batch = []
+
+    if batch:
+        await _ingest_batch(collection, project_key, batch, text_splitter, stats)
+
+    if watermark is None:
+        stats["removed"] += await asyncio.to_thread(
+            _remove_deleted_issues, collection, project_key, seen_issue_keys)
+        reconciled_at = sync_started_at
+    elif reconciled_at is None or sync_started_at - reconciled_at >= JIRA_SYNC_RECONCILE_INTERVAL:
+        live_issue_keys = await _fetch_live_issue_keys(client, project_key, access_token)
+        stats["removed"] += await asyncio.to_thread(
+            _remove_deleted_issues, collection, project_key, live_issue_keys)
+        reconciled_at = sync_started_at
+
+    save_sync_state(collection.name, {
+        "watermark": latest_update.isoformat() if latest_update else None,
+        "reconciled_at": reconciled_at.isoformat(),
+    })
+
+    return stats
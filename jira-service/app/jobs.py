@@ -0,0 +1,353 @@
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+JOB_DATABASE_PATH = "./chroma_db/jobs.sqlite3"
+JOB_STAGES = ("fetched", "split", "embedded", "written")
+DEFAULT_JOB_WORKERS = 2
+DEFAULT_JOB_HEARTBEAT_SECONDS = 15.0
+DEFAULT_JOB_HEARTBEAT_TIMEOUT_SECONDS = 60.0
+DEFAULT_JOB_RETENTION_SECONDS = 7 * 24 * 3600
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+JOB_FINISHED_STATUSES = (JOB_SUCCEEDED, JOB_FAILED, JOB_CANCELLED)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+def _new_job(job_id: str, kind: str, owner: str) -> Dict[str, Any]:
+    now = datetime.utcnow().isoformat()
+    return {
+        "job_id": job_id,
+        "kind": kind,
+        "owner": owner,
+        "heartbeat_at": time.time(),
+        "status": JOB_QUEUED,
+        "progress": {stage: 0 for stage in JOB_STAGES},
+        "result": None,
+        "error": None,
+        "cancel_requested": False,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def _is_orphaned(job: Dict[str, Any], owner: str, stale_before: float) -> bool:
+    return (
+        job["status"] not in JOB_FINISHED_STATUSES
+        and job.get("owner") != owner
+        and job.get("heartbeat_at", 0.0) < stale_before
+    )
+
+
+def _is_expired(job: Dict[str, Any], finished_before: str) -> bool:
+    return job["status"] in JOB_FINISHED_STATUSES and job["updated_at"] < finished_before
+
+
+def _interrupted(job: Dict[str, Any]) -> Dict[str, Any]:
+    job.update(
+        status=JOB_FAILED,
+        error="Interrupted: the worker running this job stopped",
+        updated_at=datetime.utcnow().isoformat(),
+    )
+    return job
+
+
+class InMemoryJobStore:
+    def __init__(self):
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def create(self, job_id: str, kind: str, owner: str) -> Dict[str, Any]:
+        job = _new_job(job_id, kind, owner)
+        with self._lock:
+            self._jobs[job_id] = job
+            return json.loads(json.dumps(job))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return json.loads(json.dumps(job)) if job else None
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job:
+                job.update(fields, updated_at=datetime.utcnow().isoformat())
+
+    def add_progress(self, job_id: str, stage: str, count: int) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job:
+                job["progress"][stage] += count
+                job["updated_at"] = datetime.utcnow().isoformat()
+
+    def heartbeat(self, job_ids: List[str]) -> None:
+        now = time.time()
+        with self._lock:
+            for job_id in job_ids:
+                if job_id in self._jobs:
+                    self._jobs[job_id]["heartbeat_at"] = now
+
+    def mark_interrupted(self, owner: str, stale_before: float) -> int:
+        return 0
+
+    def prune(self, finished_before: str) -> int:
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items() if _is_expired(job, finished_before)
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+        return len(expired)
+
+
+class SQLiteJobStore:
+    def __init__(self, path: str = JOB_DATABASE_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS jobs (job_id TEXT PRIMARY KEY, data TEXT NOT NULL)"
+        )
+        self._connection.commit()
+
+    def _read(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connection.execute(
+            "SELECT data FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _write(self, job: Dict[str, Any]) -> None:
+        self._connection.execute(
+            "INSERT OR REPLACE INTO jobs (job_id, data) VALUES (?, ?)",
+            (job["job_id"], json.dumps(job)),
+        )
+        self._connection.commit()
+
+    def create(self, job_id: str, kind: str, owner: str) -> Dict[str, Any]:
+        job = _new_job(job_id, kind, owner)
+        with self._lock:
+            self._write(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._read(job_id)
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        with self._lock:
+            job = self._read(job_id)
+            if job:
+                job.update(fields, updated_at=datetime.utcnow().isoformat())
+                self._write(job)
+
+    def add_progress(self, job_id: str, stage: str, count: int) -> None:
+        with self._lock:
+            job = self._read(job_id)
+            if job:
+                job["progress"][stage] += count
+                job["updated_at"] = datetime.utcnow().isoformat()
+                self._write(job)
+
+    def heartbeat(self, job_ids: List[str]) -> None:
+        now = time.time()
+        with self._lock:
+            for job_id in job_ids:
+                job = self._read(job_id)
+                if job:
+                    job["heartbeat_at"] = now
+                    self._write(job)
+
+    def _unfinished_jobs(self) -> List[Dict[str, Any]]:
+        placeholders = ",".join("?" * len(JOB_FINISHED_STATUSES))
+        rows = self._connection.execute(
+            f"SELECT data FROM jobs WHERE json_extract(data, '$.status') NOT IN ({placeholders})",
+            JOB_FINISHED_STATUSES,
+        ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def mark_interrupted(self, owner: str, stale_before: float) -> int:
+        with self._lock:
+            orphaned = [
+                job for job in self._unfinished_jobs() if _is_orphaned(job, owner, stale_before)
+            ]
+            for job in orphaned:
+                self._write(_interrupted(job))
+        return len(orphaned)
+
+    def prune(self, finished_before: str) -> int:
+        placeholders = ",".join("?" * len(JOB_FINISHED_STATUSES))
+        with self._lock:
+            cursor = self._connection.execute(
+                f"DELETE FROM jobs WHERE json_extract(data, '$.status') IN ({placeholders}) "
+                "AND json_extract(data, '$.updated_at') < ?",
+                (*JOB_FINISHED_STATUSES, finished_before),
+            )
+            self._connection.commit()
+        return cursor.rowcount
+
+
+class JobContext:
+    def __init__(self, store, job_id: str):
+        self.store = store
+        self.job_id = job_id
+
+    def check_cancelled(self) -> None:
+        job = self.store.get(self.job_id)
+        if job and job["cancel_requested"]:
+            raise JobCancelled(self.job_id)
+
+    def add_progress(self, stage: str, count: int) -> None:
+        self.check_cancelled()
+        self.record_progress(stage, count)
+
+    def record_progress(self, stage: str, count: int) -> None:
+        self.store.add_progress(self.job_id, stage, count)
+
+
+JobHandler = Callable[[JobContext, Dict[str, Any]], Awaitable[Any]]
+
+
+class JobQueue:
+    def __init__(
+        self,
+        store,
+        workers: int = DEFAULT_JOB_WORKERS,
+        heartbeat_seconds: float = DEFAULT_JOB_HEARTBEAT_SECONDS,
+        heartbeat_timeout_seconds: float = DEFAULT_JOB_HEARTBEAT_TIMEOUT_SECONDS,
+        retention_seconds: float = DEFAULT_JOB_RETENTION_SECONDS,
+    ):
+        self.store = store
+        self.workers = workers
+        self.heartbeat_seconds = heartbeat_seconds
+        self.heartbeat_timeout_seconds = heartbeat_timeout_seconds
+        self.retention_seconds = retention_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._handlers: Dict[str, JobHandler] = {}
+        self._payloads: Dict[str, Dict[str, Any]] = {}
+        self._running: Dict[str, asyncio.Task] = {}
+        self._active: Set[str] = set()
+        self._worker_tasks: List[asyncio.Task] = []
+        self._queue: Optional[asyncio.Queue] = None
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        self._handlers[kind] = handler
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._worker_tasks = [
+            asyncio.create_task(self._worker()) for _ in range(self.workers)
+        ]
+        self._worker_tasks.append(asyncio.create_task(self._maintain()))
+
+    def maintain(self) -> None:
+        self.store.heartbeat(list(self._active))
+        interrupted = self.store.mark_interrupted(
+            self.owner, time.time() - self.heartbeat_timeout_seconds)
+        if interrupted:
+            print(f"Marked {interrupted} jobs from stopped workers as failed")
+        finished_before = datetime.utcfromtimestamp(time.time() - self.retention_seconds).isoformat()
+        self.store.prune(finished_before)
+
+    async def _maintain(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.maintain)
+            except Exception as e:
+                print(f"Error maintaining job store: {e}")
+            await asyncio.sleep(self.heartbeat_seconds)
+
+    async def stop(self) -> None:
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+    async def submit(self, kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        if self._queue is None:
+            await self.start()
+
+        job_id = uuid.uuid4().hex
+        job = self.store.create(job_id, kind, self.owner)
+        self._payloads[job_id] = payload
+        self._active.add(job_id)
+        await self._queue.put(job_id)
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.store.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self.store.get(job_id)
+        if job is None or job["status"] in JOB_FINISHED_STATUSES:
+            return job
+
+        self.store.update(job_id, cancel_requested=True)
+        if job["status"] == JOB_QUEUED:
+            self.store.update(job_id, status=JOB_CANCELLED)
+            self._payloads.pop(job_id, None)
+            self._active.discard(job_id)
+
+        task = self._running.get(job_id)
+        if task:
+            task.cancel()
+        return self.store.get(job_id)
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str) -> None:
+        payload = self._payloads.pop(job_id, None)
+        job = self.store.get(job_id)
+        if job is None or payload is None or job["status"] != JOB_QUEUED:
+            self._active.discard(job_id)
+            return
+
+        self.store.update(job_id, status=JOB_RUNNING)
+        context = JobContext(self.store, job_id)
+        task = asyncio.ensure_future(self._handlers[job["kind"]](context, payload))
+        self._running[job_id] = task
+        try:
+            result = await task
+            self.store.update(job_id, status=JOB_SUCCEEDED, result=result)
+        except (asyncio.CancelledError, JobCancelled):
+            job = self.store.get(job_id)
+            if not job or not job["cancel_requested"]:
+                self.store.update(job_id, status=JOB_FAILED, error="Worker stopped")
+                raise
+            self.store.update(job_id, status=JOB_CANCELLED)
+        except Exception as e:
+            print(f"Job {job_id} failed: {e}")
+            self.store.update(job_id, status=JOB_FAILED, error=str(e))
+        finally:
+            self._running.pop(job_id, None)
+            self._active.discard(job_id)
+
+
+def create_job_store():
+    if os.getenv("JOB_STORE", "sqlite") == "memory":
+        return InMemoryJobStore()
+    return SQLiteJobStore(os.getenv("JOB_DATABASE_PATH", JOB_DATABASE_PATH))
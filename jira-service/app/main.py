@@ -1,30 +1,77 @@
-from sprint_shared.aws.s3_service import S3Service
-from fastapi import FastAPI, HTTPException, Depends
+from sprint_shared.aws.s3_service import get_s3_service
+from sprint_shared.aws.ticket_writer import close_ticket_writer, get_ticket_writer
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.security import APIKeyHeader
 from pydantic import BaseModel
-from typing import Optional, List
+from starlette.background import BackgroundTask
+from typing import TYPE_CHECKING, Any, Dict, Optional, List, Tuple
 import os
 import json
-import requests
+import queue
+import asyncio
+import threading
+import time
+import uuid
+from concurrent.futures import Future
 from dotenv import load_dotenv
-from langchain_openai import OpenAIEmbeddings
-from langchain_chroma import Chroma
-from langchain_openai import ChatOpenAI
-from langchain.prompts import ChatPromptTemplate
-from langchain.schema.runnable import RunnablePassthrough
-from langchain_community.document_loaders import SeleniumURLLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain.schema import Document
-import chromadb
-from chromadb.config import Settings
-from chromadb.utils import embedding_functions
-from langchain_community.document_loaders.youtube import TranscriptFormat, YoutubeLoader
 import hashlib
 from datetime import datetime
 import sys
 sys.path.append('../../shared/src')
+from app.collection_manager import (
+    DEFAULT_COLLECTION_SWEEP_INTERVAL_SECONDS,
+    CollectionManager,
+    get_collection_manager,
+)
+from app.context_builder import build_context, context_token_budget, get_tokenizer, rank_chunks
+from app.executors import (
+    StageTimeoutError,
+    install_io_executor,
+    run_stage,
+    shutdown_executors,
+    split_documents,
+    warm_cpu_executor,
+)
+from app.guideline_index import DEFAULT_GUIDELINE_RESULTS, get_guideline_index, guideline_index_path
+from app.hybrid_retrieval import hybrid_query
+from app.ingestion import (
+    DEFAULT_INGEST_BATCH_SIZE,
+    StreamingIngest,
+    get_collection_version,
+    source_type,
+    tag_web_documents,
+)
+from app.jira_client import close_jira_clients
+from app.jira_sync import (
+    JIRA_SYNC_BATCH_SIZE,
+    iter_project_documents,
+    sync_project,
+)
+from app.jobs import JobCancelled, JobContext, JobQueue, create_job_store
+from app.metrics import (
+    REQUEST_DURATION,
+    STAGE_DURATION,
+    TRACE_HEADER,
+    component_stats,
+    observe_iteration,
+    observe_stage,
+    record_llm_usage,
+    render_metrics,
+    track_request,
+)
+from app.semantic_cache import get_semantic_cache
+from app.web_loader import (
+    close_web_loader,
+    iter_web_chunks,
+    load_web_chunks,
+)
+from app.youtube_loader import iter_youtube_sources, load_youtube_sources
+
+if TYPE_CHECKING:
+    from langchain.schema import Document
 
 load_dotenv()
 
@@ -33,89 +80,106 @@ CHROMA_PERSIST_DIRECTORY = "./croma"
 API_KEY_NAME = "X-API-Key"
 DEFAULT_CHUNK_SIZE = 1000
 DEFAULT_CHUNK_OVERLAP = 200
-DEFAULT_MAX_RESULTS = 50
 DEFAULT_YOUTUBE_CHUNK_SECONDS = 30
 DEFAULT_LLM_TEMPERATURE = 0.3
 DEFAULT_LLM_MAX_TOKENS = 1000
 DEFAULT_LLM_MODEL = "gpt-3.5-turbo"
-
-chroma_client = chromadb.PersistentClient(
-    path=CHROMA_DB_PATH,
-    settings=Settings(anonymized_telemetry=False, allow_reset=True)
-)
+DEFAULT_BATCH_MAX_PROMPTS = 50
+DEFAULT_BATCH_LLM_CONCURRENCY = 8
+DEFAULT_TICKET_PAGE_SIZE = 50
+MAX_TICKET_PAGE_SIZE = 500
+WARM_UP_RETRY_SECONDS = 1.0
+WARM_UP_RETRY_MAX_SECONDS = 30.0
+
+_chroma_client = None
+_chroma_client_guard = threading.Lock()
+_embeddings = None
+_embeddings_guard = threading.Lock()
+_llm = None
+_llm_guard = threading.Lock()
+readiness: Dict[str, Any] = {"ready": False, "error": None}
+warm_up_task: Dict[str, Optional[asyncio.Task]] = {"task": None}
+
+
+def get_chroma_client():
+    global _chroma_client
+    with _chroma_client_guard:
+        if _chroma_client is None:
+            import chromadb
+            from chromadb.config import Settings
+
+            _chroma_client = chromadb.PersistentClient(
+                path=CHROMA_DB_PATH,
+                settings=Settings(anonymized_telemetry=False, allow_reset=True)
+            )
+        return _chroma_client
 
 
-class SecureEmbeddingFunction:
-    def __init__(self, access_token: str):
-        self.access_token = access_token
-        self.base_embeddings = OpenAIEmbeddings()
+def get_embeddings():
+    global _embeddings
+    with _embeddings_guard:
+        if _embeddings is None:
+            from langchain_openai import OpenAIEmbeddings
 
-    def __call__(self, texts: List[str]) -> List[List[float]]:
-        secure_texts = [
-            f"{text} [AUTH:{hashlib.sha256(self.access_token.encode()).hexdigest()[:8]}]"
-            for text in texts
-        ]
-        return self.base_embeddings.embed_documents(secure_texts)
+            from app.embedding_cache import cached_embeddings
+            from app.embedding_dispatcher import dispatched_embeddings
 
+            _embeddings = cached_embeddings(dispatched_embeddings(OpenAIEmbeddings()))
+        return _embeddings
 
-def get_collection(access_token: str, project_key: str):
-    collection_name = (
-        f"project_{project_key}_{hashlib.sha256(access_token.encode()).hexdigest()[:8]}"
-    )
 
-    embedding_function = SecureEmbeddingFunction(access_token)
+def get_llm():
+    global _llm
+    with _llm_guard:
+        if _llm is None:
+            from langchain_openai import ChatOpenAI
 
-    try:
-        collection = chroma_client.get_collection(
-            name=collection_name, embedding_function=embedding_function
-        )
-    except:
-        collection = chroma_client.create_collection(
-            name=collection_name, embedding_function=embedding_function
+            _llm = ChatOpenAI(
+                model_name=DEFAULT_LLM_MODEL,
+                temperature=DEFAULT_LLM_TEMPERATURE,
+                max_tokens=DEFAULT_LLM_MAX_TOKENS,
+                stream_usage=True,
+            )
+        return _llm
+
+
+def warm_up() -> None:
+    get_chroma_client().heartbeat()
+    get_embeddings()
+    get_llm()
+    get_tokenizer(DEFAULT_LLM_MODEL)
+    if guideline_results() > 0 and get_guideline_index(get_embeddings().model) is None:
+        raise RuntimeError(
+            f"No usable guideline index at {guideline_index_path()}. Build one with "
+            "`python -m app.guideline_index`, or set GUIDELINE_RESULTS=0 to serve without guidelines"
         )
+    warm_cpu_executor()
 
-    return collection
 
+class SecureEmbeddingFunction:
+    def __init__(self, access_token: str):
+        self.access_token = access_token
+        self.base_embeddings = get_embeddings()
+        self.token_tag = f"[AUTH:{hashlib.sha256(access_token.encode()).hexdigest()[:8]}]"
 
-def fetch_project_context(
-    project_key: str, access_token: str, jira_base_url: str
-) -> List[Document]:
-    headers = {"Accept": "application/json",
-               "Authorization": f"Bearer {access_token}"}
+    def __call__(self, input: List[str]) -> List[List[float]]:
+        secure_texts = [f"{text} {self.token_tag}" for text in input]
+        return self.base_embeddings.embed_documents(secure_texts)
 
-    project_url = f"{jira_base_url}/rest/api/3/project/{project_key}"
-    project_response = requests.get(project_url, headers=headers)
-    project_data = project_response.json()
 
-    jql_query = f"project = {project_key} ORDER BY created DESC"
-    issues_url = f"{jira_base_url}/rest/api/3/search"
-    issues_response = requests.get(
-        issues_url, headers=headers, params={
-            "jql": jql_query, "maxResults": DEFAULT_MAX_RESULTS}
-    )
-    issues_data = issues_response.json()
+def collection_name_for(access_token: str, project_key: str) -> str:
+    return f"project_{project_key}_{hashlib.sha256(access_token.encode()).hexdigest()[:8]}"
 
-    documents = []
 
-    project_document = f"""
-    Project: {project_data['name']}
-    Key: {project_data['key']}
-    Description: {project_data.get('description', 'No description')}
-    Project Type: {project_data.get('projectTypeKey', 'Unknown')}
-    """
-    documents.append(Document(page_content=project_document))
+def collection_manager() -> CollectionManager:
+    return get_collection_manager(get_chroma_client, CHROMA_DB_PATH)
 
-    for issue in issues_data.get("issues", []):
-        issue_document = f"""
-        Issue: {issue['key']}
-        Summary: {issue['fields']['summary']}
-        Description: {issue['fields'].get('description', 'No description')}
-        Status: {issue['fields']['status']['name']}
-        Priority: {issue['fields']['priority']['name']}
-        """
-        documents.append(Document(page_content=issue_document))
 
-    return documents
+def get_collection(access_token: str, project_key: str):
+    return collection_manager().get(
+        collection_name_for(access_token, project_key),
+        lambda: SecureEmbeddingFunction(access_token),
+    )
 
 
 app = FastAPI(
@@ -147,66 +211,34 @@ app.add_middleware(
     ],
 )
 
-embeddings = OpenAIEmbeddings()
-llm = ChatOpenAI(
-    model_name=DEFAULT_LLM_MODEL,
-    temperature=DEFAULT_LLM_TEMPERATURE,
-    max_tokens=DEFAULT_LLM_MAX_TOKENS,
-)
-
-
-def load_and_process_documents(project_key: Optional[str] = None):
-    documents = []
+component_stats.register("embedding_cache", "app.embedding_cache", "_embedding_cache")
+component_stats.register("source_cache", "app.source_cache", "_source_cache")
+component_stats.register("semantic_cache", "app.semantic_cache", "_semantic_cache")
+component_stats.register("ticket_cache", "sprint_shared.aws.ticket_cache", "_ticket_cache")
+component_stats.register("ticket_writer", "sprint_shared.aws.ticket_writer", "_ticket_writer")
 
-    default_urls = [
-        "https://community.atlassian.com/forums/Jira-articles/How-to-write-a-useful-Jira-ticket/ba-p/2147004",
-    ]
 
-    try:
-        youtube_loader = YoutubeLoader.from_youtube_url(
-            "https://www.youtube.com/watch?v=iryX1Oa1cMQ",
-            add_video_info=True,
-            transcript_format=TranscriptFormat.CHUNKS,
-            chunk_size_seconds=DEFAULT_YOUTUBE_CHUNK_SECONDS,
-        )
-        documents.extend(youtube_loader.load())
-    except Exception as e:
-        print(f"Error loading YouTube transcript: {e}")
-
-    try:
-        selenium_loader = SeleniumURLLoader(urls=default_urls)
-        documents.extend(selenium_loader.load())
-    except Exception as e:
-        print(f"Error loading web content: {e}")
-
-    if project_key:
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    trace_id = request.headers.get(TRACE_HEADER) or uuid.uuid4().hex
+    started = time.perf_counter()
+    status_code = 500
+    with track_request(trace_id) as timings:
         try:
-            project_documents = fetch_project_context(project_key)
-            documents.extend(project_documents)
-        except Exception as e:
-            print(f"Error fetching project context: {e}")
+            response = await call_next(request)
+            status_code = response.status_code
+        finally:
+            elapsed = time.perf_counter() - started
+            route = getattr(request.scope.get("route"), "path", "unmatched")
+            REQUEST_DURATION.labels(request.method, route, str(status_code)).observe(elapsed)
 
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=DEFAULT_CHUNK_SIZE,
-        chunk_overlap=DEFAULT_CHUNK_OVERLAP,
-        length_function=len,
-    )
-    document_chunks = text_splitter.split_documents(documents)
-
-    vectorstore = Chroma.from_documents(
-        documents=document_chunks, embedding=embeddings, persist_directory=CHROMA_PERSIST_DIRECTORY
-    )
-    vectorstore.persist()
-
-    return vectorstore
+    response.headers[TRACE_HEADER] = trace_id
+    if timings:
+        stages = " ".join(f"{stage}={seconds * 1000:.1f}ms" for stage, seconds in timings.items())
+        print(f"[{trace_id}] {request.method} {route} {status_code} {elapsed * 1000:.1f}ms {stages}")
+    return response
 
 
-try:
-    vectorstore = Chroma(persist_directory=CHROMA_PERSIST_DIRECTORY,
-                         embedding_function=embeddings)
-except:
-    vectorstore = load_and_process_documents()
-
 api_key_header = APIKeyHeader(name=API_KEY_NAME, auto_error=True)
 
 
@@ -226,142 +258,64 @@ class TicketRequest(BaseModel):
     web_urls: Optional[List[str]] = None
 
 
+class SourceResult(BaseModel):
+    source: str
+    ok: bool
+    error: Optional[str] = None
+    chunk_count: int
+
+
 class TicketResponse(BaseModel):
     ticket_id: str
     title: str
     description: str
     priority: str
     labels: List[str]
+    sources: Optional[List[SourceResult]] = None
 
 
-class LoadDocumentsRequest(BaseModel):
-    youtube_urls: Optional[List[str]] = None
-    web_urls: Optional[List[str]] = None
+class BatchTicketRequest(BaseModel):
+    prompts: List[str]
     project_key: Optional[str] = None
     access_token: Optional[str] = None
     jira_base_url: Optional[str] = None
+    youtube_urls: Optional[List[str]] = None
+    web_urls: Optional[List[str]] = None
 
 
-@app.post("/generate-ticket", response_model=TicketResponse)
-async def generate_ticket(request: TicketRequest, api_key: str = Depends(get_api_key)):
-    try:
-        s3_service = S3Service()
+class BatchTicketResult(BaseModel):
+    prompt: str
+    ok: bool
+    ticket: Optional[TicketResponse] = None
+    error: Optional[str] = None
 
-        if request.project_key and request.access_token and request.jira_base_url:
-            collection = get_collection(
-                request.access_token, request.project_key)
 
-            project_documents = fetch_project_context(
-                request.project_key, request.access_token, request.jira_base_url
-            )
+class BatchTicketResponse(BaseModel):
+    results: List[BatchTicketResult]
+    sources: Optional[List[SourceResult]] = None
 
-            documents = []
-
-            documents.extend(project_documents)
-
-            if request.youtube_urls:
-                for url in request.youtube_urls:
-                    try:
-                        youtube_loader = YoutubeLoader.from_youtube_url(
-                            url,
-                            add_video_info=True,
-                            transcript_format=TranscriptFormat.CHUNKS,
-                            chunk_size_seconds=30,
-                        )
-                        documents.extend(youtube_loader.load())
-                        print(
-                            f"Successfully loaded YouTube transcript from: {url}")
-                    except Exception as e:
-                        print(
-                            f"Error loading YouTube transcript for {url}: {e}")
-
-            if request.web_urls:
-                try:
-                    selenium_loader = SeleniumURLLoader(urls=request.web_urls)
-                    web_documents = selenium_loader.load()
-                    documents.extend(web_documents)
-                    print(
-                        f"Successfully loaded {len(web_documents)} web documents")
-                except Exception as e:
-                    print(f"Error loading web content: {e}")
-
-            if not request.youtube_urls and not request.web_urls:
-                default_urls = [
-                    "https://community.atlassian.com/forums/Jira-articles/How-to-write-a-useful-Jira-ticket/ba-p/2147004",
-                ]
-                try:
-                    loader = SeleniumURLLoader(urls=default_urls)
-                    community_documents = loader.load()
-                    documents.extend(community_documents)
-                    print("Added default Jira community guidelines")
-                except Exception as e:
-                    print(f"Error loading default community guidelines: {e}")
-
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=DEFAULT_CHUNK_SIZE,
-                chunk_overlap=DEFAULT_CHUNK_OVERLAP,
-                length_function=len,
-            )
-            document_chunks = text_splitter.split_documents(documents)
-
-            collection.add(
-                documents=[
-                    document.page_content for document in document_chunks],
-                metadatas=[
-                    {
-                        "source": "jira" if "jira" in str(document.metadata) else "youtube" if "youtube" in str(document.metadata) else "web",
-                        "project": request.project_key
-                    } for document in document_chunks
-                ],
-                ids=[f"doc_{i}" for i in range(len(document_chunks))],
-            )
 
-            results = collection.query(
-                query_texts=[request.prompt], n_results=5)
+class LoadDocumentsRequest(BaseModel):
+    youtube_urls: Optional[List[str]] = None
+    web_urls: Optional[List[str]] = None
+    project_key: Optional[str] = None
+    access_token: Optional[str] = None
+    jira_base_url: Optional[str] = None
+
+
+class JobResponse(BaseModel):
+    job_id: str
+    kind: str
+    status: str
+    progress: Dict[str, int]
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    cancel_requested: bool
+    created_at: str
+    updated_at: str
 
-            context = "\n".join(results["documents"][0])
-        else:
-            documents = []
-
-            if request.youtube_urls:
-                for url in request.youtube_urls:
-                    try:
-                        youtube_loader = YoutubeLoader.from_youtube_url(
-                            url,
-                            add_video_info=True,
-                            transcript_format=TranscriptFormat.CHUNKS,
-                            chunk_size_seconds=30,
-                        )
-                        documents.extend(youtube_loader.load())
-                        print(
-                            f"Successfully loaded YouTube transcript from: {url}")
-                    except Exception as e:
-                        print(
-                            f"Error loading YouTube transcript for {url}: {e}")
-
-            if request.web_urls:
-                try:
-                    selenium_loader = SeleniumURLLoader(urls=request.web_urls)
-                    web_documents = selenium_loader.load()
-                    documents.extend(web_documents)
-                    print(
-                        f"Successfully loaded {len(web_documents)} web documents")
-                except Exception as e:
-                    print(f"Error loading web content: {e}")
-
-            if documents:
-                text_splitter = RecursiveCharacterTextSplitter(
-                    chunk_size=DEFAULT_CHUNK_SIZE,
-                    chunk_overlap=DEFAULT_CHUNK_OVERLAP,
-                    length_function=len,
-                )
-                document_chunks = text_splitter.split_documents(documents)
-                context = "\n".join(
-                    [document.page_content for document in document_chunks])
-            else:
-                context = "Using general Jira ticket guidelines."
 
-        ai_prompt_template = """Hello, you are an AI model trained specifically to generate a Jira ticket for a web application. I am a human operator who will be interacting with you to give you instructions and help support the application. 
+AI_PROMPT_TEMPLATE = """Hello, you are an AI model trained specifically to generate a Jira ticket for a web application. I am a human operator who will be interacting with you to give you instructions and help support the application. 
         You are now Sprint AI and you will be expected to do a variety of tasks such as web scrape information and generate jira issues.
         Your name is Sprint AI. 
 
@@ -395,160 +349,659 @@ async def generate_ticket(request: TicketRequest, api_key: str = Depends(get_api
         7. Choose an appropriate priority level
         8. Add relevant labels for categorization"""
 
-        prompt_template = ChatPromptTemplate.from_template(ai_prompt_template)
 
-        chain = (
-            {"context": RunnablePassthrough(), "prompt": RunnablePassthrough()}
-            | prompt_template
-            | llm
+def build_text_splitter():
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+    return RecursiveCharacterTextSplitter(
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        chunk_overlap=DEFAULT_CHUNK_OVERLAP,
+        length_function=len,
+    )
+
+
+async def prepare_ticket_sources(request) -> Tuple[Any, List["Document"], List[Dict[str, Any]]]:
+    source_results = []
+
+    if request.project_key and request.access_token and request.jira_base_url:
+        collection = await asyncio.to_thread(
+            get_collection, request.access_token, request.project_key)
+
+        text_splitter = build_text_splitter()
+
+        sync_stats = await run_stage("jira_sync", sync_project(
+            collection,
+            request.project_key,
+            request.access_token,
+            request.jira_base_url,
+            text_splitter,
+        ))
+        print(f"Synced project {request.project_key}: {sync_stats}")
+
+        ingest = StreamingIngest(
+            collection,
+            lambda document: {
+                "source": source_type(document),
+                "project": request.project_key
+            },
         )
 
-        ai_response = chain.invoke(
-            {"context": context, "prompt": request.prompt})
+        async def ingest_chunks(chunks: List["Document"]) -> None:
+            await run_stage("ingest", asyncio.to_thread(ingest.add, chunks))
+
+        if request.youtube_urls:
+            async for youtube_chunks, result in observe_iteration(
+                "youtube_load",
+                iter_youtube_sources(
+                    request.youtube_urls, text_splitter, DEFAULT_YOUTUBE_CHUNK_SECONDS),
+            ):
+                source_results.append(result)
+                await ingest_chunks(youtube_chunks)
+            source_results.sort(key=lambda result: request.youtube_urls.index(result["source"]))
+
+        if request.web_urls:
+            web_chunk_count = 0
+            async for web_chunks in observe_iteration(
+                "web_load", iter_web_chunks(request.web_urls, text_splitter)
+            ):
+                web_chunk_count += len(web_chunks)
+                await ingest_chunks(tag_web_documents(web_chunks))
+            print(f"Successfully loaded {web_chunk_count} web document chunks")
+
+        ingestion_stats = await run_stage("ingest", asyncio.to_thread(ingest.finish))
+        print(f"Ingested supplementary chunks: {ingestion_stats}")
+
+        return collection, [], source_results
+
+    text_splitter = build_text_splitter()
+    document_chunks = []
+
+    if request.youtube_urls:
+        with observe_stage("youtube_load"):
+            youtube_chunks, source_results = await load_youtube_sources(
+                request.youtube_urls, text_splitter, DEFAULT_YOUTUBE_CHUNK_SECONDS)
+        document_chunks.extend(youtube_chunks)
 
+    if request.web_urls:
         try:
-            parsed_ticket_data = json.loads(ai_response.content)
-        except json.JSONDecodeError:
-            import re
+            web_chunks = await run_stage(
+                "web_load", load_web_chunks(request.web_urls, text_splitter))
+            document_chunks.extend(web_chunks)
+            print(
+                f"Successfully loaded {len(web_chunks)} web document chunks")
+        except Exception as e:
+            print(f"Error loading web content: {e}")
+
+    return None, document_chunks, source_results
+
+
+def guideline_results() -> int:
+    return int(os.getenv("GUIDELINE_RESULTS", DEFAULT_GUIDELINE_RESULTS))
+
+
+def query_guidelines(prompts: List[str]) -> List[List[str]]:
+    n_results = guideline_results()
+    guideline_index = get_guideline_index(get_embeddings().model)
+    if guideline_index is None or n_results <= 0:
+        return [[] for _ in prompts]
+    return guideline_index.query(get_embeddings().embed_documents(prompts), n_results)
+
+
+def pack_ticket_contexts(
+    prompts: List[str],
+    candidates: List[List[str]],
+    guideline_results: List[List[str]],
+    rank: bool,
+) -> List[Tuple[str, int]]:
+    token_budget = context_token_budget()
+    contexts = []
+    for prompt, chunks, guideline_chunks in zip(prompts, candidates, guideline_results):
+        if rank:
+            chunks = [chunks[index] for index in rank_chunks(prompt, chunks)]
+        context, tokens_used = build_context(
+            prompt, chunks + guideline_chunks, token_budget, DEFAULT_LLM_MODEL, rank=False)
+        contexts.append((context or "Using general Jira ticket guidelines.", tokens_used))
+    return contexts
+
+
+async def retrieve_ticket_contexts(
+    collection, document_chunks: List["Document"], prompts: List[str]
+) -> List[Tuple[str, int]]:
+    guidelines = asyncio.to_thread(query_guidelines, prompts)
+    if collection is not None:
+        results, guideline_results = await run_stage("retrieval", asyncio.gather(
+            asyncio.to_thread(hybrid_query, collection, prompts, 5), guidelines))
+        return await asyncio.to_thread(
+            pack_ticket_contexts, prompts, results, guideline_results, False)
+
+    guideline_results = await run_stage("retrieval", guidelines)
+    chunks = [document.page_content for document in document_chunks]
+    with observe_stage("retrieval"):
+        return await asyncio.to_thread(
+            pack_ticket_contexts, prompts, [chunks] * len(prompts), guideline_results, True)
+
+
+async def build_ticket_context(request: TicketRequest) -> Tuple[str, int, List[Dict[str, Any]]]:
+    collection, document_chunks, source_results = await prepare_ticket_sources(request)
+    context, context_tokens = (
+        await retrieve_ticket_contexts(collection, document_chunks, [request.prompt]))[0]
+    return context, context_tokens, source_results
+
+
+def build_ticket_chain():
+    from langchain.prompts import ChatPromptTemplate
+    from langchain.schema.runnable import RunnablePassthrough
+
+    prompt_template = ChatPromptTemplate.from_template(AI_PROMPT_TEMPLATE)
+
+    return (
+        {"context": RunnablePassthrough(), "prompt": RunnablePassthrough()}
+        | prompt_template
+        | get_llm()
+    )
 
-            json_match = re.search(r"\{.*\}", ai_response.content, re.DOTALL)
-            if json_match:
-                parsed_ticket_data = json.loads(json_match.group())
-            else:
-                raise HTTPException(
-                    status_code=500, detail="Failed to parse ticket data from response"
-                )
-
-        ticket_id = hashlib.sha256(
-            f"{request.prompt}{request.project_key}".encode()).hexdigest()[:12]
-
-        final_ticket_data = {
-            "ticket_id": ticket_id,
-            "title": parsed_ticket_data.get("title", "Untitled"),
-            "description": parsed_ticket_data.get("description", "No description provided"),
-            "priority": parsed_ticket_data.get("priority", "Medium"),
-            "labels": parsed_ticket_data.get("labels", []),
-            "project_key": request.project_key,
-            "created_at": datetime.utcnow().isoformat()
-        }
-
-        if not s3_service.store_ticket(ticket_id, final_ticket_data, service_type='jira'):
-            print(f"Failed to store ticket {ticket_id} in S3")
+
+def parse_ticket_response(content: str, request: TicketRequest) -> Dict[str, Any]:
+    try:
+        parsed_ticket_data = json.loads(content)
+    except json.JSONDecodeError:
+        import re
+
+        json_match = re.search(r"\{.*\}", content, re.DOTALL)
+        if json_match:
+            parsed_ticket_data = json.loads(json_match.group())
+        else:
             raise HTTPException(
-                status_code=500, detail="Failed to store ticket in S3")
+                status_code=500, detail="Failed to parse ticket data from response"
+            )
+
+    ticket_id = hashlib.sha256(
+        f"{request.prompt}{request.project_key}".encode()).hexdigest()[:12]
 
-        stored_ticket = s3_service.get_ticket(ticket_id, service_type='jira')
-        if not stored_ticket:
-            print(f"Failed to verify ticket {ticket_id} in S3")
+    return {
+        "ticket_id": ticket_id,
+        "title": parsed_ticket_data.get("title", "Untitled"),
+        "description": parsed_ticket_data.get("description", "No description provided"),
+        "priority": parsed_ticket_data.get("priority", "Medium"),
+        "labels": parsed_ticket_data.get("labels", []),
+        "project_key": request.project_key,
+        "created_at": datetime.utcnow().isoformat()
+    }
+
+
+async def write_ticket_now(final_ticket_data: Dict[str, Any]) -> Future:
+    future: Future = Future()
+    try:
+        future.set_result(await asyncio.to_thread(
+            get_ticket_writer().write_now,
+            final_ticket_data["ticket_id"],
+            final_ticket_data,
+            'jira',
+        ))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+async def persist_ticket(final_ticket_data: Dict[str, Any]) -> Future:
+    started = time.perf_counter()
+    writer = get_ticket_writer()
+    future = None
+    if writer.healthy():
+        try:
+            future = await asyncio.to_thread(
+                writer.submit,
+                final_ticket_data["ticket_id"],
+                final_ticket_data,
+                'jira',
+            )
+        except queue.Full:
+            pass
+    if future is None:
+        future = await write_ticket_now(final_ticket_data)
+        if future.exception() is not None:
             raise HTTPException(
-                status_code=500, detail="Failed to verify ticket storage in S3")
-        print(f"Verified ticket {ticket_id} stored in S3")
+                status_code=503, detail=f"Could not store ticket: {future.exception()}")
+
+    future.add_done_callback(lambda _: STAGE_DURATION.labels(
+        "s3_write").observe(time.perf_counter() - started))
+    return future
+
+
+async def write_ticket(final_ticket_data: Dict[str, Any]) -> None:
+    await asyncio.wrap_future(await persist_ticket(final_ticket_data))
+
+
+def ticket_cache_scope(request: TicketRequest) -> Tuple[str, str]:
+    if request.project_key and request.access_token and request.jira_base_url:
+        collection_name = collection_name_for(request.access_token, request.project_key)
+        return collection_name, str(get_collection_version(collection_name))
+
+    sources = sorted((request.youtube_urls or []) + (request.web_urls or []))
+    return f"sources_{hashlib.sha256(json.dumps(sources).encode()).hexdigest()[:16]}", "0"
+
+
+async def lookup_cached_ticket(
+    request: TicketRequest,
+) -> Tuple[Tuple[str, str, List[float]], Optional[Dict[str, Any]]]:
+    cache_namespace, cache_version = ticket_cache_scope(request)
+    prompt_embedding = await run_stage("semantic_cache", asyncio.to_thread(
+        get_embeddings().embed_query, request.prompt))
+    cache_key = (cache_namespace, cache_version, prompt_embedding)
+    return cache_key, get_semantic_cache().lookup(*cache_key)
 
-        print(f"Successfully stored ticket {ticket_id} in S3")
-        return TicketResponse(**final_ticket_data)
 
+def format_sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/generate-ticket", response_model=TicketResponse)
+async def generate_ticket(
+    request: TicketRequest, response: Response, api_key: str = Depends(get_api_key)
+):
+    try:
+        context, context_tokens, source_results = await build_ticket_context(request)
+        response.headers["X-Context-Tokens"] = str(context_tokens)
+
+        cache_key, cached_ticket = await lookup_cached_ticket(request)
+        if cached_ticket:
+            response.headers["X-Cache"] = "HIT"
+            return TicketResponse(**cached_ticket, sources=source_results)
+        response.headers["X-Cache"] = "MISS"
+
+        chain = build_ticket_chain()
+
+        ai_response = await run_stage("llm", chain.ainvoke(
+            {"context": context, "prompt": request.prompt}))
+        record_llm_usage(ai_response)
+
+        final_ticket_data = parse_ticket_response(ai_response.content, request)
+
+        await persist_ticket(final_ticket_data)
+        get_semantic_cache().store(*cache_key, final_ticket_data)
+        return TicketResponse(**final_ticket_data, sources=source_results)
+
+    except HTTPException:
+        raise
+    except StageTimeoutError as e:
+        print(f"Error in generate_ticket: {str(e)}")
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         print(f"Error in generate_ticket: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/load-documents")
-async def load_documents(
-    request: LoadDocumentsRequest, api_key: str = Depends(get_api_key)
+@app.post("/generate-ticket/stream")
+async def generate_ticket_stream(request: TicketRequest, api_key: str = Depends(get_api_key)):
+    generated: Dict[str, Any] = {}
+
+    async def events():
+        try:
+            context, context_tokens, source_results = await build_ticket_context(request)
+            yield format_sse("stage", {
+                "stage": "context_retrieved",
+                "sources": source_results,
+                "context_tokens": context_tokens,
+            })
+
+            cache_key, cached_ticket = await lookup_cached_ticket(request)
+            if cached_ticket:
+                yield format_sse("stage", {"stage": "cache_hit"})
+                ticket = TicketResponse(**cached_ticket, sources=source_results)
+                yield format_sse("ticket", ticket.dict())
+                return
+
+            yield format_sse("stage", {"stage": "generation_started"})
+            content = []
+            with observe_stage("llm"):
+                async for chunk in build_ticket_chain().astream(
+                    {"context": context, "prompt": request.prompt}
+                ):
+                    record_llm_usage(chunk)
+                    if chunk.content:
+                        content.append(chunk.content)
+                        yield format_sse("token", {"token": chunk.content})
+
+            final_ticket_data = parse_ticket_response("".join(content), request)
+            ticket = TicketResponse(**final_ticket_data, sources=source_results)
+            generated["ticket"] = final_ticket_data
+            generated["cache_key"] = cache_key
+            yield format_sse("ticket", ticket.dict())
+        except HTTPException as e:
+            yield format_sse("error", {"detail": e.detail})
+        except Exception as e:
+            print(f"Error in generate_ticket_stream: {str(e)}")
+            yield format_sse("error", {"detail": str(e)})
+
+    async def persist_generated_ticket():
+        if "ticket" in generated:
+            try:
+                await persist_ticket(generated["ticket"])
+                get_semantic_cache().store(*generated["cache_key"], generated["ticket"])
+            except Exception as e:
+                print(f"Error persisting streamed ticket: {str(e)}")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(persist_generated_ticket),
+    )
+
+
+def error_detail(error: BaseException) -> str:
+    if isinstance(error, HTTPException):
+        return str(error.detail)
+    return str(error) or type(error).__name__
+
+
+@app.post("/generate-tickets/batch", response_model=BatchTicketResponse)
+async def generate_tickets_batch(
+    request: BatchTicketRequest, api_key: str = Depends(get_api_key)
 ):
+    if not request.prompts:
+        raise HTTPException(status_code=400, detail="No prompts were provided")
+    if len(request.prompts) > DEFAULT_BATCH_MAX_PROMPTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {DEFAULT_BATCH_MAX_PROMPTS} prompts can be generated per batch",
+        )
+
     try:
-        documents = []
+        collection, document_chunks, source_results = await prepare_ticket_sources(request)
+        contexts = await retrieve_ticket_contexts(collection, document_chunks, request.prompts)
 
-        if request.youtube_urls:
-            for url in request.youtube_urls:
-                try:
-                    youtube_loader = YoutubeLoader.from_youtube_url(
-                        url,
-                        add_video_info=True,
-                        transcript_format=TranscriptFormat.CHUNKS,
-                        chunk_size_seconds=DEFAULT_YOUTUBE_CHUNK_SECONDS,
-                    )
-                    documents.extend(youtube_loader.load())
-                except Exception as e:
-                    print(f"Error loading YouTube transcript for {url}: {e}")
+        item_requests = [
+            TicketRequest(prompt=prompt, **request.dict(exclude={"prompts"}))
+            for prompt in request.prompts
+        ]
+        results: List[Dict[str, Any]] = [
+            {"prompt": prompt, "ok": False, "ticket": None, "error": None}
+            for prompt in request.prompts
+        ]
 
-        if request.web_urls:
+        semantic_cache = get_semantic_cache()
+        cache_namespace, cache_version = ticket_cache_scope(item_requests[0])
+        prompt_embeddings = await run_stage("semantic_cache", asyncio.to_thread(
+            get_embeddings().embed_documents, request.prompts))
+
+        pending = []
+        for index, prompt_embedding in enumerate(prompt_embeddings):
+            cached_ticket = semantic_cache.lookup(
+                cache_namespace, cache_version, prompt_embedding)
+            if cached_ticket:
+                results[index].update(ok=True, ticket=cached_ticket)
+            else:
+                pending.append(index)
+
+        chain = build_ticket_chain()
+        llm_slots = asyncio.Semaphore(DEFAULT_BATCH_LLM_CONCURRENCY)
+
+        async def generate(index: int):
+            async with llm_slots:
+                return await run_stage("llm", chain.ainvoke(
+                    {"context": contexts[index][0], "prompt": request.prompts[index]}))
+
+        ai_responses = await asyncio.gather(
+            *(generate(index) for index in pending), return_exceptions=True)
+
+        generated = []
+        for index, ai_response in zip(pending, ai_responses):
             try:
-                selenium_loader = SeleniumURLLoader(urls=request.web_urls)
-                documents.extend(selenium_loader.load())
+                if isinstance(ai_response, BaseException):
+                    raise ai_response
+                record_llm_usage(ai_response)
+                generated.append((index, parse_ticket_response(
+                    ai_response.content, item_requests[index])))
             except Exception as e:
-                print(f"Error loading web content: {e}")
+                print(f"Error generating batch ticket {index}: {error_detail(e)}")
+                results[index]["error"] = error_detail(e)
+
+        persisted = await asyncio.gather(
+            *(write_ticket(ticket) for _, ticket in generated),
+            return_exceptions=True,
+        )
+        for (index, ticket), error in zip(generated, persisted):
+            if isinstance(error, BaseException):
+                results[index]["error"] = error_detail(error)
+                continue
+            semantic_cache.store(
+                cache_namespace, cache_version, prompt_embeddings[index], ticket)
+            results[index].update(ok=True, ticket=ticket)
+
+        return BatchTicketResponse(
+            results=[BatchTicketResult(**result) for result in results],
+            sources=source_results,
+        )
+
+    except StageTimeoutError as e:
+        print(f"Error in generate_tickets_batch: {str(e)}")
+        raise HTTPException(status_code=504, detail=str(e))
+    except Exception as e:
+        print(f"Error in generate_tickets_batch: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def run_load_documents_job(job: JobContext, payload: Dict[str, Any]) -> Dict[str, Any]:
+    request = LoadDocumentsRequest(**payload)
+    text_splitter = build_text_splitter()
+    source_results = []
+
+    if request.access_token and request.project_key:
+        collection = await asyncio.to_thread(
+            get_collection, request.access_token, request.project_key)
+        ingest = StreamingIngest(
+            collection,
+            lambda document: {
+                "source": "custom",
+                "project": request.project_key,
+                "type": source_type(document),
+            },
+            collection_manager().embedding_function(collection.name),
+            job.record_progress,
+            check_cancelled=job.check_cancelled,
+        )
+        add_chunks = ingest.add
+    else:
+        from langchain_chroma import Chroma
+
+        ingest = None
+        vectorstore = Chroma(persist_directory=CHROMA_PERSIST_DIRECTORY,
+                             embedding_function=get_embeddings())
+
+        def add_chunks(chunks: List["Document"]) -> int:
+            for start in range(0, len(chunks), DEFAULT_INGEST_BATCH_SIZE):
+                batch = chunks[start:start + DEFAULT_INGEST_BATCH_SIZE]
+                job.check_cancelled()
+                vectorstore.add_documents(batch)
+                job.record_progress("embedded", len(batch))
+                job.record_progress("written", len(batch))
+            return len(chunks)
+
+    chunks_loaded = 0
+
+    async def ingest_chunks(chunks: List["Document"]) -> None:
+        nonlocal chunks_loaded
+        job.add_progress("split", len(chunks))
+        chunks_loaded += await asyncio.to_thread(add_chunks, chunks)
+
+    try:
+        if request.youtube_urls:
+            async for youtube_chunks, result in iter_youtube_sources(
+                request.youtube_urls, text_splitter, DEFAULT_YOUTUBE_CHUNK_SECONDS
+            ):
+                source_results.append(result)
+                job.add_progress("fetched", int(result["ok"]))
+                await ingest_chunks(youtube_chunks)
+            source_results.sort(key=lambda result: request.youtube_urls.index(result["source"]))
+
+        if request.web_urls:
+            async for web_chunks in iter_web_chunks(request.web_urls, text_splitter):
+                job.add_progress("fetched", 1)
+                await ingest_chunks(tag_web_documents(web_chunks))
 
         if request.project_key and request.access_token and request.jira_base_url:
             try:
-                project_documents = fetch_project_context(
+                project_documents = []
+                async for document in iter_project_documents(
                     request.project_key, request.access_token, request.jira_base_url
-                )
-                documents.extend(project_documents)
+                ):
+                    project_documents.append(document)
+                    if len(project_documents) >= JIRA_SYNC_BATCH_SIZE:
+                        job.add_progress("fetched", len(project_documents))
+                        await ingest_chunks(await split_documents(text_splitter, project_documents))
+                        project_documents = []
+                if project_documents:
+                    job.add_progress("fetched", len(project_documents))
+                    await ingest_chunks(await split_documents(text_splitter, project_documents))
+            except JobCancelled:
+                raise
             except Exception as e:
                 print(f"Error fetching project context: {e}")
 
-        if not documents:
-            raise HTTPException(
-                status_code=400, detail="No documents were successfully loaded"
-            )
+        if not chunks_loaded:
+            raise ValueError("No documents were successfully loaded")
 
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=DEFAULT_CHUNK_SIZE,
-            chunk_overlap=DEFAULT_CHUNK_OVERLAP,
-            length_function=len,
-        )
-        document_chunks = text_splitter.split_documents(documents)
+        if ingest is not None:
+            ingestion_stats = await asyncio.to_thread(ingest.finish)
+        else:
+            ingestion_stats = {"added": chunks_loaded}
+    except BaseException:
+        if ingest is not None:
+            rolled_back = await asyncio.shield(asyncio.to_thread(ingest.abort))
+            print(f"Rolled back {rolled_back} chunks written by job {job.job_id}")
+        raise
 
-        collection = (
-            get_collection(request.access_token, request.project_key)
-            if request.access_token and request.project_key
-            else None
-        )
+    return {
+        "message": f"Successfully loaded {chunks_loaded} document chunks",
+        "chunks_loaded": chunks_loaded,
+        "sources": source_results,
+        **ingestion_stats,
+    }
 
-        if collection:
-            collection.add(
-                documents=[
-                    document.page_content for document in document_chunks],
-                metadatas=[
-                    {
-                        "source": "custom",
-                        "project": request.project_key,
-                        "type": "youtube" if "youtube" in str(document.metadata) else "web",
-                    }
-                    for document in document_chunks
-                ],
-                ids=[
-                    f"doc_{hashlib.sha256(document.page_content.encode()).hexdigest()[:8]}"
-                    for document in document_chunks
-                ],
-            )
-        else:
-            vectorstore = Chroma.from_documents(
-                documents=document_chunks, embedding=embeddings, persist_directory=CHROMA_PERSIST_DIRECTORY
-            )
-            vectorstore.persist()
 
-        return {
-            "status": "success",
-            "message": f"Successfully loaded {len(document_chunks)} document chunks",
-            "chunks_loaded": len(document_chunks),
-        }
+_job_queue: Optional[JobQueue] = None
+_job_queue_guard = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    global _job_queue
+    with _job_queue_guard:
+        if _job_queue is None:
+            _job_queue = JobQueue(create_job_store())
+            _job_queue.register("load_documents", run_load_documents_job)
+        return _job_queue
+
 
+@app.post("/load-documents", status_code=202, response_model=JobResponse)
+async def load_documents(
+    request: LoadDocumentsRequest, api_key: str = Depends(get_api_key)
+):
+    has_project = request.project_key and request.access_token and request.jira_base_url
+    if not request.youtube_urls and not request.web_urls and not has_project:
+        raise HTTPException(
+            status_code=400, detail="No document sources were provided"
+        )
+
+    try:
+        job = await get_job_queue().submit("load_documents", request.dict())
+        return JobResponse(**job)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str, api_key: str = Depends(get_api_key)):
+    job = get_job_queue().get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobResponse(**job)
+
+
+@app.post("/jobs/{job_id}/cancel", response_model=JobResponse)
+async def cancel_job(job_id: str, api_key: str = Depends(get_api_key)):
+    job = get_job_queue().cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobResponse(**job)
+
+
+async def warm_up_components() -> None:
+    attempt = 0
+    while True:
+        try:
+            await asyncio.to_thread(warm_up)
+            readiness.update(ready=True, error=None)
+            return
+        except Exception as e:
+            delay = min(WARM_UP_RETRY_MAX_SECONDS, WARM_UP_RETRY_SECONDS * 2 ** attempt)
+            print(f"Error warming up components, retrying in {delay:g}s: {e}")
+            readiness.update(error=str(e))
+            attempt += 1
+            await asyncio.sleep(delay)
+
+
+@app.on_event("startup")
+async def startup():
+    install_io_executor()
+    await get_job_queue().start()
+    await collection_manager().start(float(os.getenv(
+        "COLLECTION_SWEEP_INTERVAL_SECONDS", DEFAULT_COLLECTION_SWEEP_INTERVAL_SECONDS)))
+    warm_up_task["task"] = asyncio.create_task(warm_up_components())
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    if warm_up_task.get("task") is not None:
+        warm_up_task["task"].cancel()
+    await get_job_queue().stop()
+    await collection_manager().stop()
+    await close_jira_clients()
+    await close_web_loader()
+    await asyncio.to_thread(close_ticket_writer)
+    shutdown_executors()
+
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics")
+async def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+@app.get("/ready")
+async def readiness_check():
+    if not readiness["ready"]:
+        raise HTTPException(
+            status_code=503,
+            detail=readiness["error"] or "Components are still initializing",
+        )
+    return {"status": "ready"}
+
+
+@app.get("/admin/collections")
+async def list_collections(api_key: str = Depends(get_api_key)):
+    manager = collection_manager()
+    collections = await asyncio.to_thread(manager.describe)
+    return {
+        "collections": collections,
+        "disk_bytes": sum(collection["disk_bytes"] for collection in collections),
+        "disk_budget_bytes": manager.disk_budget_bytes,
+    }
+
+
 @app.get("/tickets/{ticket_id}", response_model=TicketResponse)
 async def get_ticket(ticket_id: str, api_key: str = Depends(get_api_key)):
     try:
-        s3_service = S3Service()
-        ticket_data = s3_service.get_ticket(ticket_id, service_type='jira')
+        ticket_data = get_ticket_writer().get_pending(ticket_id, 'jira')
+        if ticket_data is None:
+            with observe_stage("s3_read"):
+                ticket_data = await asyncio.to_thread(
+                    get_s3_service().get_ticket, ticket_id, service_type='jira')
 
         if not ticket_data:
             raise HTTPException(status_code=404, detail="Ticket not found")
@@ -558,12 +1011,42 @@ async def get_ticket(ticket_id: str, api_key: str = Depends(get_api_key)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/tickets/{ticket_id}/write-status")
+async def get_ticket_write_status(ticket_id: str, api_key: str = Depends(get_api_key)):
+    status = get_ticket_writer().status(ticket_id, 'jira')
+    if status is None:
+        raise HTTPException(status_code=404, detail="No recent write for this ticket")
+    return dict(status, ticket_id=ticket_id)
+
+
 @app.get("/tickets", response_model=List[TicketResponse])
-async def list_tickets(api_key: str = Depends(get_api_key)):
+async def list_tickets(
+    response: Response,
+    project_key: Optional[str] = None,
+    priority: Optional[str] = None,
+    created_after: Optional[str] = None,
+    created_before: Optional[str] = None,
+    limit: int = Query(DEFAULT_TICKET_PAGE_SIZE, ge=1, le=MAX_TICKET_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    api_key: str = Depends(get_api_key),
+):
     try:
-        s3_service = S3Service()
-        tickets = s3_service.list_tickets(service_type='jira')
-        return [TicketResponse(**ticket) for ticket in tickets]
+        with observe_stage("s3_list"):
+            page = await asyncio.to_thread(
+                get_s3_service().list_tickets_page,
+                service_type='jira',
+                project_key=project_key,
+                priority=priority,
+                created_after=created_after,
+                created_before=created_before,
+                limit=limit,
+                cursor=cursor,
+            )
+        if page["next_cursor"]:
+            response.headers["X-Next-Cursor"] = page["next_cursor"]
+        return [TicketResponse(**ticket) for ticket in page["tickets"]]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -571,8 +1054,10 @@ async def list_tickets(api_key: str = Depends(get_api_key)):
 @app.delete("/tickets/{ticket_id}")
 async def delete_ticket(ticket_id: str, api_key: str = Depends(get_api_key)):
     try:
-        s3_service = S3Service()
-        if not s3_service.delete_ticket(ticket_id, service_type='jira'):
+        get_ticket_writer().discard(ticket_id, 'jira')
+        if not await asyncio.to_thread(
+            get_s3_service().delete_ticket, ticket_id, service_type='jira'
+        ):
             raise HTTPException(status_code=404, detail="Ticket not found")
         return {"message": "Ticket deleted successfully"}
     except Exception as e:
@@ -0,0 +1,134 @@
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Tuple, TypeVar
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+TRACE_HEADER = "X-Request-ID"
+COMPONENT_COUNTER_KEYS = {
+    "hits",
+    "disk_hits",
+    "misses",
+    "revalidations",
+    "evictions",
+    "invalidations",
+    "written",
+    "retries",
+    "failed",
+    "synchronous",
+    "index_failures",
+}
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+STAGE_DURATION = Histogram(
+    "rag_stage_duration_seconds",
+    "Time spent in each ticket pipeline stage",
+    ["stage"],
+    buckets=DURATION_BUCKETS,
+)
+REQUEST_DURATION = Histogram(
+    "rag_request_duration_seconds",
+    "Time until the response starts, per route",
+    ["method", "route", "status"],
+    buckets=DURATION_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = Gauge("rag_requests_in_flight", "Requests currently being handled")
+EMBEDDING_TOKENS = Counter("rag_embedding_tokens_total", "Tokens sent to the embeddings API")
+LLM_TOKENS = Counter("rag_llm_tokens_total", "Tokens used by the LLM", ["kind"])
+CONTEXT_TOKENS = Histogram(
+    "rag_context_tokens",
+    "Tokens of retrieved context packed into each ticket prompt",
+    buckets=(100, 250, 500, 1000, 2000, 3000, 4000, 8000, 16000),
+)
+
+T = TypeVar("T")
+
+_trace_id: ContextVar[Optional[str]] = ContextVar("trace_id", default=None)
+_stage_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("stage_timings", default=None)
+
+
+def current_trace_id() -> Optional[str]:
+    return _trace_id.get()
+
+
+@contextmanager
+def observe_stage(stage: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_DURATION.labels(stage).observe(elapsed)
+        timings = _stage_timings.get()
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + elapsed
+
+
+async def observe_iteration(stage: str, iterator: AsyncIterator[T]) -> AsyncIterator[T]:
+    while True:
+        with observe_stage(stage):
+            try:
+                item = await iterator.__anext__()
+            except StopAsyncIteration:
+                return
+        yield item
+
+
+@contextmanager
+def track_request(trace_id: str) -> Iterator[Dict[str, float]]:
+    timings: Dict[str, float] = {}
+    trace_token = _trace_id.set(trace_id)
+    timings_token = _stage_timings.set(timings)
+    REQUESTS_IN_FLIGHT.inc()
+    try:
+        yield timings
+    finally:
+        REQUESTS_IN_FLIGHT.dec()
+        _stage_timings.reset(timings_token)
+        _trace_id.reset(trace_token)
+
+
+def record_llm_usage(message: Any) -> None:
+    usage = getattr(message, "usage_metadata", None)
+    if usage:
+        LLM_TOKENS.labels("prompt").inc(usage.get("input_tokens", 0))
+        LLM_TOKENS.labels("completion").inc(usage.get("output_tokens", 0))
+
+
+class ComponentStatsCollector:
+    def __init__(self):
+        self._sources: Dict[str, Tuple[str, str]] = {}
+
+    def register(self, name: str, module: str, attribute: str) -> None:
+        self._sources[name] = (module, attribute)
+
+    def collect(self):
+        for name, (module, attribute) in list(self._sources.items()):
+            # Read the singleton slot instead of calling its getter, so a scrape
+            # never builds a component the service has not used yet.
+            component = getattr(sys.modules.get(module), attribute, None)
+            if component is None:
+                continue
+            try:
+                values = component.stats()
+            except Exception as e:
+                print(f"Error collecting {name} stats: {e}")
+                continue
+            for key, value in values.items():
+                if not isinstance(value, (int, float)):
+                    continue
+                if key in COMPONENT_COUNTER_KEYS:
+                    yield CounterMetricFamily(f"rag_{name}_{key}", f"{name} {key}", value=value)
+                else:
+                    yield GaugeMetricFamily(f"rag_{name}_{key}", f"{name} {key}", value=value)
+
+
+component_stats = ComponentStatsCollector()
+REGISTRY.register(component_stats)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,115 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_SEMANTIC_CACHE_THRESHOLD = 0.95
+DEFAULT_SEMANTIC_CACHE_TTL_SECONDS = 60 * 60
+DEFAULT_SEMANTIC_CACHE_MAX_ENTRIES = 1000
+
+
+class SemanticCache:
+    def __init__(
+        self,
+        threshold: float = DEFAULT_SEMANTIC_CACHE_THRESHOLD,
+        ttl_seconds: float = DEFAULT_SEMANTIC_CACHE_TTL_SECONDS,
+        max_entries: int = DEFAULT_SEMANTIC_CACHE_MAX_ENTRIES,
+    ):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[Tuple[str, int], Dict[str, Any]]" = OrderedDict()
+        self._versions: Dict[str, str] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def _invalidate_stale(self, namespace: str, version: str) -> None:
+        if self._versions.get(namespace, version) != version:
+            stale_keys = [key for key in self._entries if key[0] == namespace]
+            for key in stale_keys:
+                del self._entries[key]
+            self.invalidations += len(stale_keys)
+        self._versions[namespace] = version
+
+    def lookup(
+        self, namespace: str, version: str, embedding: List[float]
+    ) -> Optional[Dict[str, Any]]:
+        query = np.asarray(embedding, dtype=np.float32)
+        query /= np.linalg.norm(query) or 1.0
+        now = time.time()
+
+        with self._lock:
+            self._invalidate_stale(namespace, version)
+
+            keys = []
+            vectors = []
+            for key, entry in list(self._entries.items()):
+                if now - entry["created_at"] >= self.ttl_seconds:
+                    del self._entries[key]
+                elif key[0] == namespace:
+                    keys.append(key)
+                    vectors.append(entry["embedding"])
+
+            if keys:
+                similarities = np.stack(vectors) @ query
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.threshold:
+                    self._entries.move_to_end(keys[best])
+                    self.hits += 1
+                    return dict(self._entries[keys[best]]["value"])
+
+            self.misses += 1
+            return None
+
+    def store(
+        self, namespace: str, version: str, embedding: List[float], value: Dict[str, Any]
+    ) -> None:
+        vector = np.asarray(embedding, dtype=np.float32)
+        vector /= np.linalg.norm(vector) or 1.0
+
+        with self._lock:
+            self._invalidate_stale(namespace, version)
+            self._entries[(namespace, self._next_id)] = {
+                "embedding": vector,
+                "value": dict(value),
+                "created_at": time.time(),
+            }
+            self._next_id += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+_semantic_cache: Optional[SemanticCache] = None
+_semantic_cache_guard = threading.Lock()
+
+
+def get_semantic_cache() -> SemanticCache:
+    global _semantic_cache
+    with _semantic_cache_guard:
+        if _semantic_cache is None:
+            _semantic_cache = SemanticCache(
+                threshold=float(os.getenv(
+                    "SEMANTIC_CACHE_THRESHOLD", DEFAULT_SEMANTIC_CACHE_THRESHOLD)),
+                ttl_seconds=float(os.getenv(
+                    "SEMANTIC_CACHE_TTL_SECONDS", DEFAULT_SEMANTIC_CACHE_TTL_SECONDS)),
+                max_entries=int(os.getenv(
+                    "SEMANTIC_CACHE_MAX_ENTRIES", DEFAULT_SEMANTIC_CACHE_MAX_ENTRIES)),
+            )
+        return _semantic_cache
@@ -0,0 +1,205 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.executors import split_documents
+from app.metrics import observe_stage
+
+if TYPE_CHECKING:
+    from langchain.schema import Document
+
+SOURCE_CACHE_PATH = "./chroma_db/source_cache.sqlite3"
+DEFAULT_SOURCE_CACHE_TTL_SECONDS = 6 * 60 * 60
+DEFAULT_SOURCE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+SourceLoadResult = Optional[Tuple[List["Document"], Optional[str], Optional[str]]]
+SourceLoader = Callable[[Optional[Dict[str, Any]]], Awaitable[SourceLoadResult]]
+
+
+def splitter_signature(text_splitter) -> str:
+    return f"{type(text_splitter).__name__}:{text_splitter._chunk_size}:{text_splitter._chunk_overlap}"
+
+
+def _dump_documents(documents: List["Document"]) -> str:
+    return json.dumps([
+        {"page_content": document.page_content, "metadata": document.metadata}
+        for document in documents
+    ])
+
+
+def _load_documents(data: str) -> List["Document"]:
+    from langchain.schema import Document
+
+    return [Document(**document) for document in json.loads(data)]
+
+
+class SourceCache:
+    def __init__(
+        self,
+        path: str = SOURCE_CACHE_PATH,
+        ttl_seconds: float = DEFAULT_SOURCE_CACHE_TTL_SECONDS,
+        max_bytes: int = DEFAULT_SOURCE_CACHE_MAX_BYTES,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS sources ("
+            "key TEXT PRIMARY KEY, documents TEXT NOT NULL, chunks TEXT NOT NULL, "
+            "splitter TEXT NOT NULL, etag TEXT, last_modified TEXT, "
+            "fetched_at REAL NOT NULL, last_access REAL NOT NULL, size INTEGER NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS sources_last_access ON sources (last_access)"
+        )
+        self._connection.commit()
+        self._total_bytes = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM sources").fetchone()[0]
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT documents, chunks, splitter, etag, last_modified, fetched_at "
+                "FROM sources WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            self._connection.execute(
+                "UPDATE sources SET last_access = ? WHERE key = ?", (now, key))
+            self._connection.commit()
+
+        documents, chunks, splitter, etag, last_modified, fetched_at = row
+        return {
+            "documents": _load_documents(documents),
+            "chunks": _load_documents(chunks),
+            "splitter": splitter,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fresh": now - fetched_at < self.ttl_seconds,
+        }
+
+    def put(
+        self,
+        key: str,
+        documents: List["Document"],
+        chunks: List["Document"],
+        splitter: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        documents_data = _dump_documents(documents)
+        chunks_data = _dump_documents(chunks)
+        size = len(documents_data) + len(chunks_data)
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            previous = self._connection.execute(
+                "SELECT size FROM sources WHERE key = ?", (key,)).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO sources (key, documents, chunks, splitter, etag, "
+                "last_modified, fetched_at, last_access, size) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, documents_data, chunks_data, splitter, etag, last_modified, now, now, size),
+            )
+            self._total_bytes += size - (previous[0] if previous else 0)
+
+            while self._total_bytes > self.max_bytes:
+                oldest = self._connection.execute(
+                    "SELECT key, size FROM sources WHERE key != ? "
+                    "ORDER BY last_access ASC LIMIT 1",
+                    (key,),
+                ).fetchone()
+                if oldest is None:
+                    break
+                self._connection.execute("DELETE FROM sources WHERE key = ?", (oldest[0],))
+                self._total_bytes -= oldest[1]
+                self.evictions += 1
+
+            self._connection.commit()
+
+    def touch(self, key: str) -> None:
+        with self._lock:
+            self._connection.execute(
+                "UPDATE sources SET fetched_at = ? WHERE key = ?", (time.time(), key))
+            self._connection.commit()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.revalidations + self.misses
+            return {
+                "hits": self.hits,
+                "revalidations": self.revalidations,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "bytes": self._total_bytes,
+                "hit_ratio": (self.hits + self.revalidations) / lookups if lookups else 0.0,
+            }
+
+
+_source_cache: Optional[SourceCache] = None
+_source_cache_guard = threading.Lock()
+
+
+def get_source_cache() -> SourceCache:
+    global _source_cache
+    with _source_cache_guard:
+        if _source_cache is None:
+            _source_cache = SourceCache(
+                path=os.getenv("SOURCE_CACHE_PATH", SOURCE_CACHE_PATH),
+                ttl_seconds=float(os.getenv(
+                    "SOURCE_CACHE_TTL_SECONDS", DEFAULT_SOURCE_CACHE_TTL_SECONDS)),
+                max_bytes=int(os.getenv(
+                    "SOURCE_CACHE_MAX_BYTES", DEFAULT_SOURCE_CACHE_MAX_BYTES)),
+            )
+        return _source_cache
+
+
+async def get_or_load_chunks(key: str, text_splitter, load: SourceLoader) -> List["Document"]:
+    cache = get_source_cache()
+    signature = splitter_signature(text_splitter)
+    entry = await asyncio.to_thread(cache.get, key)
+
+    if entry and entry["fresh"]:
+        cache.hits += 1
+    else:
+        validators = entry if entry and (entry["etag"] or entry["last_modified"]) else None
+        result = await load(validators)
+        if result is None and entry:
+            cache.revalidations += 1
+            await asyncio.to_thread(cache.touch, key)
+        else:
+            cache.misses += 1
+            documents, etag, last_modified = result or ([], None, None)
+            with observe_stage("split"):
+                chunks = await split_documents(text_splitter, documents)
+            if documents:
+                await asyncio.to_thread(
+                    cache.put, key, documents, chunks, signature, etag, last_modified)
+            return chunks
+
+    if entry["splitter"] == signature:
+        return entry["chunks"]
+
+    with observe_stage("split"):
+        chunks = await split_documents(text_splitter, entry["documents"])
+    await asyncio.to_thread(
+        cache.put, key, entry["documents"], chunks, signature,
+        entry["etag"], entry["last_modified"])
+    return chunks
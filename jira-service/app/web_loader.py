@@ -0,0 +1,253 @@
+import asyncio
+import queue
+import re
+import threading
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.source_cache import get_or_load_chunks
+
+if TYPE_CHECKING:
+    from langchain.schema import Document
+
+DEFAULT_WEB_FETCH_TIMEOUT_SECONDS = 15.0
+DEFAULT_WEB_URL_TIMEOUT_SECONDS = 45.0
+DEFAULT_WEB_MAX_CONNECTIONS = 20
+DEFAULT_WEB_MIN_TEXT_CHARS = 500
+DEFAULT_BROWSER_POOL_SIZE = 2
+DEFAULT_BROWSER_PAGE_LOAD_TIMEOUT_SECONDS = 30
+DEFAULT_BROWSER_MAX_PAGES = 50
+WEB_USER_AGENT = "Mozilla/5.0 (compatible; SprintAI/1.0)"
+JAVASCRIPT_REQUIRED_MARKERS = ("enable javascript", "javascript is required", "javascript is disabled")
+NON_CONTENT_TAGS = ["script", "style", "noscript", "template", "svg"]
+SCRIPT_ROOT_PATTERN = re.compile(r"""<div[^>]*\bid=["']?(?:root|app|__next|__nuxt)\b""", re.IGNORECASE)
+
+
+def extract_html(html: str, url: str) -> Tuple[str, Dict[str, Any]]:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    metadata = {
+        "source": url,
+        "title": "No title found.",
+        "description": "No description found.",
+        "language": "No language found.",
+    }
+    if soup.title and soup.title.string:
+        metadata["title"] = soup.title.string.strip()
+    description = soup.find("meta", attrs={"name": "description"})
+    if description and description.get("content"):
+        metadata["description"] = description["content"]
+    if soup.html and soup.html.get("lang"):
+        metadata["language"] = soup.html["lang"]
+
+    for tag in soup(NON_CONTENT_TAGS):
+        tag.decompose()
+    lines = (line.strip() for line in soup.get_text("\n").splitlines())
+    text = "\n".join(line for line in lines if line)
+    return text, metadata
+
+
+def needs_browser(html: str, text: str) -> bool:
+    if any(marker in text.lower() for marker in JAVASCRIPT_REQUIRED_MARKERS):
+        return True
+    if len(text) >= DEFAULT_WEB_MIN_TEXT_CHARS:
+        return False
+    lowered = html.lower()
+    return (
+        any(marker in lowered for marker in JAVASCRIPT_REQUIRED_MARKERS)
+        or SCRIPT_ROOT_PATTERN.search(html) is not None
+    )
+
+
+class BrowserPool:
+    def __init__(
+        self,
+        size: int = DEFAULT_BROWSER_POOL_SIZE,
+        page_load_timeout: int = DEFAULT_BROWSER_PAGE_LOAD_TIMEOUT_SECONDS,
+        max_pages: int = DEFAULT_BROWSER_MAX_PAGES,
+    ):
+        self.size = size
+        self.page_load_timeout = page_load_timeout
+        self.max_pages = max_pages
+        self._idle: "queue.LifoQueue[Tuple[Any, int]]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._drivers: List[Any] = []
+
+    def _create_driver(self):
+        from selenium.webdriver import Chrome
+        from selenium.webdriver.chrome.options import Options
+
+        options = Options()
+        for argument in ("--headless=new", "--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu"):
+            options.add_argument(argument)
+        driver = Chrome(options=options)
+        driver.set_page_load_timeout(self.page_load_timeout)
+        with self._lock:
+            self._drivers.append(driver)
+        return driver
+
+    def _discard(self, driver) -> None:
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"Error closing browser: {e}")
+
+    def fetch(self, url: str) -> str:
+        with self._slots:
+            try:
+                driver, pages = self._idle.get_nowait()
+            except queue.Empty:
+                driver, pages = self._create_driver(), 0
+
+            try:
+                driver.get(url)
+                html = driver.page_source
+            except Exception:
+                self._discard(driver)
+                raise
+
+            if pages + 1 >= self.max_pages:
+                self._discard(driver)
+            else:
+                self._idle.put((driver, pages + 1))
+            return html
+
+    def close(self) -> None:
+        with self._lock:
+            drivers = list(self._drivers)
+        for driver in drivers:
+            self._discard(driver)
+        while not self._idle.empty():
+            self._idle.get_nowait()
+
+
+class WebLoader:
+    def __init__(
+        self,
+        browser_pool: Optional[BrowserPool] = None,
+        url_timeout: float = DEFAULT_WEB_URL_TIMEOUT_SECONDS,
+    ):
+        self.browser_pool = browser_pool or BrowserPool()
+        self.url_timeout = url_timeout
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=DEFAULT_WEB_FETCH_TIMEOUT_SECONDS,
+                follow_redirects=True,
+                headers={"User-Agent": WEB_USER_AGENT},
+                limits=httpx.Limits(max_connections=DEFAULT_WEB_MAX_CONNECTIONS),
+            )
+        return self._client
+
+    async def _fetch_url(
+        self, url: str, validators: Optional[Dict[str, Any]] = None
+    ) -> Optional[Tuple["Document", Optional[str], Optional[str]]]:
+        from langchain.schema import Document
+
+        headers = {}
+        if validators and validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators and validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+        response = await self._get_client().get(url, headers=headers)
+        if response.status_code == 304 and validators:
+            return None
+        response.raise_for_status()
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        content_type = response.headers.get("content-type", "text/html")
+        if "html" not in content_type:
+            if not content_type.startswith("text/"):
+                raise ValueError(f"Unsupported content type for {url}: {content_type}")
+            document = Document(page_content=response.text, metadata={"source": url})
+            return document, etag, last_modified
+
+        html = response.text
+        text, metadata = extract_html(html, url)
+        if needs_browser(html, text):
+            print(f"{url} looks script-rendered, loading it in the browser")
+            html = await asyncio.to_thread(self.browser_pool.fetch, url)
+            text, metadata = extract_html(html, url)
+            etag = last_modified = None
+
+        return Document(page_content=text, metadata=metadata), etag, last_modified
+
+    async def _load_url_chunks(self, url: str, text_splitter) -> List["Document"]:
+        async def load(validators: Optional[Dict[str, Any]]):
+            result = await self._fetch_url(url, validators)
+            if result is None:
+                return None
+            document, etag, last_modified = result
+            return [document], etag, last_modified
+
+        return await get_or_load_chunks(f"web:{url}", text_splitter, load)
+
+    async def _gather(self, urls: List[str], coroutines) -> List[Any]:
+        results = await asyncio.gather(
+            *(asyncio.wait_for(coroutine, self.url_timeout) for coroutine in coroutines),
+            return_exceptions=True,
+        )
+
+        loaded = []
+        for url, result in zip(urls, results):
+            if isinstance(result, BaseException):
+                print(f"Error fetching or processing {url}, exception: {result!r}")
+            else:
+                loaded.append(result)
+        return loaded
+
+    async def load_chunks(self, urls: List[str], text_splitter) -> List["Document"]:
+        chunk_lists = await self._gather(
+            urls, [self._load_url_chunks(url, text_splitter) for url in urls])
+        return [chunk for chunks in chunk_lists for chunk in chunks]
+
+    async def iter_chunks(self, urls: List[str], text_splitter) -> AsyncIterator[List["Document"]]:
+        async def load(url: str) -> List["Document"]:
+            try:
+                return await asyncio.wait_for(
+                    self._load_url_chunks(url, text_splitter), self.url_timeout)
+            except Exception as e:
+                print(f"Error fetching or processing {url}, exception: {e!r}")
+                return []
+
+        for loaded in asyncio.as_completed([load(url) for url in urls]):
+            chunks = await loaded
+            if chunks:
+                yield chunks
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+        await asyncio.to_thread(self.browser_pool.close)
+
+
+_web_loader: Optional[WebLoader] = None
+
+
+def get_web_loader() -> WebLoader:
+    global _web_loader
+    if _web_loader is None:
+        _web_loader = WebLoader()
+    return _web_loader
+
+
+async def load_web_chunks(urls: List[str], text_splitter) -> List["Document"]:
+    return await get_web_loader().load_chunks(urls, text_splitter)
+
+
+def iter_web_chunks(urls: List[str], text_splitter) -> AsyncIterator[List["Document"]]:
+    return get_web_loader().iter_chunks(urls, text_splitter)
+
+
+async def close_web_loader() -> None:
+    if _web_loader is not None:
+        await _web_loader.close()
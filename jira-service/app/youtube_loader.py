@@ -0,0 +1,79 @@
+import asyncio
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from app.ingestion import tag_documents
+from app.source_cache import get_or_load_chunks
+
+if TYPE_CHECKING:
+    from langchain.schema import Document
+
+DEFAULT_YOUTUBE_MAX_CONCURRENCY = 5
+DEFAULT_YOUTUBE_TIMEOUT_SECONDS = 60.0
+
+
+async def load_youtube_chunks(
+    url: str, text_splitter, chunk_size_seconds: int
+) -> List["Document"]:
+    async def load(validators: Optional[Dict[str, Any]]):
+        from langchain_community.document_loaders.youtube import TranscriptFormat, YoutubeLoader
+
+        youtube_loader = YoutubeLoader.from_youtube_url(
+            url,
+            add_video_info=True,
+            transcript_format=TranscriptFormat.CHUNKS,
+            chunk_size_seconds=chunk_size_seconds,
+        )
+        return await asyncio.to_thread(youtube_loader.load), None, None
+
+    return await get_or_load_chunks(
+        f"youtube:{url}:{chunk_size_seconds}", text_splitter, load)
+
+
+async def _load_youtube_source(
+    url: str, text_splitter, chunk_size_seconds: int, semaphore: asyncio.Semaphore, timeout: float
+) -> Tuple[List["Document"], Dict[str, Any]]:
+    async with semaphore:
+        try:
+            chunks = await asyncio.wait_for(
+                load_youtube_chunks(url, text_splitter, chunk_size_seconds), timeout)
+        except asyncio.TimeoutError:
+            error = f"Timed out after {timeout:g}s"
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        else:
+            return tag_documents(chunks, f"youtube:{url}"), {
+                "source": url, "ok": True, "error": None, "chunk_count": len(chunks)}
+
+    print(f"Error loading YouTube transcript for {url}: {error}")
+    return [], {"source": url, "ok": False, "error": error, "chunk_count": 0}
+
+
+async def load_youtube_sources(
+    urls: List[str],
+    text_splitter,
+    chunk_size_seconds: int,
+    max_concurrency: int = DEFAULT_YOUTUBE_MAX_CONCURRENCY,
+    timeout: float = DEFAULT_YOUTUBE_TIMEOUT_SECONDS,
+) -> Tuple[List["Document"], List[Dict[str, Any]]]:
+    semaphore = asyncio.Semaphore(max_concurrency)
+    loaded = await asyncio.gather(*(
+        _load_youtube_source(url, text_splitter, chunk_size_seconds, semaphore, timeout)
+        for url in urls
+    ))
+    chunks = [chunk for source_chunks, _ in loaded for chunk in source_chunks]
+    return chunks, [result for _, result in loaded]
+
+
+async def iter_youtube_sources(
+    urls: List[str],
+    text_splitter,
+    chunk_size_seconds: int,
+    max_concurrency: int = DEFAULT_YOUTUBE_MAX_CONCURRENCY,
+    timeout: float = DEFAULT_YOUTUBE_TIMEOUT_SECONDS,
+) -> AsyncIterator[Tuple[List["Document"], Dict[str, Any]]]:
+    semaphore = asyncio.Semaphore(max_concurrency)
+    for loaded in asyncio.as_completed([
+        _load_youtube_source(url, text_splitter, chunk_size_seconds, semaphore, timeout)
+        for url in urls
+    ]):
+        yield await loaded
@@ -0,0 +1,168 @@
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+BENCHMARK_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+SERVICE_DIRECTORY = os.path.dirname(BENCHMARK_DIRECTORY)
+FIXTURE_PATH = os.path.join(BENCHMARK_DIRECTORY, "relevance_fixture.json")
+BASELINE_PATH = os.path.join(BENCHMARK_DIRECTORY, "baselines.json")
+TOP_K = 5
+LATENCY_QUERIES = 50
+DEFAULT_LATENCY_CHUNKS = 100_000
+DEFAULT_TOLERANCE = 0.02
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def score(rankings: List[List[str]], queries: List[Dict[str, Any]]) -> Dict[str, float]:
+    recall = reciprocal_ranks = 0.0
+    for ranking, query in zip(rankings, queries):
+        relevant = set(query["relevant"])
+        recall += len(relevant.intersection(ranking[:TOP_K])) / len(relevant)
+        for rank, document_id in enumerate(ranking[:TOP_K], start=1):
+            if document_id in relevant:
+                reciprocal_ranks += 1.0 / rank
+                break
+    return {
+        f"recall_at_{TOP_K}": round(recall / len(queries), 3),
+        f"mrr_at_{TOP_K}": round(reciprocal_ranks / len(queries), 3),
+    }
+
+
+def create_collection(client, name: str):
+    from stand_ins import LexicalEmbeddingFunction
+
+    return client.create_collection(name, embedding_function=LexicalEmbeddingFunction())
+
+
+def ingest(collection, texts: List[str]) -> None:
+    from langchain.schema import Document
+
+    from app.ingestion import StreamingIngest
+
+    ingest = StreamingIngest(collection, lambda document: {"source": "jira"})
+    ingest.add(Document(page_content=text, metadata={"source_key": f"jira:{index}"})
+               for index, text in enumerate(texts))
+    ingest.finish()
+
+
+def evaluate_fixture(client, name: str, fixture: Dict[str, Any], prefix: str = "") -> Dict[str, Dict[str, float]]:
+    from app.hybrid_retrieval import get_keyword_index, hybrid_query
+
+    ids_by_text = {document["text"]: document["id"] for document in fixture["documents"]}
+    collection = create_collection(client, name)
+    ingest(collection, list(ids_by_text))
+
+    queries = fixture["queries"]
+    prompts = [query["query"] for query in queries]
+    vector = collection.query(query_texts=prompts, n_results=TOP_K)["documents"]
+    keyword_index = get_keyword_index(collection)
+    keyword = [[content for _, content, _ in keyword_index.search(prompt, TOP_K)] for prompt in prompts]
+    hybrid = hybrid_query(collection, prompts, TOP_K)
+    os.environ["HYBRID_RERANK"] = "true"
+    reranked = hybrid_query(collection, prompts, TOP_K)
+    os.environ.pop("HYBRID_RERANK")
+
+    results = {}
+    for mode, rankings in (
+        ("vector", vector), ("keyword", keyword), ("hybrid", hybrid), ("hybrid_rerank", reranked)
+    ):
+        results[prefix + mode] = score(
+            [[ids_by_text[text] for text in ranking] for ranking in rankings], queries)
+    return results
+
+
+def evaluate_relevance(client) -> Dict[str, Dict[str, float]]:
+    with open(FIXTURE_PATH) as f:
+        fixture = json.load(f)
+    results = evaluate_fixture(client, "relevance_fixture", fixture)
+    results.update(evaluate_fixture(
+        client, "relevance_fixture_small", fixture["small_collection"], prefix="small_"))
+    return results
+
+
+def measure_latency(client, chunk_count: int) -> Dict[str, float]:
+    from app.hybrid_retrieval import hybrid_query
+
+    vocabulary = [f"term{index}" for index in range(20_000)]
+    generator = random.Random(7)
+    texts = [
+        f"Issue: LOAD-{index} " + " ".join(generator.choices(vocabulary, k=120))
+        for index in range(chunk_count)
+    ]
+    collection = create_collection(client, "relevance_latency")
+    started = time.perf_counter()
+    ingest(collection, texts)
+    ingest_seconds = time.perf_counter() - started
+
+    latencies = []
+    for index in range(LATENCY_QUERIES):
+        prompt = f"Follow up on LOAD-{generator.randrange(chunk_count)} " + " ".join(
+            generator.choices(vocabulary, k=8))
+        started = time.perf_counter()
+        hybrid_query(collection, [prompt], TOP_K)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return {
+        "chunks": chunk_count,
+        "ingest_seconds": round(ingest_seconds, 1),
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Score vector, keyword and hybrid retrieval against the offline relevance fixture")
+    parser.add_argument("--latency-chunks", type=int, default=0,
+                        help=f"Also time hybrid queries over this many synthetic chunks, e.g. {DEFAULT_LATENCY_CHUNKS}")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    sys.path[:0] = [SERVICE_DIRECTORY, BENCHMARK_DIRECTORY]
+    import chromadb
+
+    with tempfile.TemporaryDirectory(prefix="bench-relevance-") as working_directory:
+        os.chdir(working_directory)
+        client = chromadb.EphemeralClient()
+        results = {"relevance": evaluate_relevance(client)}
+        if args.latency_chunks:
+            results["latency"] = measure_latency(client, args.latency_chunks)
+    print(json.dumps(results, indent=2))
+
+    baselines = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baselines = json.load(f)
+
+    if args.save_baseline:
+        baselines["relevance"] = results["relevance"]
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Saved baselines to {BASELINE_PATH}")
+        return
+
+    regressions = [
+        f"{mode} {metric}: {value} vs baseline {baselines['relevance'][mode][metric]}"
+        for mode, metrics in results["relevance"].items()
+        for metric, value in metrics.items()
+        if mode in baselines.get("relevance", {})
+        and value < baselines["relevance"][mode][metric] - args.tolerance
+    ]
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+BENCHMARK_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+SERVICE_DIRECTORY = os.path.dirname(BENCHMARK_DIRECTORY)
+SHARED_SOURCE_DIRECTORY = os.path.join(SERVICE_DIRECTORY, "..", "shared", "src")
+BASELINE_PATH = os.path.join(BENCHMARK_DIRECTORY, "baselines.json")
+DEFAULT_TOLERANCE = 0.25
+CONCURRENT_REQUESTS = 8
+ACCESS_TOKEN = "benchmark-token"
+HEADERS = {"X-API-Key": "benchmark"}
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class Harness:
+    def __init__(self, client, jira, s3_client):
+        self.client = client
+        self.jira = jira
+        self.s3_client = s3_client
+
+    def ticket_request(self, project_key: str, prompt: str, **extra: Any) -> Dict[str, Any]:
+        return {
+            "prompt": prompt,
+            "project_key": project_key,
+            "access_token": ACCESS_TOKEN,
+            "jira_base_url": self.jira.base_url,
+            **extra,
+        }
+
+    def post(self, path: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        response = self.client.post(path, json=body, headers=HEADERS)
+        if response.status_code not in (200, 202):
+            raise RuntimeError(f"{path} returned {response.status_code}: {response.text}")
+        return response.json()
+
+    def wait_until_ready(self, timeout: float = 60.0) -> None:
+        deadline = time.monotonic() + timeout
+        while self.client.get("/ready").status_code != 200:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Service was not ready within {timeout:g}s")
+            time.sleep(0.05)
+
+    def wait_for_job(self, job_id: str, timeout: float = 300.0) -> Dict[str, Any]:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            job = self.client.get(f"/jobs/{job_id}", headers=HEADERS).json()
+            if job["status"] in ("succeeded", "failed", "cancelled"):
+                if job["status"] != "succeeded":
+                    raise RuntimeError(f"Job {job_id} {job['status']}: {job.get('error')}")
+                return job
+            time.sleep(0.01)
+        raise RuntimeError(f"Job {job_id} did not finish within {timeout:g}s")
+
+
+def setup_cold_project(harness: Harness) -> Callable[[int], int]:
+    def run(iteration: int) -> int:
+        project_key = f"COLD{iteration}"
+        harness.jira.add_project(project_key, 500)
+        harness.post("/generate-ticket", harness.ticket_request(
+            project_key, f"Add a login page ({iteration})"))
+        return 1
+
+    return run
+
+
+def setup_warm_project(harness: Harness) -> Callable[[int], int]:
+    harness.jira.add_project("WARM", 500)
+    harness.post("/generate-ticket", harness.ticket_request("WARM", "Warm the project"))
+
+    def run(iteration: int) -> int:
+        harness.post("/generate-ticket", harness.ticket_request(
+            "WARM", f"Add export to CSV ({iteration})"))
+        return 1
+
+    return run
+
+
+def setup_concurrent_warm_project(harness: Harness) -> Callable[[int], int]:
+    harness.jira.add_project("WARM", 500)
+    harness.post("/generate-ticket", harness.ticket_request("WARM", "Warm the project"))
+    executor = ThreadPoolExecutor(max_workers=CONCURRENT_REQUESTS)
+
+    def run(iteration: int) -> int:
+        list(executor.map(
+            lambda index: harness.post("/generate-ticket", harness.ticket_request(
+                "WARM", f"Add export to CSV ({iteration}-{index})")),
+            range(CONCURRENT_REQUESTS),
+        ))
+        return CONCURRENT_REQUESTS
+
+    return run
+
+
+def setup_large_project(harness: Harness) -> Callable[[int], int]:
+    def run(iteration: int) -> int:
+        project_key = f"LARGE{iteration}"
+        harness.jira.add_project(project_key, 10_000)
+        harness.post("/generate-ticket", harness.ticket_request(
+            project_key, f"Improve search relevance ({iteration})"))
+        return 1
+
+    return run
+
+
+def setup_batch(harness: Harness) -> Callable[[int], int]:
+    harness.jira.add_project("BATCH", 500)
+    harness.post("/generate-ticket", harness.ticket_request("BATCH", "Warm the project"))
+
+    def run(iteration: int) -> int:
+        prompts = [f"Batch prompt {iteration}-{index}" for index in range(50)]
+        response = harness.post("/generate-tickets/batch", {
+            **harness.ticket_request("BATCH", ""),
+            "prompts": prompts,
+        })
+        failed = [result for result in response["results"] if not result["ok"]]
+        if failed:
+            raise RuntimeError(f"{len(failed)} batch items failed: {failed[0]['error']}")
+        return len(prompts)
+
+    return run
+
+
+def setup_transcript(harness: Harness) -> Callable[[int], int]:
+    harness.jira.add_project("MEDIA", 50)
+
+    def run(iteration: int) -> int:
+        job = harness.post("/load-documents", {
+            "youtube_urls": [f"https://www.youtube.com/watch?v=bench{iteration:06d}"],
+            "project_key": "MEDIA",
+            "access_token": ACCESS_TOKEN,
+            "jira_base_url": harness.jira.base_url,
+        })
+        harness.wait_for_job(job["job_id"])
+        return 1
+
+    return run
+
+
+SCENARIOS = {
+    "cold_project": (setup_cold_project, 5),
+    "warm_project": (setup_warm_project, 30),
+    "warm_project_concurrent": (setup_concurrent_warm_project, 5),
+    "large_project": (setup_large_project, 1),
+    "batch_50": (setup_batch, 5),
+    "large_transcript": (setup_transcript, 2),
+}
+
+
+def install_stand_ins():
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+    from langchain_community.document_loaders import youtube
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+    from sprint_shared.aws import s3_service
+    from sprint_shared.aws.ticket_cache import TicketCache
+
+    import app.main as main
+    from app.embedding_cache import cached_embeddings
+    from app.embedding_dispatcher import DispatchedEmbeddings, get_embedding_dispatcher
+    from app.guideline_index import build_guideline_index, guideline_index_path
+
+    from stand_ins import (
+        CANNED_TICKET,
+        FakeJiraServer,
+        FakeYoutubeLoader,
+        InMemoryS3Client,
+        fake_embed_batch,
+        guideline_documents,
+    )
+
+    async def load_guidelines(urls, text_splitter):
+        return text_splitter.split_documents(guideline_documents())
+
+    async def iter_guidelines(urls, text_splitter):
+        yield text_splitter.split_documents(guideline_documents())
+
+    jira = FakeJiraServer().start()
+    s3_client = InMemoryS3Client()
+    s3_service._s3_service = s3_service.S3Service(s3_client=s3_client, ticket_cache=TicketCache())
+    youtube.YoutubeLoader = FakeYoutubeLoader
+    main.load_web_chunks = load_guidelines
+    main.iter_web_chunks = iter_guidelines
+    main._llm = FakeListChatModel(responses=[json.dumps(CANNED_TICKET)])
+    main._embeddings = cached_embeddings(DispatchedEmbeddings(
+        get_embedding_dispatcher("fake-embedding", fake_embed_batch), "fake-embedding"))
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=main.DEFAULT_CHUNK_SIZE, chunk_overlap=main.DEFAULT_CHUNK_OVERLAP)
+    build_guideline_index(
+        text_splitter.split_documents(guideline_documents()), main._embeddings, guideline_index_path())
+    return main, jira, s3_client
+
+
+def run_scenario(name: str, iterations: int) -> Dict[str, Any]:
+    os.environ.update({
+        "API_KEY": HEADERS["X-API-Key"],
+        "OPENAI_API_KEY": "sk-benchmark",
+        "S3_BUCKET_NAME": "benchmark-bucket",
+        "AWS_ACCESS_KEY_ID": "benchmark",
+        "AWS_SECRET_ACCESS_KEY": "benchmark",
+        "AWS_DEFAULT_REGION": "us-east-1",
+        "JOB_STORE": "memory",
+    })
+    sys.path[:0] = [SERVICE_DIRECTORY, SHARED_SOURCE_DIRECTORY, BENCHMARK_DIRECTORY]
+
+    from fastapi.testclient import TestClient
+
+    main, jira, s3_client = install_stand_ins()
+    setup, _ = SCENARIOS[name]
+    latencies = []
+    items = 0
+    with TestClient(main.app, base_url="http://localhost") as client:
+        harness = Harness(client, jira, s3_client)
+        harness.wait_until_ready()
+        run = setup(harness)
+        started = time.perf_counter()
+        for iteration in range(iterations):
+            iteration_started = time.perf_counter()
+            items += run(iteration)
+            latencies.append((time.perf_counter() - iteration_started) * 1000)
+        elapsed = time.perf_counter() - started
+    jira.stop()
+
+    return {
+        "iterations": iterations,
+        "items": items,
+        "throughput_per_second": round(items / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+        "mean_ms": round(statistics.mean(latencies), 2),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "jira_requests": jira.requests,
+        "s3_calls": s3_client.calls,
+    }
+
+
+def run_isolated(name: str, iterations: int, verbose: bool) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix=f"bench-{name}-") as working_directory:
+        output_path = os.path.join(working_directory, "result.json")
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", name,
+             "--iterations", str(iterations), "--output", output_path],
+            cwd=working_directory,
+            stdout=None if verbose else subprocess.DEVNULL,
+            stderr=None if verbose else subprocess.PIPE,
+            text=True,
+        )
+        if completed.returncode != 0:
+            raise SystemExit(f"Scenario {name} failed:\n{completed.stderr or ''}")
+        with open(output_path) as f:
+            return json.load(f)
+
+
+def compare(results: Dict[str, Dict[str, Any]], baselines: Dict[str, Dict[str, Any]], tolerance: float) -> List[str]:
+    regressions = []
+    for name, result in results.items():
+        baseline = baselines.get(name)
+        if not baseline:
+            continue
+        for metric in ("p50_ms", "p95_ms", "peak_rss_mb"):
+            if result[metric] > baseline[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{name} {metric}: {result[metric]} vs baseline {baseline[metric]}")
+        if result["throughput_per_second"] < baseline["throughput_per_second"] * (1 - tolerance):
+            regressions.append(
+                f"{name} throughput_per_second: {result['throughput_per_second']} "
+                f"vs baseline {baseline['throughput_per_second']}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run the RAG pipeline against local stand-ins for Jira, OpenAI and S3")
+    parser.add_argument("scenarios", nargs="*", help=f"Any of {', '.join(SCENARIOS)}")
+    parser.add_argument("--iterations", type=int)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--verbose", action="store_true")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = run_scenario(args.child, args.iterations)
+        with open(args.output, "w") as f:
+            json.dump(result, f)
+        os._exit(0)
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    results = {}
+    for name in args.scenarios or SCENARIOS:
+        results[name] = run_isolated(name, args.iterations or SCENARIOS[name][1], args.verbose)
+        print(json.dumps({name: results[name]}))
+
+    if args.save_baseline:
+        baselines = {}
+        if os.path.exists(BASELINE_PATH):
+            with open(BASELINE_PATH) as f:
+                baselines = json.load(f)
+        baselines.setdefault("scenarios", {}).update(results)
+        baselines["environment"] = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        }
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Saved baselines to {BASELINE_PATH}")
+        return
+
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            regressions = compare(results, json.load(f).get("scenarios", {}), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+import hashlib
+import io
+import json
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from botocore.exceptions import ClientError
+from langchain.schema import Document
+
+FAKE_EMBEDDING_DIMENSIONS = 256
+FAKE_ISSUE_UPDATED = "2024-01-01T00:00:00.000+0000"
+CANNED_TICKET = {
+    "title": "Benchmark ticket",
+    "description": "Acceptance criteria generated by the stub LLM.",
+    "priority": "Medium",
+    "labels": ["benchmark"],
+}
+
+
+def fake_embed_batch(texts: List[str]) -> Tuple[List[List[float]], Dict[str, str]]:
+    vectors = []
+    for text in texts:
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        vector = [(digest[index % len(digest)] - 127.5) / 127.5
+                  for index in range(FAKE_EMBEDDING_DIMENSIONS)]
+        vectors.append(vector)
+    return vectors, {}
+
+
+def lexical_embedding(text: str) -> List[float]:
+    vector = [0.0] * FAKE_EMBEDDING_DIMENSIONS
+    for word in re.findall(r"[a-z]{3,}", text.lower()):
+        bucket = int.from_bytes(hashlib.md5(word[:6].encode()).digest()[:4], "big")
+        vector[bucket % FAKE_EMBEDDING_DIMENSIONS] += 1.0
+    norm = sum(value * value for value in vector) ** 0.5 or 1.0
+    return [value / norm for value in vector]
+
+
+class LexicalEmbeddingFunction:
+    def __call__(self, input: List[str]) -> List[List[float]]:
+        return [lexical_embedding(text) for text in input]
+
+
+class FakeJiraServer:
+    def __init__(self, latency_seconds: float = 0.0):
+        self.latency_seconds = latency_seconds
+        self.requests = 0
+        self._projects: Dict[str, List[Dict[str, Any]]] = {}
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def add_project(self, project_key: str, issue_count: int) -> None:
+        self._projects[project_key] = [
+            {
+                "key": f"{project_key}-{number}",
+                "fields": {
+                    "summary": f"Issue {number} of {project_key}",
+                    "description": f"Steps to reproduce problem {number}. " * 8,
+                    "status": {"name": "To Do" if number % 3 else "Done"},
+                    "priority": {"name": ("High", "Medium", "Low")[number % 3]},
+                    "updated": FAKE_ISSUE_UPDATED,
+                },
+            }
+            for number in range(1, issue_count + 1)
+        ]
+
+    def start(self) -> "FakeJiraServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _search(self, query: Dict[str, List[str]]) -> Dict[str, Any]:
+        jql = query.get("jql", [""])[0]
+        start_at = int(query.get("startAt", ["0"])[0])
+        max_results = int(query.get("maxResults", ["50"])[0])
+        fields = query.get("fields", [""])[0].split(",")
+
+        project_key = re.search(r"project = (\w+)", jql).group(1)
+        issues = self._projects.get(project_key, [])
+        since = re.search(r'updated >= "([^"]+)"', jql)
+        if since:
+            cutoff = datetime.strptime(since.group(1), "%Y/%m/%d %H:%M").replace(tzinfo=timezone.utc)
+            issues = [
+                issue for issue in issues
+                if datetime.strptime(issue["fields"]["updated"], "%Y-%m-%dT%H:%M:%S.%f%z") >= cutoff
+            ]
+
+        page = issues[start_at:start_at + max_results]
+        if fields == ["key"]:
+            page = [{"key": issue["key"]} for issue in page]
+        return {"startAt": start_at, "maxResults": max_results, "total": len(issues), "issues": page}
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                server.requests += 1
+                time.sleep(server.latency_seconds)
+                url = urlparse(self.path)
+                if url.path == "/rest/api/3/search":
+                    body = server._search(parse_qs(url.query))
+                elif url.path.startswith("/rest/api/3/project/"):
+                    project_key = url.path.rsplit("/", 1)[-1]
+                    body = {
+                        "key": project_key,
+                        "name": f"Project {project_key}",
+                        "description": "Benchmark project",
+                        "projectTypeKey": "software",
+                    }
+                else:
+                    self.send_error(404)
+                    return
+
+                data = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+class _Paginator:
+    def __init__(self, client: "InMemoryS3Client"):
+        self.client = client
+
+    def paginate(self, Bucket: str, Prefix: str = "") -> Iterator[Dict[str, Any]]:
+        token = None
+        while True:
+            page = self.client.list_objects_v2(Bucket=Bucket, Prefix=Prefix, ContinuationToken=token)
+            yield page
+            token = page.get("NextContinuationToken")
+            if not token:
+                return
+
+
+class InMemoryS3Client:
+    def __init__(self, latency_seconds: float = 0.0):
+        self.latency_seconds = latency_seconds
+        self.calls = 0
+        self._objects: Dict[Tuple[str, str], Tuple[bytes, str]] = {}
+        self._lock = threading.Lock()
+
+    def _call(self) -> None:
+        self.calls += 1
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+
+    def _error(self, code: str, operation: str) -> ClientError:
+        return ClientError({"Error": {"Code": code, "Message": code}}, operation)
+
+    def put_object(
+        self, Bucket: str, Key: str, Body: Any, IfMatch: Optional[str] = None,
+        IfNoneMatch: Optional[str] = None, **kwargs: Any
+    ) -> Dict[str, Any]:
+        self._call()
+        data = Body.encode("utf-8") if isinstance(Body, str) else bytes(Body)
+        etag = f'"{hashlib.md5(data).hexdigest()}"'
+        with self._lock:
+            existing = self._objects.get((Bucket, Key))
+            if IfNoneMatch == "*" and existing is not None:
+                raise self._error("PreconditionFailed", "PutObject")
+            if IfMatch is not None and (existing is None or existing[1] != IfMatch):
+                raise self._error("PreconditionFailed", "PutObject")
+            self._objects[(Bucket, Key)] = (data, etag)
+        return {"ETag": etag}
+
+    def get_object(self, Bucket: str, Key: str, IfNoneMatch: Optional[str] = None) -> Dict[str, Any]:
+        self._call()
+        with self._lock:
+            existing = self._objects.get((Bucket, Key))
+        if existing is None:
+            raise self._error("NoSuchKey", "GetObject")
+        if IfNoneMatch is not None and IfNoneMatch == existing[1]:
+            raise self._error("304", "GetObject")
+        return {"Body": io.BytesIO(existing[0]), "ETag": existing[1]}
+
+    def delete_object(self, Bucket: str, Key: str) -> Dict[str, Any]:
+        self._call()
+        with self._lock:
+            self._objects.pop((Bucket, Key), None)
+        return {}
+
+    def list_objects_v2(
+        self, Bucket: str, Prefix: str = "", ContinuationToken: Optional[str] = None,
+        MaxKeys: int = 1000
+    ) -> Dict[str, Any]:
+        self._call()
+        with self._lock:
+            keys = sorted(
+                key for bucket, key in self._objects if bucket == Bucket and key.startswith(Prefix))
+        start = int(ContinuationToken or 0)
+        page = keys[start:start + MaxKeys]
+        response = {"Contents": [{"Key": key} for key in page], "KeyCount": len(page)}
+        if start + MaxKeys < len(keys):
+            response["NextContinuationToken"] = str(start + MaxKeys)
+        return response
+
+    def get_paginator(self, operation: str) -> _Paginator:
+        return _Paginator(self)
+
+
+class FakeYoutubeLoader:
+    segments = 2000
+
+    def __init__(self, url: str):
+        self.url = url
+
+    @classmethod
+    def from_youtube_url(cls, url: str, **kwargs: Any) -> "FakeYoutubeLoader":
+        return cls(url)
+
+    def load(self) -> List[Document]:
+        return [
+            Document(
+                page_content=f"Segment {index} of {self.url} explains sprint planning "
+                             f"and how tickets move through review. " * 6,
+                metadata={"source": self.url, "start_seconds": index * 30},
+            )
+            for index in range(self.segments)
+        ]
+
+
+def guideline_documents() -> List[Document]:
+    return [Document(
+        page_content="A useful Jira ticket has a clear summary, acceptance criteria, "
+                     "priority and labels. " * 40,
+        metadata={"source": "https://example.invalid/guidelines", "title": "Guidelines"},
+    )]
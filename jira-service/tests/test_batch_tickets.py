@@ -0,0 +1,60 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from app import main
+
+
+class StubMessage:
+    def __init__(self, prompt):
+        self.content = json.dumps({"title": prompt, "description": "Generated", "priority": "Low"})
+        self.usage_metadata = None
+        self.response_metadata = {}
+
+
+class StubChain:
+    async def ainvoke(self, inputs):
+        if inputs["prompt"] == "slow":
+            await asyncio.sleep(5)
+        return StubMessage(inputs["prompt"])
+
+
+class StubEmbeddings:
+    def embed_documents(self, texts):
+        return [[0.0, 1.0] for _ in texts]
+
+
+async def no_sources(request):
+    return None, [], []
+
+
+async def empty_contexts(collection, document_chunks, prompts):
+    return [("", 0) for _ in prompts]
+
+
+async def stored(ticket):
+    return None
+
+
+def test_slow_item_times_out_without_failing_the_batch(monkeypatch):
+    monkeypatch.setenv("API_KEY", "test-key")
+    monkeypatch.setenv("STAGE_TIMEOUT_LLM_SECONDS", "0.2")
+    monkeypatch.setattr(main, "prepare_ticket_sources", no_sources)
+    monkeypatch.setattr(main, "retrieve_ticket_contexts", empty_contexts)
+    monkeypatch.setattr(main, "build_ticket_chain", StubChain)
+    monkeypatch.setattr(main, "get_embeddings", StubEmbeddings)
+    monkeypatch.setattr(main, "write_ticket", stored)
+    monkeypatch.setattr(main.get_semantic_cache(), "lookup", lambda *args: None)
+
+    response = TestClient(main.app, base_url="http://localhost").post(
+        "/generate-tickets/batch",
+        headers={"X-API-Key": "test-key"},
+        json={"prompts": ["first", "slow", "third"], "web_urls": ["https://example.com"]},
+    )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["ok"] for result in results] == [True, False, True]
+    assert "llm" in results[1]["error"]
+    assert results[2]["ticket"]["title"] == "third"
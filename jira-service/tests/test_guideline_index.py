@@ -0,0 +1,51 @@
+import asyncio
+
+from langchain.schema import Document
+
+from app import guideline_index
+
+
+class StubEmbeddings:
+    model = "stub-embedding"
+
+    def embed_documents(self, texts):
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+def test_index_built_after_a_miss_is_picked_up(tmp_path, monkeypatch):
+    monkeypatch.setenv("GUIDELINE_INDEX_PATH", str(tmp_path))
+    monkeypatch.setattr(guideline_index, "_guideline_index", None)
+    monkeypatch.setattr(guideline_index, "_guideline_index_checked_at", None)
+    monkeypatch.setattr(guideline_index, "DEFAULT_GUIDELINE_RETRY_SECONDS", 0.0)
+
+    assert guideline_index.get_guideline_index(StubEmbeddings.model) is None
+
+    guideline_index.build_guideline_index(
+        [Document(page_content="Write a clear summary", metadata={"source": "guide"})],
+        StubEmbeddings(),
+        str(tmp_path),
+    )
+    index = guideline_index.get_guideline_index(StubEmbeddings.model)
+    assert index is not None
+    assert index.texts == ["Write a clear summary"]
+
+
+def test_warm_up_retries_until_ready(monkeypatch):
+    from app import main
+
+    attempts = []
+
+    def warm_up():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RuntimeError("No usable guideline index")
+
+    monkeypatch.setattr(main, "warm_up", warm_up)
+    monkeypatch.setattr(main, "WARM_UP_RETRY_SECONDS", 0.0)
+    monkeypatch.setitem(main.readiness, "ready", False)
+    monkeypatch.setitem(main.readiness, "error", None)
+
+    asyncio.run(main.warm_up_components())
+
+    assert len(attempts) == 3
+    assert main.readiness == {"ready": True, "error": None}
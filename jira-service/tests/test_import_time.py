@@ -0,0 +1,50 @@
+import os
+import re
+import subprocess
+import sys
+
+SERVICE_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_TIME_BUDGET_SECONDS = float(os.getenv("IMPORT_TIME_BUDGET_SECONDS", "1.0"))
+IMPORT_TIME_RUNS = 3
+DEFERRED_MODULES = {
+    "boto3",
+    "chromadb",
+    "langchain",
+    "langchain_chroma",
+    "langchain_core",
+    "langchain_openai",
+    "openai",
+    "tiktoken",
+    "youtube_transcript_api",
+}
+
+
+def import_app(cwd):
+    environment = dict(os.environ, OPENAI_API_KEY=os.getenv("OPENAI_API_KEY", "test"))
+    environment["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [SERVICE_DIRECTORY, environment.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=cwd,
+        env=environment,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)$", line)
+        if match:
+            modules.setdefault(match.group(3), int(match.group(1)) / 1e6)
+    return modules
+
+
+def test_import_defers_heavy_modules_and_io(tmp_path):
+    runs = [import_app(tmp_path) for _ in range(IMPORT_TIME_RUNS)]
+    modules = runs[0]
+
+    assert min(run["app.main"] for run in runs) < IMPORT_TIME_BUDGET_SECONDS
+    assert not DEFERRED_MODULES & set(modules)
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,65 @@
+import uuid
+
+import chromadb
+import pytest
+from langchain.schema import Document
+
+from app.ingestion import StreamingIngest, chunk_id, load_manifest, remove_sources
+from app.hybrid_retrieval import get_keyword_index
+
+
+def embed(texts):
+    return [[float(len(text)), 1.0] for text in texts]
+
+
+def chunk(text, source_key):
+    return Document(page_content=text, metadata={"source_key": source_key})
+
+
+@pytest.fixture
+def collection(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    client = chromadb.EphemeralClient()
+    return client.create_collection(f"project_{uuid.uuid4().hex[:8]}", embedding_function=None)
+
+
+def ingest(collection, **kwargs):
+    return StreamingIngest(collection, lambda document: {"source": "test"}, embed, batch_size=1, **kwargs)
+
+
+def stored_ids(collection):
+    return set(collection.get(include=[])["ids"])
+
+
+def test_concurrent_finish_keeps_chunk_skipped_by_another_ingest(collection):
+    first = ingest(collection)
+    first.add([chunk("shared", "web:a")])
+    first.finish()
+
+    reader = ingest(collection)
+    reader.add([chunk("shared", "web:b")])
+    assert reader.stats["unchanged"] == 1
+
+    updater = ingest(collection)
+    updater.add([chunk("replacement", "web:a")])
+    assert updater.finish()["removed"] == 0
+
+    reader.finish()
+    assert chunk_id("shared") in stored_ids(collection)
+    assert load_manifest(collection.name)["web:b"] == [chunk_id("shared")]
+
+    remove_sources(collection, ["web:b"])
+    assert stored_ids(collection) == {chunk_id("replacement")}
+
+
+def test_abort_keeps_chunk_claimed_by_another_ingest(collection):
+    writer = ingest(collection)
+    writer.add([chunk("mine", "web:a"), chunk("shared", "web:a")])
+
+    reader = ingest(collection)
+    reader.add([chunk("shared", "web:b")])
+
+    assert writer.abort() == 1
+    reader.finish()
+    assert stored_ids(collection) == {chunk_id("shared")}
+    assert [document_id for document_id, _, _ in get_keyword_index(collection).search("mine", 5)] == []
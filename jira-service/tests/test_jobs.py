@@ -0,0 +1,128 @@
+import asyncio
+import time
+import uuid
+from types import SimpleNamespace
+
+import chromadb
+import pytest
+from langchain.schema import Document
+
+from app import main
+from app.ingestion import DEFAULT_INGEST_BATCH_SIZE, load_manifest
+from app.jobs import (
+    JOB_CANCELLED,
+    JOB_FAILED,
+    JOB_FINISHED_STATUSES,
+    JOB_RUNNING,
+    JOB_SUCCEEDED,
+    JobQueue,
+    SQLiteJobStore,
+)
+
+
+def embed(texts):
+    return [[float(len(text)), 1.0] for text in texts]
+
+
+async def wait_until_finished(queue, job_id):
+    for _ in range(500):
+        job = queue.get(job_id)
+        if job["status"] in JOB_FINISHED_STATUSES:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+def test_restart_fails_jobs_left_running_by_a_stopped_worker(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    store = SQLiteJobStore(path)
+    stale_before = time.time() - 120
+    store.create("stale", "load_documents", "stopped-worker")
+    store.update("stale", status=JOB_RUNNING, heartbeat_at=stale_before)
+    store.create("done", "load_documents", "stopped-worker")
+    store.update("done", status=JOB_SUCCEEDED, heartbeat_at=stale_before)
+    store.create("live", "load_documents", "other-worker")
+    store.update("live", status=JOB_RUNNING)
+
+    queue = JobQueue(SQLiteJobStore(path), heartbeat_timeout_seconds=60)
+    queue.maintain()
+
+    stale = queue.get("stale")
+    assert stale["status"] == JOB_FAILED
+    assert stale["error"].startswith("Interrupted")
+    assert queue.get("done")["status"] == JOB_SUCCEEDED
+    assert queue.get("live")["status"] == JOB_RUNNING
+
+
+def test_cancel_stops_a_running_job(tmp_path):
+    async def run():
+        queue = JobQueue(SQLiteJobStore(str(tmp_path / "jobs.sqlite3")), heartbeat_seconds=3600)
+        started = asyncio.Event()
+
+        async def handler(job, payload):
+            started.set()
+            while True:
+                await asyncio.sleep(0.01)
+                job.check_cancelled()
+
+        queue.register("load_documents", handler)
+        job = await queue.submit("load_documents", {})
+        await asyncio.wait_for(started.wait(), 5)
+        queue.cancel(job["job_id"])
+        try:
+            return await wait_until_finished(queue, job["job_id"])
+        finally:
+            await queue.stop()
+
+    job = asyncio.run(run())
+
+    assert job["status"] == JOB_CANCELLED
+    assert job["cancel_requested"]
+
+
+@pytest.mark.parametrize("outcome", [JOB_CANCELLED, JOB_FAILED])
+def test_stopped_load_rolls_back_its_chunks(tmp_path, monkeypatch, outcome):
+    monkeypatch.chdir(tmp_path)
+    collection = chromadb.EphemeralClient().create_collection(
+        f"project_{uuid.uuid4().hex[:8]}", embedding_function=None)
+    monkeypatch.setattr(main, "get_collection", lambda access_token, project_key: collection)
+    monkeypatch.setattr(
+        main, "collection_manager", lambda: SimpleNamespace(embedding_function=lambda name: embed))
+
+    async def run():
+        first_source_written = asyncio.Event()
+        release = asyncio.Event()
+
+        async def iter_web_chunks(urls, text_splitter):
+            yield [
+                Document(page_content=f"chunk {index}", metadata={"source": urls[0]})
+                for index in range(DEFAULT_INGEST_BATCH_SIZE + 10)
+            ]
+            first_source_written.set()
+            await release.wait()
+            raise RuntimeError("second source failed")
+
+        monkeypatch.setattr(main, "iter_web_chunks", iter_web_chunks)
+        queue = JobQueue(SQLiteJobStore(str(tmp_path / "jobs.sqlite3")), heartbeat_seconds=3600)
+        queue.register("load_documents", main.run_load_documents_job)
+        job = await queue.submit("load_documents", {
+            "web_urls": ["https://example.com/a", "https://example.com/b"],
+            "project_key": "PROJ",
+            "access_token": "token",
+        })
+        await asyncio.wait_for(first_source_written.wait(), 5)
+        assert collection.count() == DEFAULT_INGEST_BATCH_SIZE
+        if outcome == JOB_CANCELLED:
+            queue.cancel(job["job_id"])
+        else:
+            release.set()
+        try:
+            return await wait_until_finished(queue, job["job_id"])
+        finally:
+            await queue.stop()
+
+    job = asyncio.run(run())
+
+    assert job["status"] == outcome
+    assert collection.count() == 0
+    assert load_manifest(collection.name) == {}
@@ -0,0 +1,61 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.web_loader import WebLoader
+
+ARTICLE = "<html><head><title>Guide</title></head><body><p>{}</p></body></html>".format("word " * 200)
+APP_SHELL = '<html><body><div id="root"></div><script src="/bundle.js"></script></body></html>'
+
+
+class RecordingBrowser:
+    def __init__(self):
+        self.urls = []
+
+    def fetch(self, url):
+        self.urls.append(url)
+        return ARTICLE
+
+    def close(self):
+        pass
+
+
+def fetch(status_code, body, content_type="text/html; charset=utf-8"):
+    browser = RecordingBrowser()
+    loader = WebLoader(browser_pool=browser)
+    loader._client = httpx.AsyncClient(transport=httpx.MockTransport(
+        lambda request: httpx.Response(
+            status_code, content=body.encode(), headers={"content-type": content_type})))
+
+    async def run():
+        try:
+            return await loader._fetch_url("https://example.com/page")
+        finally:
+            await loader._client.aclose()
+
+    return asyncio.run(run()), browser.urls
+
+
+def test_http_error_is_raised_without_the_browser():
+    with pytest.raises(httpx.HTTPStatusError):
+        fetch(404, "<html><body>Not found</body></html>")
+
+
+def test_non_text_content_is_rejected():
+    with pytest.raises(ValueError):
+        fetch(200, "%PDF-1.7", content_type="application/pdf")
+
+
+def test_short_static_page_is_not_sent_to_the_browser():
+    (document, _, _), browser_urls = fetch(200, "<html><body><p>Short but complete.</p></body></html>")
+
+    assert document.page_content == "Short but complete."
+    assert browser_urls == []
+
+
+def test_script_rendered_page_is_loaded_in_the_browser():
+    (document, _, _), browser_urls = fetch(200, APP_SHELL)
+
+    assert browser_urls == ["https://example.com/page"]
+    assert document.metadata["title"] == "Guide"
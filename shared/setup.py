@@ -8,6 +8,9 @@ setup(
         "boto3",
         "python-dotenv",
     ],
+    extras_require={
+        "test": ["moto[s3]>=5", "pytest"],
+    },
     author="Sprint AI",
     author_email="your-email@example.com",
     description="Shared library for Sprint AI services",
@@ -1,76 +1,361 @@
-import boto3
+import base64
+import hashlib
 import json
-from typing import Dict, Any, Optional
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 from botocore.exceptions import ClientError
 import os
 from dotenv import load_dotenv
+from sprint_shared.aws.ticket_cache import TicketCache, get_ticket_cache
 
 load_dotenv()
 
+DEFAULT_MAX_POOL_CONNECTIONS = 50
+DEFAULT_CLIENT_MAX_ATTEMPTS = 3
+DEFAULT_INDEX_SHARDS = 16
+DEFAULT_INDEX_UPDATE_ATTEMPTS = 8
+DEFAULT_INDEX_BACKOFF_SECONDS = 0.05
+DEFAULT_INDEX_BACKOFF_CAP_SECONDS = 2.0
+DEFAULT_FALLBACK_WORKERS = 16
+INDEX_CONFLICT_CODES = ('PreconditionFailed', 'ConditionalRequestConflict')
+INDEX_MISSING_CODES = ('NoSuchKey', '404')
+
+
+def _ticket_sort_key(ticket_data: Dict[str, Any]) -> Tuple[str, str]:
+    return ticket_data.get('created_at') or '', ticket_data.get('ticket_id') or ''
+
+
+def encode_cursor(ticket_data: Dict[str, Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(_ticket_sort_key(ticket_data)).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        created_at, ticket_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return created_at, ticket_id
+
+
+_s3_client = None
+_s3_client_guard = threading.Lock()
+
+
+def get_s3_client():
+    global _s3_client
+    with _s3_client_guard:
+        if _s3_client is None:
+            import boto3
+            from botocore.config import Config
+
+            _s3_client = boto3.client(
+                's3',
+                aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
+                aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
+                region_name=os.getenv('AWS_REGION', 'us-east-1'),
+                config=Config(
+                    max_pool_connections=int(os.getenv(
+                        'S3_MAX_POOL_CONNECTIONS', DEFAULT_MAX_POOL_CONNECTIONS)),
+                    retries={'max_attempts': DEFAULT_CLIENT_MAX_ATTEMPTS, 'mode': 'standard'},
+                    tcp_keepalive=True,
+                )
+            )
+        return _s3_client
+
 
 class S3Service:
-    def __init__(self):
-        self.s3_client = boto3.client(
-            's3',
-            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-            region_name=os.getenv('AWS_REGION', 'us-east-1')
-        )
+    def __init__(self, s3_client=None, ticket_cache: Optional[TicketCache] = None):
+        self.s3_client = s3_client or get_s3_client()
+        self.ticket_cache = ticket_cache
         self.bucket_name = os.getenv('S3_BUCKET_NAME')
+        self.index_failures = 0
+        self._lock = threading.Lock()
+
+    def _ticket_key(self, ticket_id: str, service_type: str) -> str:
+        return f'{service_type}/tickets/{ticket_id}.json'
+
+    def _index_shard(self, ticket_id: str) -> int:
+        return int(hashlib.md5(ticket_id.encode('utf-8')).hexdigest()[:8], 16) % DEFAULT_INDEX_SHARDS
+
+    def _index_key(self, service_type: str, shard: int) -> str:
+        return f'{service_type}/index/shards/{shard:02d}.jsonl'
+
+    def _read_index(self, service_type: str, shard: int) -> Optional[Tuple[Dict[str, Dict[str, Any]], str]]:
+        try:
+            response = self.s3_client.get_object(
+                Bucket=self.bucket_name,
+                Key=self._index_key(service_type, shard)
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] in INDEX_MISSING_CODES:
+                return None
+            raise
+
+        entries = {}
+        for line in response['Body'].read().decode('utf-8').splitlines():
+            if line:
+                ticket_data = json.loads(line)
+                entries[ticket_data['ticket_id']] = ticket_data
+        return entries, response['ETag']
+
+    def _write_index(
+        self, service_type: str, shard: int, entries: Dict[str, Dict[str, Any]],
+        etag: Optional[str] = None, create_only: bool = False
+    ) -> None:
+        ordered = sorted(entries.values(), key=_ticket_sort_key, reverse=True)
+        conditions = {}
+        if etag:
+            conditions['IfMatch'] = etag
+        elif create_only:
+            conditions['IfNoneMatch'] = '*'
+
+        self.s3_client.put_object(
+            Bucket=self.bucket_name,
+            Key=self._index_key(service_type, shard),
+            Body='\n'.join(json.dumps(ticket_data) for ticket_data in ordered),
+            ContentType='application/x-ndjson',
+            **conditions
+        )
+
+    def _drop_index_shard(self, service_type: str, shard: int) -> None:
+        try:
+            self.s3_client.delete_object(
+                Bucket=self.bucket_name,
+                Key=self._index_key(service_type, shard)
+            )
+        except ClientError as e:
+            print(f"Error dropping ticket index shard {shard} for {service_type}: {e}")
+
+    def _update_index(
+        self, service_type: str, ticket_id: str, ticket_data: Optional[Dict[str, Any]]
+    ) -> bool:
+        shard = self._index_shard(ticket_id)
+        for attempt in range(DEFAULT_INDEX_UPDATE_ATTEMPTS):
+            if attempt:
+                time.sleep(random.uniform(0, min(
+                    DEFAULT_INDEX_BACKOFF_CAP_SECONDS, DEFAULT_INDEX_BACKOFF_SECONDS * 2 ** attempt)))
+            try:
+                index = self._read_index(service_type, shard)
+                if index is None:
+                    return True
+
+                entries, etag = index
+                if ticket_data is None:
+                    if entries.pop(ticket_id, None) is None:
+                        return True
+                else:
+                    entries[ticket_id] = dict(ticket_data, ticket_id=ticket_id)
+
+                self._write_index(service_type, shard, entries, etag)
+                return True
+            except ClientError as e:
+                code = e.response['Error']['Code']
+                if code in INDEX_MISSING_CODES:
+                    return True
+                if code not in INDEX_CONFLICT_CODES:
+                    print(f"Error updating ticket index shard {shard} for {service_type}: {e}")
+                    break
+
+        print(f"Dropping ticket index shard {shard} for {service_type} so it is rebuilt from tickets")
+        with self._lock:
+            self.index_failures += 1
+        self._drop_index_shard(service_type, shard)
+        return False
+
+    def _list_ticket_ids(self, service_type: str) -> List[str]:
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        return [
+            obj['Key'].split('/')[-1][:-len('.json')]
+            for page in paginator.paginate(
+                Bucket=self.bucket_name,
+                Prefix=f'{service_type}/tickets/'
+            )
+            for obj in page.get('Contents', [])
+            if obj['Key'].endswith('.json')
+        ]
+
+    def _fetch_tickets(self, service_type: str, ticket_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        with ThreadPoolExecutor(max_workers=DEFAULT_FALLBACK_WORKERS) as executor:
+            tickets = executor.map(
+                lambda ticket_id: self.get_ticket(ticket_id, service_type), ticket_ids)
+            return {
+                ticket_id: dict(ticket_data, ticket_id=ticket_id)
+                for ticket_id, ticket_data in zip(ticket_ids, tickets)
+                if ticket_data
+            }
+
+    def _scan_tickets(self, service_type: str) -> Dict[int, Dict[str, Dict[str, Any]]]:
+        shards: Dict[int, Dict[str, Dict[str, Any]]] = {
+            shard: {} for shard in range(DEFAULT_INDEX_SHARDS)}
+        for ticket_id, ticket_data in self._fetch_tickets(
+                service_type, self._list_ticket_ids(service_type)).items():
+            shards[self._index_shard(ticket_id)][ticket_id] = ticket_data
+        return shards
+
+    def _reconcile_index(self, service_type: str, shards: Dict[int, Dict[str, Dict[str, Any]]]) -> None:
+        # Tickets stored or deleted while the scan ran found no shard to update, so list
+        # again now that the shards exist and apply whatever the scan missed.
+        ticket_ids = set(self._list_ticket_ids(service_type))
+        indexed = {ticket_id for entries in shards.values() for ticket_id in entries}
+        for ticket_id in indexed - ticket_ids:
+            shards[self._index_shard(ticket_id)].pop(ticket_id, None)
+            self._update_index(service_type, ticket_id, None)
+        for ticket_id, ticket_data in self._fetch_tickets(
+                service_type, sorted(ticket_ids - indexed)).items():
+            shards[self._index_shard(ticket_id)][ticket_id] = ticket_data
+            self._update_index(service_type, ticket_id, ticket_data)
+
+    def _load_index_entries(self, service_type: str) -> List[Dict[str, Any]]:
+        with ThreadPoolExecutor(max_workers=DEFAULT_INDEX_SHARDS) as executor:
+            indexes = list(executor.map(
+                lambda shard: self._read_index(service_type, shard), range(DEFAULT_INDEX_SHARDS)))
+        missing = [shard for shard, index in enumerate(indexes) if index is None]
+        if not missing:
+            return [ticket_data for entries, _ in indexes for ticket_data in entries.values()]
+
+        shards = self._scan_tickets(service_type)
+        for shard in missing:
+            try:
+                self._write_index(service_type, shard, shards[shard], create_only=True)
+            except ClientError as e:
+                if e.response['Error']['Code'] not in INDEX_CONFLICT_CODES:
+                    print(f"Error building ticket index shard {shard} in S3: {e}")
+        self._reconcile_index(service_type, shards)
+        return [ticket_data for entries in shards.values() for ticket_data in entries.values()]
+
+    def rebuild_ticket_index(self, service_type: str) -> bool:
+        try:
+            shards = self._scan_tickets(service_type)
+            for shard, entries in shards.items():
+                self._write_index(service_type, shard, entries)
+            self._reconcile_index(service_type, shards)
+            return True
+        except ClientError as e:
+            print(f"Error rebuilding ticket index in S3: {e}")
+            return False
 
     def store_ticket(self, ticket_id: str, ticket_data: Dict[str, Any], service_type: str) -> bool:
         try:
-            ticket_json = json.dumps(ticket_data)
+            ticket_json = json.dumps(ticket_data).encode('utf-8')
 
-            self.s3_client.put_object(
+            response = self.s3_client.put_object(
                 Bucket=self.bucket_name,
-                Key=f'{service_type}/tickets/{ticket_id}.json',
+                Key=self._ticket_key(ticket_id, service_type),
                 Body=ticket_json,
+                ContentMD5=base64.b64encode(hashlib.md5(ticket_json).digest()).decode(),
                 ContentType='application/json'
             )
-            return True
         except ClientError as e:
             print(f"Error storing ticket in S3: {e}")
             return False
 
+        if self.ticket_cache:
+            self.ticket_cache.put(ticket_id, service_type, ticket_data, response.get('ETag'))
+
+        # The ticket object is stored; a failed index update only drops the shard,
+        # which the next listing rebuilds from the ticket objects.
+        self._update_index(service_type, ticket_id, ticket_data)
+        return True
+
     def get_ticket(self, ticket_id: str, service_type: str) -> Optional[Dict[str, Any]]:
+        cached = self.ticket_cache.get(ticket_id, service_type) if self.ticket_cache else None
+        if cached and cached['fresh']:
+            self.ticket_cache.record('hits')
+            return cached['data']
+
+        conditions = {}
+        if cached and cached['etag']:
+            conditions['IfNoneMatch'] = cached['etag']
         try:
             response = self.s3_client.get_object(
                 Bucket=self.bucket_name,
-                Key=f'{service_type}/tickets/{ticket_id}.json'
+                Key=self._ticket_key(ticket_id, service_type),
+                **conditions
             )
             ticket_data = json.loads(response['Body'].read().decode('utf-8'))
-            return ticket_data
         except ClientError as e:
+            code = e.response['Error']['Code']
+            if conditions and code in ('304', 'NotModified'):
+                self.ticket_cache.record('revalidations')
+                self.ticket_cache.touch(ticket_id, service_type)
+                return cached['data']
+            if self.ticket_cache and code in ('NoSuchKey', '404'):
+                self.ticket_cache.invalidate(ticket_id, service_type)
             print(f"Error retrieving ticket from S3: {e}")
             return None
 
-    def list_tickets(self, service_type: str) -> list:
-        try:
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.bucket_name,
-                Prefix=f'{service_type}/tickets/'
-            )
-
-            tickets = []
-            for obj in response.get('Contents', []):
-                ticket_id = obj['Key'].split('/')[-1].replace('.json', '')
-                ticket_data = self.get_ticket(ticket_id, service_type)
-                if ticket_data:
-                    tickets.append(ticket_data)
+        if self.ticket_cache:
+            self.ticket_cache.record('misses')
+            self.ticket_cache.put(ticket_id, service_type, ticket_data, response.get('ETag'))
+        return ticket_data
 
-            return tickets
+    def list_tickets_page(
+        self,
+        service_type: str,
+        project_key: Optional[str] = None,
+        priority: Optional[str] = None,
+        created_after: Optional[str] = None,
+        created_before: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        after_key = decode_cursor(cursor) if cursor else None
+        try:
+            entries = self._load_index_entries(service_type)
         except ClientError as e:
             print(f"Error listing tickets from S3: {e}")
-            return []
+            return {"tickets": [], "next_cursor": None}
+
+        tickets = []
+        for ticket_data in sorted(entries, key=_ticket_sort_key, reverse=True):
+            created_at = ticket_data.get('created_at') or ''
+            if after_key and _ticket_sort_key(ticket_data) >= after_key:
+                continue
+            if project_key and ticket_data.get('project_key') != project_key:
+                continue
+            if priority and (ticket_data.get('priority') or '').lower() != priority.lower():
+                continue
+            if created_after and created_at < created_after:
+                continue
+            if created_before and created_at >= created_before:
+                continue
+            tickets.append(ticket_data)
+
+        next_cursor = None
+        if limit is not None and len(tickets) > limit:
+            tickets = tickets[:limit]
+            next_cursor = encode_cursor(tickets[-1])
+        return {"tickets": tickets, "next_cursor": next_cursor}
+
+    def list_tickets(self, service_type: str, **filters: Any) -> list:
+        return self.list_tickets_page(service_type, **filters)["tickets"]
 
     def delete_ticket(self, ticket_id: str, service_type: str) -> bool:
+        if self.ticket_cache:
+            self.ticket_cache.invalidate(ticket_id, service_type)
         try:
             self.s3_client.delete_object(
                 Bucket=self.bucket_name,
-                Key=f'{service_type}/tickets/{ticket_id}.json'
+                Key=self._ticket_key(ticket_id, service_type)
             )
-            return True
         except ClientError as e:
             print(f"Error deleting ticket from S3: {e}")
             return False
+
+        self._update_index(service_type, ticket_id, None)
+        return True
+
+
+_s3_service: Optional[S3Service] = None
+_s3_service_guard = threading.Lock()
+
+
+def get_s3_service() -> S3Service:
+    global _s3_service
+    with _s3_service_guard:
+        if _s3_service is None:
+            _s3_service = S3Service(ticket_cache=get_ticket_cache())
+        return _s3_service
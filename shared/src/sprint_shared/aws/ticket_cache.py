@@ -0,0 +1,173 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_TICKET_CACHE_MAX_ENTRIES = 1000
+DEFAULT_TICKET_CACHE_VALIDATE_SECONDS = 30.0
+DEFAULT_TICKET_CACHE_DISK_MAX_ENTRIES = 20000
+
+
+class TicketCache:
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_TICKET_CACHE_MAX_ENTRIES,
+        validate_after_seconds: float = DEFAULT_TICKET_CACHE_VALIDATE_SECONDS,
+        disk_path: Optional[str] = None,
+        disk_max_entries: int = DEFAULT_TICKET_CACHE_DISK_MAX_ENTRIES,
+    ):
+        self.max_entries = max_entries
+        self.validate_after_seconds = validate_after_seconds
+        self.disk_max_entries = disk_max_entries
+        self.hits = 0
+        self.disk_hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = None
+
+        if disk_path:
+            directory = os.path.dirname(disk_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(disk_path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS tickets ("
+                "key TEXT PRIMARY KEY, data TEXT NOT NULL, etag TEXT, "
+                "validated_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS tickets_last_access ON tickets (last_access)"
+            )
+            self._connection.commit()
+
+    def _disk_key(self, key: Tuple[str, str]) -> str:
+        return f"{key[0]}/{key[1]}"
+
+    def _remember(self, key: Tuple[str, str], entry: Dict[str, Any]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, ticket_id: str, service_type: str) -> Optional[Dict[str, Any]]:
+        key = (service_type, ticket_id)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            elif self._connection is not None:
+                row = self._connection.execute(
+                    "SELECT data, etag, validated_at FROM tickets WHERE key = ?",
+                    (self._disk_key(key),),
+                ).fetchone()
+                if row is None:
+                    return None
+                self._connection.execute(
+                    "UPDATE tickets SET last_access = ? WHERE key = ?",
+                    (now, self._disk_key(key)),
+                )
+                self._connection.commit()
+                entry = {"data": row[0], "etag": row[1], "validated_at": row[2]}
+                self._remember(key, entry)
+                self.disk_hits += 1
+            else:
+                return None
+
+        return {
+            "data": json.loads(entry["data"]),
+            "etag": entry["etag"],
+            "fresh": now - entry["validated_at"] < self.validate_after_seconds,
+        }
+
+    def put(
+        self, ticket_id: str, service_type: str, ticket_data: Dict[str, Any],
+        etag: Optional[str] = None
+    ) -> None:
+        key = (service_type, ticket_id)
+        now = time.time()
+        entry = {"data": json.dumps(ticket_data), "etag": etag, "validated_at": now}
+        with self._lock:
+            self._remember(key, entry)
+            if self._connection is None:
+                return
+
+            self._connection.execute(
+                "INSERT OR REPLACE INTO tickets (key, data, etag, validated_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self._disk_key(key), entry["data"], etag, now, now),
+            )
+            self._connection.execute(
+                "DELETE FROM tickets WHERE key IN (SELECT key FROM tickets "
+                "ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.disk_max_entries,),
+            )
+            self._connection.commit()
+
+    def touch(self, ticket_id: str, service_type: str) -> None:
+        key = (service_type, ticket_id)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry["validated_at"] = now
+            if self._connection is not None:
+                self._connection.execute(
+                    "UPDATE tickets SET validated_at = ? WHERE key = ?",
+                    (now, self._disk_key(key)),
+                )
+                self._connection.commit()
+
+    def invalidate(self, ticket_id: str, service_type: str) -> None:
+        key = (service_type, ticket_id)
+        with self._lock:
+            self._entries.pop(key, None)
+            if self._connection is not None:
+                self._connection.execute(
+                    "DELETE FROM tickets WHERE key = ?", (self._disk_key(key),))
+                self._connection.commit()
+
+    def record(self, outcome: str) -> None:
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.revalidations + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "revalidations": self.revalidations,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "hit_ratio": (self.hits + self.revalidations) / lookups if lookups else 0.0,
+            }
+
+
+_ticket_cache: Optional[TicketCache] = None
+_ticket_cache_guard = threading.Lock()
+
+
+def get_ticket_cache() -> TicketCache:
+    global _ticket_cache
+    with _ticket_cache_guard:
+        if _ticket_cache is None:
+            _ticket_cache = TicketCache(
+                max_entries=int(os.getenv(
+                    "TICKET_CACHE_MAX_ENTRIES", DEFAULT_TICKET_CACHE_MAX_ENTRIES)),
+                validate_after_seconds=float(os.getenv(
+                    "TICKET_CACHE_VALIDATE_SECONDS", DEFAULT_TICKET_CACHE_VALIDATE_SECONDS)),
+                disk_path=os.getenv("TICKET_CACHE_PATH") or None,
+                disk_max_entries=int(os.getenv(
+                    "TICKET_CACHE_DISK_MAX_ENTRIES", DEFAULT_TICKET_CACHE_DISK_MAX_ENTRIES)),
+            )
+        return _ticket_cache
@@ -0,0 +1,232 @@
+import logging
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+from sprint_shared.aws.s3_service import S3Service, get_s3_service
+
+DEFAULT_WRITER_QUEUE_SIZE = 1000
+DEFAULT_WRITER_WORKERS = 4
+DEFAULT_WRITE_ATTEMPTS = 4
+DEFAULT_WRITE_BACKOFF_SECONDS = 0.5
+DEFAULT_SUBMIT_TIMEOUT_SECONDS = 5.0
+DEFAULT_STATUS_HISTORY = 10000
+DEFAULT_UNHEALTHY_FAILURES = 3
+DEFAULT_UNHEALTHY_QUEUE_FRACTION = 0.9
+
+logger = logging.getLogger(__name__)
+
+
+class TicketWriteError(Exception):
+    pass
+
+
+class TicketWriter:
+    def __init__(
+        self,
+        s3_service: Optional[S3Service] = None,
+        queue_size: int = DEFAULT_WRITER_QUEUE_SIZE,
+        workers: int = DEFAULT_WRITER_WORKERS,
+        attempts: int = DEFAULT_WRITE_ATTEMPTS,
+        backoff_seconds: float = DEFAULT_WRITE_BACKOFF_SECONDS,
+        status_history: int = DEFAULT_STATUS_HISTORY,
+    ):
+        self.s3_service = s3_service or get_s3_service()
+        self.attempts = attempts
+        self.backoff_seconds = backoff_seconds
+        self.written = 0
+        self.retries = 0
+        self.failed = 0
+        self.synchronous = 0
+        self.consecutive_failures = 0
+        self.status_history = status_history
+        self._statuses: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._queue: "queue.Queue[Optional[Tuple[Tuple[str, str], Future]]]" = queue.Queue(queue_size)
+        self._pending: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self._threads: List[threading.Thread] = [
+            threading.Thread(target=self._run, name=f"ticket-writer-{index}", daemon=True)
+            for index in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(
+        self,
+        ticket_id: str,
+        ticket_data: Dict[str, Any],
+        service_type: str,
+        timeout: float = DEFAULT_SUBMIT_TIMEOUT_SECONDS,
+    ) -> Future:
+        if self._closed:
+            raise TicketWriteError("Ticket writer is closed")
+
+        key = (service_type, ticket_id)
+        future: Future = Future()
+        with self._lock:
+            self._pending[key] = ticket_data
+            self._set_status(key, "pending")
+        try:
+            self._queue.put((key, future), timeout=timeout)
+        except queue.Full:
+            self._discard_if_current(key, ticket_data)
+            with self._lock:
+                self._statuses.pop(key, None)
+            raise
+        return future
+
+    def write_now(self, ticket_id: str, ticket_data: Dict[str, Any], service_type: str) -> bool:
+        key = (service_type, ticket_id)
+        with self._lock:
+            self._pending[key] = ticket_data
+            self._set_status(key, "pending")
+            self.synchronous += 1
+        try:
+            return self._write(key)
+        except Exception as e:
+            logger.error("Error writing ticket %s: %s", ticket_id, e)
+            raise
+
+    def healthy(self) -> bool:
+        with self._lock:
+            consecutive_failures = self.consecutive_failures
+        if self._closed or consecutive_failures >= DEFAULT_UNHEALTHY_FAILURES:
+            return False
+        if self._queue.maxsize <= 0:
+            return True
+        return self._queue.qsize() < self._queue.maxsize * DEFAULT_UNHEALTHY_QUEUE_FRACTION
+
+    def status(self, ticket_id: str, service_type: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            status = self._statuses.get((service_type, ticket_id))
+            return dict(status) if status is not None else None
+
+    def _set_status(self, key: Tuple[str, str], state: str, error: Optional[str] = None) -> None:
+        self._statuses.pop(key, None)
+        self._statuses[key] = {"status": state, "error": error, "updated_at": time.time()}
+        while len(self._statuses) > self.status_history:
+            self._statuses.popitem(last=False)
+
+    def get_pending(self, ticket_id: str, service_type: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            ticket_data = self._pending.get((service_type, ticket_id))
+            return dict(ticket_data) if ticket_data is not None else None
+
+    def discard(self, ticket_id: str, service_type: str) -> None:
+        with self._lock:
+            self._pending.pop((service_type, ticket_id), None)
+            self._statuses.pop((service_type, ticket_id), None)
+
+    def _discard_if_current(self, key: Tuple[str, str], ticket_data: Dict[str, Any]) -> None:
+        with self._lock:
+            if self._pending.get(key) is ticket_data:
+                del self._pending[key]
+
+    def _write(self, key: Tuple[str, str]) -> bool:
+        service_type, ticket_id = key
+        with self._lock:
+            ticket_data = self._pending.get(key)
+        if ticket_data is None:
+            return False
+
+        try:
+            for attempt in range(self.attempts):
+                if self.s3_service.store_ticket(ticket_id, ticket_data, service_type=service_type):
+                    self._finish(key, ticket_data, "written")
+                    return True
+                if attempt + 1 < self.attempts:
+                    with self._lock:
+                        self.retries += 1
+                    logger.warning(
+                        "Retrying write of ticket %s, attempt %d of %d",
+                        ticket_id, attempt + 2, self.attempts)
+                    time.sleep(self.backoff_seconds * 2 ** attempt)
+            raise TicketWriteError(
+                f"Failed to store ticket {ticket_id} in S3 after {self.attempts} attempts")
+        except Exception as e:
+            self._finish(key, ticket_data, "failed", str(e))
+            raise
+
+    def _finish(
+        self, key: Tuple[str, str], ticket_data: Dict[str, Any], state: str, error: Optional[str] = None
+    ) -> None:
+        with self._lock:
+            if state == "written":
+                self.written += 1
+                self.consecutive_failures = 0
+            else:
+                self.failed += 1
+                self.consecutive_failures += 1
+            if self._pending.get(key) is ticket_data:
+                del self._pending[key]
+                self._set_status(key, state, error)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                key, future = item
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(self._write(key))
+                except Exception as e:
+                    logger.error("Error writing ticket %s: %s", key[1], e)
+                    future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        self._queue.join()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "queued": self._queue.qsize(),
+                "written": self.written,
+                "retries": self.retries,
+                "failed": self.failed,
+                "synchronous": self.synchronous,
+                "consecutive_failures": self.consecutive_failures,
+                "index_failures": self.s3_service.index_failures,
+            }
+
+
+_ticket_writer: Optional[TicketWriter] = None
+_ticket_writer_guard = threading.Lock()
+
+
+def get_ticket_writer() -> TicketWriter:
+    global _ticket_writer
+    with _ticket_writer_guard:
+        if _ticket_writer is None:
+            _ticket_writer = TicketWriter(
+                queue_size=int(os.getenv("TICKET_WRITER_QUEUE_SIZE", DEFAULT_WRITER_QUEUE_SIZE)),
+                workers=int(os.getenv("TICKET_WRITER_WORKERS", DEFAULT_WRITER_WORKERS)),
+            )
+        return _ticket_writer
+
+
+def close_ticket_writer() -> None:
+    global _ticket_writer
+    with _ticket_writer_guard:
+        writer, _ticket_writer = _ticket_writer, None
+    if writer is not None:
+        writer.close()
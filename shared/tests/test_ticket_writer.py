@@ -0,0 +1,156 @@
+import threading
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from sprint_shared.aws.s3_service import S3Service
+from sprint_shared.aws.ticket_cache import TicketCache
+from sprint_shared.aws.ticket_writer import TicketWriteError, TicketWriter
+
+BUCKET_NAME = "sprint-tickets-test"
+
+
+@pytest.fixture
+def s3_service(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    monkeypatch.setenv("S3_BUCKET_NAME", BUCKET_NAME)
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET_NAME)
+        yield S3Service(s3_client=client)
+
+
+@pytest.fixture
+def writer(s3_service):
+    writer = TicketWriter(s3_service=s3_service, workers=2, backoff_seconds=0)
+    yield writer
+    writer.close()
+
+
+def ticket(ticket_id, created_at="2026-01-01T00:00:00"):
+    return {"ticket_id": ticket_id, "title": f"Ticket {ticket_id}", "created_at": created_at}
+
+
+def test_submit_writes_ticket_and_index(s3_service, writer):
+    future = writer.submit("abc", ticket("abc"), "jira")
+
+    assert future.result(timeout=10) is True
+    assert writer.status("abc", "jira")["status"] == "written"
+    assert writer.get_pending("abc", "jira") is None
+    assert s3_service.get_ticket("abc", "jira")["title"] == "Ticket abc"
+    assert [entry["ticket_id"] for entry in s3_service.list_tickets("jira")] == ["abc"]
+
+
+def test_pending_ticket_is_served_until_written(s3_service, writer):
+    release = threading.Event()
+    store_ticket = s3_service.store_ticket
+
+    def blocked_store(*args, **kwargs):
+        release.wait(10)
+        return store_ticket(*args, **kwargs)
+
+    s3_service.store_ticket = blocked_store
+    future = writer.submit("abc", ticket("abc"), "jira")
+
+    assert writer.get_pending("abc", "jira")["title"] == "Ticket abc"
+    assert writer.status("abc", "jira")["status"] == "pending"
+    release.set()
+    assert future.result(timeout=10) is True
+    assert writer.get_pending("abc", "jira") is None
+
+
+def test_failed_write_reports_status_and_marks_writer_unhealthy(s3_service, writer):
+    s3_service.store_ticket = lambda *args, **kwargs: False
+
+    for index in range(3):
+        future = writer.submit(f"t{index}", ticket(f"t{index}"), "jira")
+        with pytest.raises(TicketWriteError):
+            future.result(timeout=10)
+
+    status = writer.status("t0", "jira")
+    assert status["status"] == "failed"
+    assert "after 4 attempts" in status["error"]
+    assert writer.stats()["retries"] == 9
+    assert not writer.healthy()
+
+
+def test_write_now_recovers_health(s3_service, writer):
+    writer.consecutive_failures = 3
+
+    assert writer.write_now("abc", ticket("abc"), "jira") is True
+    assert writer.healthy()
+    assert writer.stats()["synchronous"] == 1
+    assert writer.status("abc", "jira")["status"] == "written"
+
+
+def test_concurrent_writes_are_all_indexed(s3_service):
+    writer = TicketWriter(s3_service=s3_service, workers=8, backoff_seconds=0)
+    try:
+        futures = [
+            writer.submit(f"t{index}", ticket(f"t{index}", f"2026-01-01T00:00:{index:02d}"), "jira")
+            for index in range(50)
+        ]
+        assert all(future.result(timeout=60) for future in futures)
+    finally:
+        writer.close()
+
+    listed = s3_service.list_tickets("jira")
+    assert len(listed) == 50
+    assert listed[0]["ticket_id"] == "t49"
+
+
+def test_discard_drops_pending_write(s3_service, writer):
+    release = threading.Event()
+    store_ticket = s3_service.store_ticket
+
+    def blocked_store(*args, **kwargs):
+        release.wait(10)
+        return store_ticket(*args, **kwargs)
+
+    s3_service.store_ticket = blocked_store
+    first = writer.submit("first", ticket("first"), "jira")
+    second = writer.submit("second", ticket("second"), "jira")
+    third = writer.submit("third", ticket("third"), "jira")
+    writer.discard("third", "jira")
+    release.set()
+
+    assert first.result(timeout=10) and second.result(timeout=10)
+    assert third.result(timeout=10) is False
+    assert writer.status("third", "jira") is None
+
+
+def test_index_failure_does_not_fail_the_write(s3_service, writer):
+    s3_service._update_index = lambda *args: False
+
+    assert writer.submit("abc", ticket("abc"), "jira").result(timeout=10) is True
+    assert writer.status("abc", "jira")["status"] == "written"
+    assert writer.stats()["retries"] == 0
+    assert s3_service.get_ticket("abc", "jira")["title"] == "Ticket abc"
+
+
+def test_dropped_index_shard_is_rebuilt_on_list(s3_service, writer):
+    writer.submit("abc", ticket("abc"), "jira").result(timeout=10)
+    s3_service._drop_index_shard("jira", s3_service._index_shard("abc"))
+
+    assert [entry["ticket_id"] for entry in s3_service.list_tickets("jira")] == ["abc"]
+
+
+def test_counters_are_exact_under_concurrency(s3_service):
+    cache = TicketCache(max_entries=10)
+    s3_service.ticket_cache = cache
+    s3_service.store_ticket("abc", ticket("abc"), "jira")
+    cache.validate_after_seconds = 3600
+
+    threads = [
+        threading.Thread(target=lambda: [s3_service.get_ticket("abc", "jira") for _ in range(500)])
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert cache.stats()["hits"] == 4000